@@ -5,10 +5,8 @@ Free tier: 250 requests/month
 """
 
 import os
-import asyncio
-import requests
 import logging
-from .base_adapter import BaseAdapter, OpportunityResult
+from .base_adapter import BaseAdapter, OpportunityResult, TIMEOUT_ERRORS, CircuitOpenError
 
 logger = logging.getLogger(__name__)
 
@@ -38,10 +36,10 @@ class AdzunaAdapter(BaseAdapter):
         """Check if Adzuna supports this country"""
         return country in ADZUNA_COUNTRIES
 
-    def _search_sync(self, query: str, country: str = "IN",
+    async def search(self, query: str, country: str = "IN",
                      max_days_old: int = 14,
                      results_per_page: int = 20) -> list[OpportunityResult]:
-        """Synchronous search"""
+        """Search via the shared async HTTP client"""
         if not self.app_id or not self.app_key:
             logger.warning("Adzuna API credentials not set")
             return []
@@ -61,7 +59,7 @@ class AdzunaAdapter(BaseAdapter):
         }
 
         try:
-            response = requests.get(url, params=params, timeout=15)
+            response = await self._get(url, params=params)
             if response.status_code == 401:
                 logger.warning("Adzuna authentication failed")
                 return []
@@ -104,9 +102,12 @@ class AdzunaAdapter(BaseAdapter):
             logger.info(f"Adzuna returned {len(results)} results for '{query}'")
             return results
 
-        except requests.exceptions.Timeout:
+        except TIMEOUT_ERRORS:
             logger.warning("Adzuna request timed out")
             return []
+        except CircuitOpenError:
+            logger.debug("Adzuna skipped: circuit open")
+            return []
         except Exception as e:
             logger.error(f"Adzuna error: {e}")
             return []
@@ -120,10 +121,3 @@ class AdzunaAdapter(BaseAdapter):
         elif min_sal:
             return f"₹{int(min_sal):,}+"
         return None
-
-    async def search(self, query: str, country: str = "IN",
-                     max_days_old: int = 14) -> list[OpportunityResult]:
-        """Async wrapper"""
-        return await asyncio.to_thread(
-            self._search_sync, query, country, max_days_old
-        )
@@ -4,10 +4,8 @@ FREE, unlimited, no API key needed.
 Global tech/engineering jobs.
 """
 
-import asyncio
-import requests
 import logging
-from .base_adapter import BaseAdapter, OpportunityResult
+from .base_adapter import BaseAdapter, OpportunityResult, TIMEOUT_ERRORS, CircuitOpenError
 
 logger = logging.getLogger(__name__)
 
@@ -18,13 +16,13 @@ class ArbeitnowAdapter(BaseAdapter):
     SOURCE_NAME = "arbeitnow"
     BASE_URL = "https://www.arbeitnow.com/api/job-board-api"
 
-    def _search_sync(self, query: str = "",
+    async def search(self, query: str = "",
                      page: int = 1) -> list[OpportunityResult]:
-        """Synchronous search"""
+        """Search via the shared async HTTP client"""
         params = {"page": str(page)}
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=15)
+            response = await self._get(self.BASE_URL, params=params)
             if response.status_code != 200:
                 logger.warning(f"Arbeitnow returned status {response.status_code}")
                 return []
@@ -65,13 +63,12 @@ class ArbeitnowAdapter(BaseAdapter):
             logger.info(f"Arbeitnow returned {len(results)} results")
             return results
 
-        except requests.exceptions.Timeout:
+        except TIMEOUT_ERRORS:
             logger.warning("Arbeitnow request timed out")
             return []
+        except CircuitOpenError:
+            logger.debug("Arbeitnow skipped: circuit open")
+            return []
         except Exception as e:
             logger.error(f"Arbeitnow error: {e}")
             return []
-
-    async def search(self, query: str = "") -> list[OpportunityResult]:
-        """Async wrapper"""
-        return await asyncio.to_thread(self._search_sync, query)
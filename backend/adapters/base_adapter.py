@@ -1,12 +1,79 @@
 """
 Base adapter and unified OpportunityResult model.
 All API adapters normalize their responses into this format.
+All adapters share one connection-pooled httpx.AsyncClient (HTTP/2 when `h2` is installed).
 """
 
+import asyncio
+import os
+import time
 from dataclasses import dataclass, field, asdict
 from typing import Optional
+from urllib.parse import urlparse
 import uuid
 
+import httpx
+
+from backend.utils import metrics
+from backend.services.platform_registry import CircuitOpenError, get_breaker
+
+# Connection pool tuning (see .env.example)
+MAX_CONNECTIONS = int(os.environ.get("ADAPTER_MAX_CONNECTIONS", "64"))
+MAX_KEEPALIVE = int(os.environ.get("ADAPTER_MAX_KEEPALIVE", "32"))
+MAX_PER_HOST = int(os.environ.get("ADAPTER_MAX_PER_HOST", "8"))
+DEFAULT_TIMEOUT = float(os.environ.get("ADAPTER_TIMEOUT", "15"))
+
+# Exceptions adapters treat as "request timed out"
+TIMEOUT_ERRORS = (asyncio.TimeoutError, httpx.TimeoutException)
+
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+_host_limits: dict[str, asyncio.Semaphore] = {}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide async client, (re)creating it for the running event loop."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            http2=_http2_available(),
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE,
+            ),
+            timeout=DEFAULT_TIMEOUT,
+            follow_redirects=True,
+        )
+        _client_loop = loop
+        _host_limits.clear()
+    return _client
+
+
+async def close_http_client():
+    """Close the shared client (called on app shutdown)."""
+    global _client, _client_loop
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+    _host_limits.clear()
+
+
+def _host_semaphore(host: str) -> asyncio.Semaphore:
+    sem = _host_limits.get(host)
+    if sem is None:
+        sem = _host_limits[host] = asyncio.Semaphore(MAX_PER_HOST)
+    return sem
+
 
 @dataclass
 class OpportunityResult:
@@ -39,6 +106,54 @@ class BaseAdapter:
 
     SOURCE_NAME = "unknown"
 
+    async def _get(self, url: str, params: dict | None = None,
+                   headers: dict | None = None,
+                   timeout: float | None = None) -> httpx.Response:
+        """
+        GET through the shared client, limited to MAX_PER_HOST in-flight requests per host
+        and guarded by this source's circuit breaker (see platform_registry).
+        `timeout` defaults to the source's adaptive timeout; the whole call (queueing +
+        request) is bounded by it, and on expiry the request is cancelled and
+        asyncio.TimeoutError propagates. While the circuit is open CircuitOpenError is
+        raised without touching the network.
+        """
+        breaker = get_breaker(self.SOURCE_NAME)
+        if not breaker.allow_request():
+            metrics.inc("adapter_requests_total", source=self.SOURCE_NAME, outcome="circuit_open")
+            raise CircuitOpenError(self.SOURCE_NAME)
+        if timeout is None:
+            timeout = breaker.current_timeout()
+
+        client = get_http_client()
+        sem = _host_semaphore(urlparse(url).netloc)
+
+        async def _request():
+            async with sem:
+                return await client.get(url, params=params, headers=headers, timeout=timeout)
+
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            response = await asyncio.wait_for(_request(), timeout)
+            outcome = "success" if response.status_code < 400 else f"http_{response.status_code}"
+            return response
+        except TIMEOUT_ERRORS:
+            outcome = "timeout"
+            raise
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            if outcome == "cancelled":
+                breaker.release()
+            elif outcome in ("timeout", "error", "http_429") or outcome.startswith("http_5"):
+                breaker.record_failure()
+            else:
+                breaker.record_success(elapsed)
+            metrics.observe("adapter_request_seconds", elapsed, source=self.SOURCE_NAME)
+            metrics.inc("adapter_requests_total", source=self.SOURCE_NAME, outcome=outcome)
+
     def _detect_remote(self, text: str) -> bool:
         """Detect if a job is remote from location/title text"""
         remote_keywords = ["remote", "work from home", "wfh", "anywhere", "distributed"]
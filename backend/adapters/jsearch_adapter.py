@@ -5,11 +5,9 @@ Free tier: 200 requests/month
 """
 
 import os
-import asyncio
-import requests
 import logging
 from typing import Optional
-from .base_adapter import BaseAdapter, OpportunityResult
+from .base_adapter import BaseAdapter, OpportunityResult, TIMEOUT_ERRORS, CircuitOpenError
 
 logger = logging.getLogger(__name__)
 
@@ -31,11 +29,11 @@ class JSearchAdapter(BaseAdapter):
     def __init__(self):
         self.api_key = os.environ.get("JSEARCH_API_KEY", "")
 
-    def _search_sync(self, query: str, country: str = "",
+    async def search(self, query: str, country: str = "",
                      remote_only: bool = False,
                      date_posted: str = "week",
                      num_pages: int = 1) -> list[OpportunityResult]:
-        """Synchronous search — called via asyncio.to_thread"""
+        """Search via the shared async HTTP client"""
         if not self.api_key:
             logger.warning("JSearch API key not set")
             return []
@@ -59,8 +57,8 @@ class JSearchAdapter(BaseAdapter):
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params,
-                                    headers=headers, timeout=15)
+            response = await self._get(self.BASE_URL, params=params,
+                                       headers=headers)
             if response.status_code == 429:
                 logger.warning("JSearch rate limit exceeded")
                 return []
@@ -102,17 +100,12 @@ class JSearchAdapter(BaseAdapter):
             logger.info(f"JSearch returned {len(results)} results for '{full_query}'")
             return results
 
-        except requests.exceptions.Timeout:
+        except TIMEOUT_ERRORS:
             logger.warning("JSearch request timed out")
             return []
+        except CircuitOpenError:
+            logger.debug("JSearch skipped: circuit open")
+            return []
         except Exception as e:
             logger.error(f"JSearch error: {e}")
             return []
-
-    async def search(self, query: str, country: str = "",
-                     remote_only: bool = False,
-                     date_posted: str = "week") -> list[OpportunityResult]:
-        """Async wrapper for search"""
-        return await asyncio.to_thread(
-            self._search_sync, query, country, remote_only, date_posted
-        )
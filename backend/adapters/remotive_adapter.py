@@ -4,10 +4,8 @@ FREE, unlimited, no API key needed.
 Focuses on remote tech jobs worldwide.
 """
 
-import asyncio
-import requests
 import logging
-from .base_adapter import BaseAdapter, OpportunityResult
+from .base_adapter import BaseAdapter, OpportunityResult, TIMEOUT_ERRORS, CircuitOpenError
 
 logger = logging.getLogger(__name__)
 
@@ -30,10 +28,10 @@ class RemotiveAdapter(BaseAdapter):
     SOURCE_NAME = "remotive"
     BASE_URL = "https://remotive.com/api/remote-jobs"
 
-    def _search_sync(self, query: str = "",
+    async def search(self, query: str = "",
                      category: str = "",
                      limit: int = 20) -> list[OpportunityResult]:
-        """Synchronous search"""
+        """Search via the shared async HTTP client"""
         params = {"limit": str(limit)}
         if query:
             params["search"] = query
@@ -43,7 +41,7 @@ class RemotiveAdapter(BaseAdapter):
                 params["category"] = mapped
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=15)
+            response = await self._get(self.BASE_URL, params=params)
             if response.status_code != 200:
                 logger.warning(f"Remotive returned status {response.status_code}")
                 return []
@@ -76,14 +74,12 @@ class RemotiveAdapter(BaseAdapter):
             logger.info(f"Remotive returned {len(results)} results")
             return results
 
-        except requests.exceptions.Timeout:
+        except TIMEOUT_ERRORS:
             logger.warning("Remotive request timed out")
             return []
+        except CircuitOpenError:
+            logger.debug("Remotive skipped: circuit open")
+            return []
         except Exception as e:
             logger.error(f"Remotive error: {e}")
             return []
-
-    async def search(self, query: str = "",
-                     category: str = "") -> list[OpportunityResult]:
-        """Async wrapper"""
-        return await asyncio.to_thread(self._search_sync, query, category)
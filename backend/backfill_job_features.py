@@ -0,0 +1,46 @@
+"""
+Backfill precomputed job features (sql/010_job_features.sql) for existing rows.
+New rows get them from BaseScraper.save_job; run this once after the migration
+and again whenever FEATURES_VERSION is bumped.
+
+    python -m backend.backfill_job_features [--batch 500]
+"""
+
+import argparse
+import time
+
+from backend.database import get_supabase
+from backend.services.job_features import compute_job_features, FEATURES_VERSION
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill jobs feature columns")
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+
+    supabase = get_supabase()
+    if not supabase:
+        print("Supabase not configured.")
+        return
+
+    stale = f"features_version.is.null,features_version.lt.{FEATURES_VERSION}"
+    started = time.perf_counter()
+    total = 0
+    while True:
+        rows = supabase.table("jobs").select("*").or_(stale).limit(args.batch).execute().data or []
+        if not rows:
+            break
+        # Full rows so the upsert never trips NOT NULL columns
+        updated = [{**r, **compute_job_features(r)} for r in rows]
+        supabase.table("jobs").upsert(updated, on_conflict="id").execute()
+        total += len(updated)
+        print(f"Backfilled {total} jobs...")
+        if len(rows) < args.batch:
+            break
+
+    elapsed = time.perf_counter() - started
+    print(f"Done: {total} jobs in {elapsed:.1f}s (features v{FEATURES_VERSION})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Offline benchmark scripts — run from the repo root, e.g. `python -m backend.benchmarks.bench_db_jobs`
@@ -0,0 +1,125 @@
+"""
+Benchmark: cache entry encodings for the opportunity cache.
+
+Builds real cache entries by running OpportunityService.search offline over
+the recorded upstream fixtures (same setup as bench_opportunity_pipeline),
+then compares the pre-codec JSONB row against cache_codec with each
+available compression. Per format it reports:
+  row_kb     size of the opportunity_cache row as PostgREST returns it
+  shared_kb  size of the value stored in the Redis-protocol tier
+  encode_ms  cache_codec.encode (or json.dumps for the JSONB row)
+  decode_ms  CPU to turn the stored value back into the entry dict
+  l2_read_ms JSON-parse of the row as the Supabase client sees it + decode,
+             plus --db-ms of simulated transfer time per 100 KB
+Every format is checked to round-trip to the same entry.
+
+    python -m backend.benchmarks.bench_cache_codec --repeat 50
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+from contextlib import ExitStack
+from unittest import mock
+
+import httpx
+
+from backend.adapters import base_adapter
+from backend.benchmarks.bench_opportunity_pipeline import PROFILES, RecordedUpstreams, _load, _new_service
+from backend.benchmarks.common import print_table, summarize, timed
+from backend.benchmarks.memory_supabase import MemorySupabase
+from backend.services import cache_backends, cache_codec, cache_service, opportunity_service, skill_matcher
+
+
+async def build_entries() -> list[dict]:
+    """One cache entry per benchmark profile (plus skill-subset variants), captured from the memory tier."""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(RecordedUpstreams()))
+    db = MemorySupabase(_load("supabase.json"))
+    service = _new_service()
+    profiles = PROFILES + [dict(p, skills=p["skills"][:2]) for p in PROFILES]
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch.object(base_adapter, "get_http_client", lambda: client))
+        for module in (cache_backends, opportunity_service, skill_matcher):
+            stack.enter_context(mock.patch.object(module, "get_supabase", lambda: db))
+        stack.enter_context(mock.patch("google.generativeai.GenerativeModel",
+                                       side_effect=RuntimeError("offline benchmark")))
+        cache_service.configure_tiers("memory")
+        stack.callback(cache_service.configure_tiers)
+        cache_service._memory_cache.clear()
+        for profile in profiles:
+            await service.search(profile, force_refresh=True)
+        entries = [value for value, _, _, _ in cache_service._memory_cache._data.values()]
+    await client.aclose()
+    # What the entry looks like once it has been through JSON (as every remote tier returns it)
+    return [json.loads(json.dumps(e, default=str)) for e in entries]
+
+
+def _row_text(entry: dict, compression: str) -> tuple[str, bytes]:
+    """(opportunity_cache row as JSON text, shared-tier value) for one format."""
+    row = {"cache_key": "k", "source_breakdown": entry.get("source_breakdown"),
+           "created_at": entry["cached_at"], "expires_at": entry["expires_at"]}
+    blob = cache_codec.encode(entry, compression)
+    if compression == "json":
+        row.update(results=entry["opportunities"], payload=None)
+    else:
+        row.update(results=[], payload=base64.b64encode(blob).decode("ascii"))
+    return json.dumps([row], separators=(",", ":")), blob
+
+
+def _read_row(text: str) -> dict:
+    row = json.loads(text)[0]
+    if row["payload"]:
+        return cache_codec.decode(base64.b64decode(row["payload"]))
+    return {"opportunities": row["results"], "source_breakdown": row["source_breakdown"],
+            "cached_at": row["created_at"], "expires_at": row["expires_at"]}
+
+
+def measure(entries: list[dict], compression: str, repeat: int, db_ms: float) -> dict:
+    encode_s, decode_s, read_s = [], [], []
+    row_bytes = shared_bytes = 0
+    same = True
+    for entry in entries:
+        lat, (text, blob) = timed(_row_text, entry, compression, repeat=repeat)
+        encode_s += lat
+        row_bytes += len(text.encode())
+        shared_bytes += len(blob)
+        lat, decoded = timed(cache_codec.decode, blob, repeat=repeat)
+        decode_s += lat
+        transfer_s = db_ms / 1000 * len(text.encode()) / 102400
+        lat, read = timed(_read_row, text, repeat=repeat)
+        read_s += [v + transfer_s for v in lat]
+        same = same and decoded == entry and read["opportunities"] == entry["opportunities"]
+    n = len(entries)
+    return {
+        "format": compression if compression == "json" else f"codec+{compression}",
+        "row_kb": round(row_bytes / n / 1024, 1),
+        "shared_kb": round(shared_bytes / n / 1024, 1),
+        "encode_ms": summarize(encode_s)["p50_ms"],
+        "decode_ms": summarize(decode_s)["p50_ms"],
+        "l2_read_ms": summarize(read_s)["p50_ms"],
+        "same": "yes" if same else "NO",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=30, help="timed runs per entry and format")
+    parser.add_argument("--db-ms", type=float, default=0.0, help="simulated transfer time per 100 KB of row")
+    args = parser.parse_args()
+
+    entries = asyncio.run(build_entries())
+    opportunities = sum(len(e["opportunities"]) for e in entries)
+    print(f"{len(entries)} cache entries, {opportunities / len(entries):.0f} opportunities each on average")
+
+    formats = ["json", "none"] + [c for c in ("zlib", "lz4", "zstd") if c in cache_codec._COMPRESSORS]
+    rows = [measure(entries, c, args.repeat, args.db_ms) for c in formats]
+    base = rows[0]
+    for row in rows:
+        row["size_vs_json"] = f"{row['row_kb'] / base['row_kb']:.2f}x"
+    print_table(rows, ["format", "row_kb", "shared_kb", "size_vs_json", "encode_ms", "decode_ms",
+                       "l2_read_ms", "same"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Benchmark: opportunity cache keys on a replayed profile workload, fully offline.
+
+A deterministic stream of searches is generated from a set of personas, each
+request perturbed the way real profiles differ: skill casing, synonyms and
+abbreviations ("ML" / "Machine Learning", "NodeJS" / "Node.js"), reordered
+top skills, extra trailing skills and reworded goals. The stream is replayed
+through OpportunityService (upstreams from fixtures/api/, in-memory Supabase)
+twice:
+  legacy     md5(country, first three skills as typed, level), queries built
+             from raw skills, no per-query cache (the pre-canonicalization code)
+  canonical  key from the canonical query set, per-query raw result cache
+Reported per scheme: distinct entries, entry hit ratio, wrong hits (served an
+entry filled by a profile whose upstream queries differ, or whose embedded
+international programs were matched on different skills / goal) and upstream
+HTTP requests issued.
+
+    python -m backend.benchmarks.bench_cache_keys --requests 400
+"""
+
+import argparse
+import asyncio
+import hashlib
+import random
+import time
+from contextlib import ExitStack
+from unittest import mock
+
+import httpx
+
+from backend.adapters import base_adapter
+from backend.benchmarks.bench_opportunity_pipeline import RecordedUpstreams, _load, _new_service
+from backend.benchmarks.common import print_table, summarize
+from backend.benchmarks.memory_supabase import MemorySupabase
+from backend.services import cache_backends, cache_service, opportunity_service, skill_matcher
+from backend.services.cache_service import build_cache_key
+from backend.services.query_builder import build_queries
+
+PERSONAS = [
+    ("IN", ["Python", "Machine Learning", "SQL", "Pandas"], "Data Scientist", "student"),
+    ("IN", ["React", "JavaScript", "Node.js", "CSS"], "Frontend Developer", "student"),
+    ("IN", ["Java", "Spring Boot", "SQL", "Docker"], "Backend Developer", "fresher"),
+    ("IN", ["Python", "Django", "PostgreSQL", "AWS"], "Backend Developer", "student"),
+    ("IN", ["Machine Learning", "Deep Learning", "Python", "TensorFlow"], "ML Engineer", "student"),
+    ("IN", ["Flutter", "Dart", "Firebase"], "Mobile Developer", "student"),
+    ("IN", ["Docker", "Kubernetes", "AWS", "Linux"], "DevOps Engineer", "fresher"),
+    ("US", ["Python", "Machine Learning", "SQL"], "Data Scientist", "student"),
+    ("US", ["React", "TypeScript", "Next.js"], "Frontend Developer", "entry-level"),
+    ("DE", ["Java", "Spring", "AWS"], "Software Engineer", "entry-level"),
+    ("IN", ["Data Analysis", "SQL", "Power BI", "Excel"], "Data Analyst", "student"),
+    ("IN", ["JavaScript", "React", "Node.js", "MongoDB"], "Full Stack Developer", "student"),
+]
+
+SYNONYMS = {
+    "Machine Learning": ["ML", "machine learning", "Machine learning"],
+    "Node.js": ["NodeJS", "node js", "nodejs"],
+    "React": ["ReactJS", "React.js", "react"],
+    "Next.js": ["NextJS", "next js"],
+    "Deep Learning": ["DL", "deep learning"],
+    "Data Analysis": ["data analysis", "Data analysis"],
+    "PostgreSQL": ["postgresql", "PostgreSQL "],
+    "JavaScript": ["javascript", "Javascript"],
+    "Python": ["python", "PYTHON"],
+    "SQL": ["sql", "Sql"],
+}
+GOAL_VARIANTS = {"ML Engineer": ["Machine Learning Engineer", "ml engineer"],
+                 "Data Scientist": ["data scientist", "Data  Scientist"]}
+EXTRA_SKILLS = ["Git", "Excel", "Communication", "Figma", "C++", "Linux", "Tableau", "GraphQL", "Redis"]
+
+
+def workload(n: int, seed: int = 20) -> list[dict]:
+    rng = random.Random(seed)
+    weights = [1 / (i + 1) for i in range(len(PERSONAS))]  # a few popular personas, a long tail
+    profiles = []
+    for _ in range(n):
+        country, skills, goal, level = rng.choices(PERSONAS, weights)[0]
+        skills = [rng.choice(SYNONYMS[s]) if s in SYNONYMS and rng.random() < 0.5 else s for s in skills]
+        top = skills[:3]
+        if rng.random() < 0.5:
+            rng.shuffle(top)
+        skills = top + skills[3:] + rng.sample(EXTRA_SKILLS, rng.randrange(0, 3))
+        if goal in GOAL_VARIANTS and rng.random() < 0.4:
+            goal = rng.choice(GOAL_VARIANTS[goal])
+        profiles.append({"country": country, "skills": skills, "career_goal": goal, "experience_level": level})
+    return profiles
+
+
+# ─── The pre-canonicalization behaviour ────────────────────────
+
+def legacy_cache_key(profile: dict) -> str:
+    country = (profile.get("country") or "UNKNOWN").upper()
+    skills = sorted([s.lower() for s in profile.get("skills", [])[:3]])
+    level = profile.get("experience_level", "student")
+    return hashlib.md5(f"{country}:{':'.join(skills)}:{level}".encode()).hexdigest()
+
+
+def legacy_build_queries(profile: dict) -> list[str]:
+    skills = profile.get("skills", [])[:5]
+    goal = profile.get("career_goal", "")
+    level_keyword = {"student": "intern", "fresher": "fresher entry level", "entry-level": "junior",
+                     "mid-level": ""}.get(profile.get("experience_level", "student"), "intern")
+    queries = [f"{goal} {level_keyword}".strip()] if goal else []
+    queries += [f"{skill} {level_keyword}".strip() for skill in skills[:3]]
+    if len(skills) >= 2:
+        queries.append(f"{skills[0]} {skills[1]} {level_keyword}".strip())
+    queries = queries or [f"software developer {level_keyword}".strip()]
+    seen, unique = set(), []
+    for q in queries:
+        if q.lower() not in seen:
+            seen.add(q.lower())
+            unique.append(q)
+    return unique[:6]
+
+
+# What an entry's contents depend on: (upstream queries, program-matching inputs).
+# Legacy entries embed international programs (matched on every skill + the goal);
+# canonical entries hold only query results and programs are matched per caller.
+def _legacy_identity(profile: dict) -> tuple:
+    return ((profile["country"], tuple(legacy_build_queries(profile))),
+            (frozenset(s.lower() for s in profile["skills"]), profile["career_goal"].lower()))
+
+
+def _canonical_identity(profile: dict) -> tuple:
+    return (profile["country"], tuple(build_queries(profile))), None
+
+
+async def replay(profiles: list[dict], scheme: str) -> dict:
+    upstreams = RecordedUpstreams()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(upstreams))
+    db = MemorySupabase(_load("supabase.json"))
+    service = _new_service()
+    key_fn, identity = ((legacy_cache_key, _legacy_identity) if scheme == "legacy"
+                        else (build_cache_key, _canonical_identity))
+    filled_by: dict[str, tuple] = {}
+    hits = wrong_queries = wrong_programs = 0
+    latencies = []
+
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch.object(base_adapter, "get_http_client", lambda: client))
+        for module in (cache_backends, opportunity_service, skill_matcher):
+            stack.enter_context(mock.patch.object(module, "get_supabase", lambda: db))
+        stack.enter_context(mock.patch("google.generativeai.GenerativeModel",
+                                       side_effect=RuntimeError("offline benchmark")))
+        if scheme == "legacy":
+            stack.enter_context(mock.patch.object(opportunity_service, "build_cache_key", legacy_cache_key))
+            stack.enter_context(mock.patch.object(opportunity_service, "build_queries", legacy_build_queries))
+            stack.enter_context(mock.patch.object(opportunity_service, "QUERY_CACHE_TTL", 0))
+        cache_service.configure_tiers("memory")
+        stack.callback(cache_service.configure_tiers)
+        cache_service._memory_cache.clear()
+
+        for profile in profiles:
+            key = key_fn(profile)
+            started = time.perf_counter()
+            result = await service.search(profile)
+            latencies.append(time.perf_counter() - started)
+            if result.get("cached"):
+                hits += 1
+                (queries, programs), (own_queries, own_programs) = filled_by[key], identity(profile)
+                wrong_queries += queries != own_queries
+                wrong_programs += queries == own_queries and programs != own_programs
+            else:
+                filled_by[key] = identity(profile)
+
+    await client.aclose()
+    return {
+        "scheme": scheme,
+        "searches": len(profiles),
+        "entries": len(filled_by),
+        "hit_ratio": round(hits / len(profiles), 3),
+        "wrong_queries": wrong_queries,
+        "wrong_programs": wrong_programs,
+        "upstream_requests": upstreams.requests,
+        **{k: v for k, v in summarize(latencies).items() if k in ("mean_ms", "p50_ms")},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400, help="searches in the replayed workload")
+    parser.add_argument("--seed", type=int, default=20)
+    args = parser.parse_args()
+
+    profiles = workload(args.requests, args.seed)
+    rows = [asyncio.run(replay(profiles, scheme)) for scheme in ("legacy", "canonical")]
+    print_table(rows, ["scheme", "searches", "entries", "hit_ratio", "wrong_queries", "wrong_programs",
+                       "upstream_requests",
+                       "mean_ms", "p50_ms"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: requests/second on GET /api/opportunities/db/jobs, comparing
+a fresh Supabase client per get_supabase() call ("before") with the
+process-wide SupabasePool ("after"), against a local PostgREST stand-in.
+
+    python -m backend.benchmarks.bench_db_jobs --requests 300 --concurrency 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.benchmarks.common import summarize, print_table
+from backend.benchmarks.postgrest_standin import start_standin, sample_jobs, sample_profile, FAKE_KEY
+
+
+class _UnpooledClients:
+    """Mimics the old behaviour: build a brand-new client on every checkout."""
+
+    def get(self):
+        from backend import database
+        return database._new_client()
+
+    def record_request(self, checkouts: int):
+        pass
+
+
+def _run(client, total: int, concurrency: int) -> dict:
+    def one(_):
+        started = time.perf_counter()
+        resp = client.get("/api/opportunities/db/jobs", params={"limit": 100, "user_id": "bench-user"})
+        resp.raise_for_status()
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(one, range(total)))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    server, base_url = start_standin({"jobs": sample_jobs(200), "profiles": [sample_profile()]})
+    os.environ["SUPABASE_URL"] = base_url
+    os.environ["SUPABASE_KEY"] = FAKE_KEY
+    os.environ["SUPABASE_HEALTH_INTERVAL"] = "0"
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+    from backend import database
+    database.url, database.key = base_url, FAKE_KEY
+
+    from fastapi.testclient import TestClient
+    from backend.main import app
+
+    rows = []
+    with TestClient(app) as client:
+        pooled = database._pool
+        database._pool = _UnpooledClients()
+        rows.append({"mode": "before (client per call)", **_run(client, args.requests, args.concurrency)})
+
+        database._pool = pooled
+        rows.append({"mode": f"after (pool size {pooled.size})", **_run(client, args.requests, args.concurrency)})
+        print(f"Pool stats: {pooled.stats()}")
+
+    server.shutdown()
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
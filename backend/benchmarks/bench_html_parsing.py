@@ -0,0 +1,133 @@
+"""
+Benchmark: HTML parsing for the scrapers and job-detail pages — the old
+full html.parser tree vs a full lxml tree vs the shipped make_soup path
+(lxml + SoupStrainer where the caller only reads a few containers).
+
+Runs each scraper's real extraction code against the saved pages in
+fixtures/html/ (regenerate with fixtures/make_html_fixtures.py), with fetch
+and saves replaced by in-memory fakes, and checks every mode extracts the
+same records as the html.parser baseline.
+
+    python -m backend.benchmarks.bench_html_parsing --repeat 20
+"""
+
+import argparse
+import contextlib
+import functools
+import io
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from bs4 import BeautifulSoup
+
+from backend.benchmarks.common import summarize, print_table
+from backend.scrapers import parsing
+from backend.scrapers import aicte, hackathons, hackerearth, internshala, linkedin
+from backend.routers import job_detail
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "html"
+
+
+def _baseline_soup(markup, parse_only=None, parser=None):
+    """What every call site did before make_soup existed."""
+    return BeautifulSoup(markup, "html.parser")
+
+
+def _full_lxml_soup(markup, parse_only=None, parser=None):
+    return parsing.make_soup(markup, parser="lxml")
+
+
+MODES = {
+    "html.parser": _baseline_soup,
+    "lxml": _full_lxml_soup,
+    "lxml+strainer": functools.partial(parsing.make_soup, parser="lxml"),
+}
+
+
+def _response(html: str):
+    return SimpleNamespace(status_code=200, text=html, content=html.encode())
+
+
+def _scraper_case(module, cls, method, *args):
+    """Run `cls.method(*args)` on the fixture with fetch/save faked; return saved rows."""
+    def run(html: str) -> list[dict]:
+        rows = []
+        scraper = object.__new__(cls)
+        scraper.headers = {}
+        scraper.fetch = lambda *a, **k: _response(html)
+        scraper.save_job = rows.append
+        scraper.save_hackathon = rows.append
+        getattr(scraper, method)(*args)
+        return rows
+    return module, run
+
+
+def _detail_case(fn):
+    def run(html: str):
+        with mock.patch.object(job_detail, "requests", SimpleNamespace(get=lambda *a, **k: _response(html))):
+            return fn("https://example.com/job")
+    return job_detail, run
+
+
+CASES = {
+    "internshala_listing.html": _scraper_case(internshala, internshala.InternshalaScraper, "scrape_url",
+                                                  "https://internshala.com/internships/computer-science-internship/"),
+    "hackerearth_challenges.html": _scraper_case(hackerearth, hackerearth.HackerEarthScraper, "scrape_hackathons"),
+    "linkedin_search.html": _scraper_case(linkedin, linkedin.LinkedInScraper, "scrape_guest_jobs"),
+    "mlh_events.html": _scraper_case(hackathons, hackathons.HackathonScraper, "scrape_mlh"),
+    "aicte_home.html": _scraper_case(aicte, aicte.AictScraper, "scrape_internships"),
+    "internshala_detail.html": _detail_case(job_detail._scrape_internshala_detail),
+    "generic_detail.html": _detail_case(job_detail._scrape_generic_detail),
+}
+
+
+def _comparable(result):
+    """Drop wall-clock fields so runs in different modes compare equal."""
+    if isinstance(result, list):
+        return [{k: v for k, v in r.items() if k != "created_at"} for r in result]
+    return result
+
+
+def run_case(module, run, html: str, soup_fn, repeat: int):
+    latencies, result = [], None
+    with mock.patch.object(module, "make_soup", soup_fn), mock.patch("time.sleep"), \
+            contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = run(html)
+            latencies.append(time.perf_counter() - started)
+    return latencies, _comparable(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--only", help="run a single fixture, e.g. internshala_listing.html")
+    args = parser.parse_args()
+
+    rows = []
+    for name, (module, run) in CASES.items():
+        if args.only and name != args.only:
+            continue
+        html = (FIXTURES / name).read_text(encoding="utf-8")
+        baseline_ms, expected = None, None
+        for mode, soup_fn in MODES.items():
+            latencies, result = run_case(module, run, html, soup_fn, args.repeat)
+            stats = summarize(latencies)
+            if expected is None:
+                expected, baseline_ms = result, stats["mean_ms"]
+            records = len(result) if isinstance(result, list) else int(result is not None)
+            rows.append({
+                "fixture": name, "kb": round(len(html) / 1024), "mode": mode, "records": records,
+                "same": "yes" if result == expected else "NO",
+                **{k: stats[k] for k in ("mean_ms", "p50_ms", "p95_ms")},
+                "speedup": f"{baseline_ms / stats['mean_ms']:.1f}x" if stats["mean_ms"] else "-",
+            })
+
+    print_table(rows, ["fixture", "kb", "mode", "records", "same", "mean_ms", "p50_ms", "p95_ms", "speedup"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Benchmark: /api/prep/submit latency and Gemini use with and without the local
+grader, fully offline.
+
+Replays quiz submissions (10 MCQs, 6 short answers, 4 coding questions with
+stored tests) through the prep router against an in-memory Supabase. Text
+answers are drawn from labelled pools: good, wrong, vague, reversed (the
+right terms with the meaning swapped), keyword-stuffed and skipped short
+answers; passing, wrong, partly wrong, non-Python and non-terminating code.
+Gemini is replaced by a stand-in that grades after --gemini-ms. Reported per
+mode: submit latency, submissions that still needed Gemini, answers graded
+locally, and local verdicts that disagree with the label (should be 0).
+Coding answers are only graded locally where the bwrap sandbox works; without
+it they all go to the Gemini stand-in.
+
+    python -m backend.benchmarks.bench_local_grader --submissions 60 --gemini-ms 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import time
+from contextlib import ExitStack
+from unittest import mock
+
+from backend.benchmarks.common import print_table, summarize
+from backend.benchmarks.memory_supabase import MemorySupabase
+from backend.routers import prep
+from backend.services import local_grader
+from backend.utils import gemini_client, llm_scheduler
+
+SHORT = [
+    ("What does the Python GIL do?",
+     "The global interpreter lock is a mutex that lets only one thread execute bytecode at a time, "
+     "so CPU-bound threads get no parallelism.",
+     {"good": "A mutex lock: only one thread can execute Python bytecode at a time, so CPU bound threads "
+              "don't run in parallel.",
+      "wrong": "It manages garbage collection of unused objects.",
+      "vague": "Something about threads and locking.",
+      "reversed": "It lets every thread execute bytecode at a time in parallel; only CPU-bound threads need "
+                  "the global interpreter lock mutex.",
+      "stuffed": "global interpreter lock mutex thread execute bytecode time CPU-bound threads parallelism"}),
+    ("Why add an index to a database column?",
+     "An index is a sorted lookup structure that lets queries find matching rows without a full table scan, "
+     "at the cost of slower writes and extra storage.",
+     {"good": "It lets the query find rows through a sorted lookup instead of a full table scan; writes get "
+              "slower and it needs storage.",
+      "wrong": "To encrypt the column values.",
+      "vague": "It makes the table faster.",
+      "reversed": "An index makes writes faster and saves storage, but queries need a full table scan "
+                  "instead of a sorted lookup to find matching rows.",
+      "stuffed": "index sorted lookup structure queries matching rows full table scan slower writes "
+                 "extra storage"}),
+]
+CODING = [
+    ("Return the sum of a list of numbers.", "total",
+     "def total(nums):\n    return sum(nums)",
+     [{"args": [[1, 2, 3]], "expected": 6}, {"args": [[]], "expected": 0}, {"args": [[-4, 4]], "expected": 0}],
+     {"good": "def total(nums):\n    s = 0\n    for n in nums:\n        s += n\n    return s",
+      "wrong": "def total(nums):\n    return max(nums, default=-1)",
+      "partial": "def total(nums):\n    return sum(nums[1:])",
+      "pseudo": "total(nums) = reduce(+, nums)",
+      "loop": "def total(nums):\n    while True:\n        pass"}),
+    ("Reverse the words in a sentence.", "reverse_words",
+     "def reverse_words(s):\n    return ' '.join(s.split()[::-1])",
+     [{"args": ["hello big world"], "expected": "world big hello"}, {"args": ["a"], "expected": "a"}],
+     {"good": "def reverse_words(s):\n    words = s.split()\n    words.reverse()\n    return ' '.join(words)",
+      "wrong": "def reverse_words(s):\n    return s[::-1]",
+      "partial": "def reverse_words(s):\n    return ' '.join(reversed(s.split(' '))) if ' ' in s else ''",
+      "pseudo": "function reverseWords(s) { return s.split(' ').reverse().join(' ') }",
+      "loop": "def reverse_words(s):\n    while True:\n        pass"}),
+]
+_CORRECT = {"good"}
+_SHORT_MIX = ["good"] * 5 + ["wrong"] * 2 + ["vague"] * 2 + ["reversed"] * 2 + ["stuffed"] * 2 + ["skipped"]
+_CODING_MIX = ["good"] * 5 + ["wrong"] * 2 + ["partial", "pseudo", "skipped"]
+
+
+class FakeGemini:
+    """GenerativeModel stand-in: marks every answered question correct after a fixed delay."""
+
+    def __init__(self, delay_s: float):
+        self.delay_s = delay_s
+        self.calls = 0
+        self.graded = 0
+
+    def model(self, _name):
+        return self
+
+    def generate_content(self, prompt, **_):
+        time.sleep(self.delay_s)
+        self.calls += 1
+        indexes = [int(i) for i in re.findall(r"^Q(\d+) \(", prompt, re.M)]
+        self.graded += len(indexes)
+        response = mock.Mock()
+        response.text = json.dumps([{"index": i, "is_correct": True, "score": 1, "feedback": "ok"} for i in indexes])
+        response.usage_metadata.total_token_count = 1500
+        return response
+
+
+def build_sessions(n: int, with_loops: bool, seed: int = 25) -> tuple[list[dict], dict]:
+    """prep_sessions rows plus {(session_id, index): label}."""
+    rng = random.Random(seed)
+    coding_mix = _CODING_MIX + (["loop"] if with_loops else [])
+    sessions, labels = [], {}
+    for s in range(n):
+        questions, answers = [], []
+        for i in range(10):
+            questions.append({"index": i, "type": "mcq", "question": f"mcq {i}", "options": ["A) a", "B) b"],
+                              "correct_answer": "A) a", "topic": "Python"})
+            answers.append({"question_index": i, "answer": rng.choice("AB")})
+        for i in range(10, 16):
+            question, expected, pool = SHORT[i % len(SHORT)]
+            label = rng.choice(_SHORT_MIX)
+            questions.append({"index": i, "type": "short_answer", "question": question,
+                              "correct_answer": expected, "topic": "Python"})
+            answers.append({"question_index": i, "answer": "" if label == "skipped" else pool[label]})
+            labels[(f"s{s}", i)] = label
+        for i in range(16, 20):
+            question, function, reference, tests, pool = CODING[i % len(CODING)]
+            label = rng.choice(coding_mix)
+            questions.append({"index": i, "type": "coding", "question": question, "correct_answer": reference,
+                              "function_name": function, "tests": tests, "topic": "Algorithms"})
+            answers.append({"question_index": i, "answer": "" if label == "skipped" else pool[label]})
+            labels[(f"s{s}", i)] = label
+        sessions.append({"id": f"s{s}", "user_id": "user", "questions": questions, "answers": answers})
+    return sessions, labels
+
+
+async def replay(sessions: list[dict], labels: dict, enabled: bool, delay_s: float) -> dict:
+    db = MemorySupabase({"prep_sessions": [{k: v for k, v in s.items() if k != "answers"} for s in sessions]})
+    fake = FakeGemini(delay_s)
+    latencies, needed_gemini, local, disagreements = [], 0, 0, 0
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch("google.generativeai.GenerativeModel", fake.model))
+        stack.enter_context(mock.patch.dict(os.environ, {"GEMINI_API_KEY": "offline"}))
+        stack.enter_context(mock.patch.object(gemini_client, "_client", None))
+        stack.enter_context(mock.patch.object(llm_scheduler, "_scheduler", llm_scheduler.LLMScheduler(rpm=0, tpm=0)))
+        stack.enter_context(mock.patch.object(local_grader, "ENABLED", enabled))
+        stack.enter_context(mock.patch.object(prep, "get_supabase", lambda: db))
+
+        for session in sessions:
+            calls = fake.calls
+            started = time.perf_counter()
+            result = await prep.submit_quiz(prep.SubmitQuizRequest(session_id=session["id"],
+                                                                   answers=session["answers"]))
+            latencies.append(time.perf_counter() - started)
+            needed_gemini += fake.calls > calls
+            for item in result["feedback"]:
+                if item.get("graded_by") == "local":
+                    local += 1
+                    label = labels[(session["id"], item["index"])]
+                    # only Gemini accepts short answers; "loop" is wrong by timeout
+                    disagreements += item["is_correct"] != (label in _CORRECT)
+
+    stats = summarize(latencies)
+    return {
+        "mode": "local + gemini" if enabled else "gemini only",
+        "submissions": len(sessions),
+        "needed_gemini": needed_gemini,
+        "answers_to_gemini": fake.graded,
+        "graded_locally": local,
+        "local_disagreements": disagreements,
+        "mean_ms": stats["mean_ms"],
+        "p50_ms": stats["p50_ms"],
+        "p95_ms": stats["p95_ms"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--submissions", type=int, default=60)
+    parser.add_argument("--gemini-ms", type=float, default=2000, help="simulated Gemini grading time")
+    parser.add_argument("--with-loops", action="store_true",
+                        help="include non-terminating answers (each costs LOCAL_GRADER_TIMEOUT)")
+    args = parser.parse_args()
+
+    sessions, labels = build_sessions(args.submissions, args.with_loops)
+    rows = [asyncio.run(replay(sessions, labels, enabled, args.gemini_ms / 1000)) for enabled in (False, True)]
+    print_table(rows, ["mode", "submissions", "needed_gemini", "answers_to_gemini", "graded_locally",
+                       "local_disagreements", "mean_ms", "p50_ms", "p95_ms"])
+
+
+if __name__ == "__main__":
+    main()
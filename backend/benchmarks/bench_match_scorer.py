@@ -0,0 +1,110 @@
+"""
+Microbenchmark: match_scorer throughput per 1,000 opportunities.
+
+Compares the old call pattern (get_related_skills awaited for every skill
+and the goal on every opportunity) with ProfileMatcher, which expands the
+profile once and scores the batch in one synchronous pass.
+Only static-hierarchy skills are used, so no Gemini/Supabase calls happen.
+
+    python -m backend.benchmarks.bench_match_scorer --opportunities 1000 --repeat 20
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from backend.benchmarks.common import summarize, print_table
+from backend.services.match_scorer import ProfileMatcher, score_opportunities
+from backend.services.skill_matcher import get_related_skills, fuzzy_match
+
+PROFILE = {
+    "skills": ["Python", "React", "Machine Learning", "SQL", "Docker",
+               "JavaScript", "Django", "AWS", "Pandas", "Java"],
+    "career_goal": "web development",
+    "experience_level": "student",
+    "city": "Pune",
+    "state": "Maharashtra",
+}
+
+_TITLES = ["Python Developer Intern", "Senior Java Engineer", "Frontend Engineer (React)",
+           "Data Analyst", "ML Engineer", "DevOps Trainee", "Marketing Associate"]
+_TAGS = ["python", "react", "sql", "docker", "aws", "excel", "figma", "kubernetes", "pandas"]
+
+
+def make_opportunities(n: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "title": rng.choice(_TITLES),
+            "description": " ".join(rng.choices(_TAGS + ["team", "api", "cloud", "dashboards"], k=40)),
+            "tags": rng.sample(_TAGS, 3),
+            "location": rng.choice(["Pune, Maharashtra", "Remote", "Berlin"]),
+            "is_remote": rng.random() < 0.3,
+        }
+        for _ in range(n)
+    ]
+
+
+async def _legacy_score(opportunity: dict, profile: dict) -> int:
+    """The skill/goal part of the old score_opportunity: expansions re-done per opportunity."""
+    user_skills = [s.lower() for s in profile.get("skills", [])]
+    opp_tags = [t.lower() for t in opportunity.get("tags", [])]
+    opp_text = (opportunity.get("title", "") + " " + (opportunity.get("description", "") or "")).lower()
+    matched = 0.0
+    for skill in user_skills:
+        expanded = await get_related_skills(skill)
+        if any(exp in opp_tags or exp in opp_text for exp in expanded):
+            matched += 1.0
+        elif any(fuzzy_match(skill, tag) for tag in opp_tags):
+            matched += 0.7
+    goal_related = await get_related_skills(profile.get("career_goal", "").lower())
+    return int(matched) + (15 if any(g in opp_text for g in goal_related) else 0)
+
+
+async def main_async(args):
+    opportunities = make_opportunities(args.opportunities)
+    rows = []
+
+    latencies = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        for opp in opportunities:
+            await _legacy_score(opp, PROFILE)
+        latencies.append(time.perf_counter() - started)
+    rows.append({"mode": "per-opportunity expansion", **summarize(latencies)})
+
+    latencies = []
+    for _ in range(args.repeat):
+        batch = [dict(o) for o in opportunities]
+        started = time.perf_counter()
+        await score_opportunities(batch, PROFILE)
+        latencies.append(time.perf_counter() - started)
+    rows.append({"mode": "ProfileMatcher batch", **summarize(latencies)})
+
+    matcher = await ProfileMatcher.build(PROFILE)
+    latencies = []
+    for _ in range(args.repeat):
+        batch = [dict(o) for o in opportunities]
+        started = time.perf_counter()
+        matcher.score_all(batch)
+        latencies.append(time.perf_counter() - started)
+    rows.append({"mode": "ProfileMatcher (prebuilt)", **summarize(latencies)})
+
+    scale = 1000 / args.opportunities
+    for row in rows:
+        row["ms_per_1k"] = round(row["mean_ms"] * scale, 3)
+        row["opps_per_sec"] = round(args.opportunities / (row["mean_ms"] / 1000)) if row["mean_ms"] else 0
+    print(f"{args.opportunities} opportunities x {len(PROFILE['skills'])} skills, {args.repeat} runs each")
+    print_table(rows, ["mode", "mean_ms", "p95_ms", "ms_per_1k", "opps_per_sec"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="match_scorer throughput")
+    parser.add_argument("--opportunities", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
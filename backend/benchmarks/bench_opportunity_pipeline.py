@@ -0,0 +1,358 @@
+"""
+Benchmark: OpportunityService.search end to end, fully offline.
+
+Upstream APIs are replayed from fixtures/api/ (JSearch, Adzuna, Remotive,
+Arbeitnow) through an httpx.MockTransport on the shared adapter client, and
+Supabase is the in-memory stand-in (memory_supabase) seeded with
+international programs and skill expansions. Nothing leaves the process.
+
+Per stage — fetch (adapter fan-out, wall time), dedup, score, cache write,
+cache read — it reports p50/p95/p99 latency and throughput, then re-runs the
+same workload under tracemalloc for peak/net allocations. End-to-end rows
+cover cold searches, warm L1 hits, L2 hits (L1 cleared) and a concurrent
+burst. With --shared the Redis-protocol tier runs against the local RESP
+stand-in (resp_standin) and a shared-hit phase is added. Save a run with --save and compare later runs with --baseline to see
+regressions (p95 over the tolerance is flagged).
+
+    python -m backend.benchmarks.bench_opportunity_pipeline --iterations 30
+    python -m backend.benchmarks.bench_opportunity_pipeline --save base.json
+    python -m backend.benchmarks.bench_opportunity_pipeline --baseline base.json
+    python -m backend.benchmarks.bench_opportunity_pipeline --shared --db-ms 40
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+import zlib
+from collections import defaultdict
+from contextlib import ExitStack
+from pathlib import Path
+from unittest import mock
+
+import httpx
+
+from backend.adapters import base_adapter
+from backend.benchmarks.common import summarize, print_table
+from backend.benchmarks.memory_supabase import MemorySupabase
+from backend.benchmarks.resp_standin import start_standin, store_of
+from backend.services import cache_backends, cache_service, opportunity_service, skill_matcher
+from backend.services.opportunity_service import OpportunityService
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "api"
+
+PROFILES = [
+    {"country": "IN", "skills": ["Python", "FastAPI", "SQL"], "career_goal": "Backend Developer",
+     "experience_level": "student", "city": "Bangalore", "state": "Karnataka"},
+    {"country": "IN", "skills": ["React", "TypeScript", "Docker"], "career_goal": "Frontend Developer",
+     "experience_level": "fresher", "city": "Pune", "state": "Maharashtra"},
+    {"country": "US", "skills": ["Machine Learning", "Python", "Pandas"], "career_goal": "Data Scientist",
+     "experience_level": "student"},
+    {"country": "DE", "skills": ["Java", "Spring", "AWS"], "career_goal": "Software Engineer",
+     "experience_level": "junior"},
+]
+
+
+# ─── Offline upstreams ─────────────────────────────────────────
+
+def _load(name: str):
+    return json.loads((FIXTURES / name).read_text(encoding="utf-8"))
+
+
+def _window(items: list, key: str, n: int) -> list:
+    """A deterministic n-item window of `items` chosen by `key`, so different queries overlap but differ."""
+    if not items:
+        return []
+    start = zlib.crc32(key.encode()) % len(items)
+    return [items[(start + i) % len(items)] for i in range(min(n, len(items)))]
+
+
+class RecordedUpstreams:
+    """httpx handler replaying the recorded responses, with optional per-request latency."""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_s = latency_ms / 1000
+        self.jsearch = _load("jsearch.json")
+        self.adzuna = _load("adzuna.json")
+        self.remotive = _load("remotive.json")
+        self.arbeitnow = _load("arbeitnow.json")
+        self.requests = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        params = request.url.params
+        host = request.url.host
+        if host == "jsearch.p.rapidapi.com":
+            payload = {**self.jsearch, "data": _window(self.jsearch["data"], params.get("query", ""), 10)}
+        elif host == "api.adzuna.com":
+            rows = _window(self.adzuna["results"], params.get("what", ""), int(params.get("results_per_page", 20)))
+            payload = {**self.adzuna, "results": rows}
+        elif host == "remotive.com":
+            rows = _window(self.remotive["jobs"], params.get("search", ""), int(params.get("limit", 20)))
+            payload = {**self.remotive, "jobs": rows}
+        elif host == "www.arbeitnow.com":
+            payload = self.arbeitnow
+        else:
+            return httpx.Response(404, json={"error": f"no fixture for {host}"})
+        return httpx.Response(200, json=payload)
+
+
+# ─── Stage timing ──────────────────────────────────────────────
+
+class StageRecorder:
+    """Collects per-stage latencies (and, when tracing, allocation deltas) from wrapped calls."""
+
+    def __init__(self, trace: bool = False):
+        self.trace = trace
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.peak_bytes: dict[str, list[int]] = defaultdict(list)
+        self.net_bytes: dict[str, list[int]] = defaultdict(list)
+        self.enabled = True
+        self._fetch_window: list[float] = []
+        self._fetch_mem: list[int] = []
+
+    def _begin(self):
+        if self.trace:
+            tracemalloc.reset_peak()
+            return tracemalloc.get_traced_memory()[0], time.perf_counter()
+        return 0, time.perf_counter()
+
+    def _end(self, stage: str, token):
+        if not self.enabled:
+            return
+        start_mem, started = token
+        self.latencies[stage].append(time.perf_counter() - started)
+        if self.trace:
+            current, peak = tracemalloc.get_traced_memory()
+            self.peak_bytes[stage].append(peak - start_mem)
+            self.net_bytes[stage].append(current - start_mem)
+
+    def wrap_sync(self, stage: str, fn):
+        def wrapper(*args, **kwargs):
+            token = self._begin()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._end(stage, token)
+        return wrapper
+
+    def wrap_async(self, stage: str, fn):
+        async def wrapper(*args, **kwargs):
+            token = self._begin()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                self._end(stage, token)
+        return wrapper
+
+    def wrap_fetch(self, fn):
+        """Fan-out calls overlap, so the fetch stage is the span from first start to last finish."""
+        async def wrapper(*args, **kwargs):
+            if self.trace and not self._fetch_window:
+                tracemalloc.reset_peak()
+                self._fetch_mem = [tracemalloc.get_traced_memory()[0]]
+            started = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                self._fetch_window.extend((started, time.perf_counter()))
+                if self.trace:
+                    self._fetch_mem.extend(tracemalloc.get_traced_memory())
+        return wrapper
+
+    def close_fetch(self):
+        if self._fetch_window and self.enabled:
+            self.latencies["fetch"].append(max(self._fetch_window) - min(self._fetch_window))
+            if self.trace:
+                start_mem = self._fetch_mem[0]
+                self.peak_bytes["fetch"].append(max(self._fetch_mem[2::2]) - start_mem)
+                self.net_bytes["fetch"].append(self._fetch_mem[-2] - start_mem)
+        self._fetch_window.clear()
+        self._fetch_mem.clear()
+
+
+def _instrument(stack: ExitStack, service: OpportunityService, recorder: StageRecorder):
+    for name in ("_fetch_jsearch", "_fetch_adzuna_multi", "_fetch_remotive_multi",
+                 "_fetch_arbeitnow_multi", "_timed_international_programs"):
+        stack.enter_context(mock.patch.object(service, name, recorder.wrap_fetch(getattr(service, name))))
+    stack.enter_context(mock.patch.object(service, "_deduplicate",
+                                          recorder.wrap_sync("dedup", service._deduplicate)))
+    for attr, stage in (("score_opportunities", "score"), ("set_cached", "cache_write"),
+                        ("get_cached", "cache_read")):
+        original = getattr(opportunity_service, attr)
+        stack.enter_context(mock.patch.object(opportunity_service, attr, recorder.wrap_async(stage, original)))
+
+
+# ─── Workload ──────────────────────────────────────────────────
+
+def _new_service() -> OpportunityService:
+    service = OpportunityService()
+    service.jsearch.api_key = "offline"
+    service.adzuna.app_id = service.adzuna.app_key = "offline"
+    return service
+
+
+async def _timed_searches(service, recorder, profiles, iterations, force_refresh) -> list[float]:
+    latencies = []
+    for i in range(iterations):
+        profile = profiles[i % len(profiles)]
+        started = time.perf_counter()
+        await service.search(profile, force_refresh=force_refresh)
+        latencies.append(time.perf_counter() - started)
+        recorder.close_fetch()
+    return latencies
+
+
+async def run_workload(args, recorder: StageRecorder) -> dict[str, tuple[list[float], float]]:
+    """Run every phase once; returns end-to-end {phase: (latencies, elapsed)}; stages land in recorder."""
+    upstreams = RecordedUpstreams(args.upstream_ms)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(upstreams))
+    db = MemorySupabase(_load("supabase.json"), latency_ms=args.db_ms)
+    service = _new_service()
+    phases = {}
+
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch.object(base_adapter, "get_http_client", lambda: client))
+        for module in (cache_backends, opportunity_service, skill_matcher):
+            stack.enter_context(mock.patch.object(module, "get_supabase", lambda: db))
+        # Skills missing from the seeded expansions must fall back locally, never reach Gemini
+        stack.enter_context(mock.patch("google.generativeai.GenerativeModel",
+                                       side_effect=RuntimeError("offline benchmark")))
+        # Never the REDIS_URL from the environment: either no shared tier or the local stand-in
+        standin, redis_url = start_standin() if args.shared else (None, "")
+        tiers = cache_service.configure_tiers("memory,redis,supabase" if standin else "memory,supabase", redis_url)
+        stack.callback(cache_service.configure_tiers)
+        cache_service._memory_cache.clear()
+
+        # Warm-up (imports, skill expansion caches) kept out of the numbers
+        await service.search(PROFILES[0], force_refresh=True)
+        _instrument(stack, service, recorder)
+
+        started = time.perf_counter()
+        cold = await _timed_searches(service, recorder, PROFILES, args.iterations, force_refresh=True)
+        phases["search (cold)"] = (cold, time.perf_counter() - started)
+
+        started = time.perf_counter()
+        warm = await _timed_searches(service, recorder, PROFILES, args.iterations, force_refresh=False)
+        phases["search (L1 hit)"] = (warm, time.perf_counter() - started)
+
+        if standin:
+            shared = []
+            started = time.perf_counter()
+            for i in range(args.iterations):
+                cache_service._memory_cache.clear()
+                t0 = time.perf_counter()
+                await service.search(PROFILES[i % len(PROFILES)])
+                shared.append(time.perf_counter() - t0)
+            phases["search (shared hit)"] = (shared, time.perf_counter() - started)
+
+        l2 = []
+        started = time.perf_counter()
+        for i in range(args.iterations):
+            cache_service._memory_cache.clear()
+            if standin:
+                store_of(standin).data.clear()
+            t0 = time.perf_counter()
+            await service.search(PROFILES[i % len(PROFILES)])
+            l2.append(time.perf_counter() - t0)
+        phases["search (L2 hit)"] = (l2, time.perf_counter() - started)
+
+        async def one(profile):
+            t0 = time.perf_counter()
+            await service.search(profile, force_refresh=True)
+            return time.perf_counter() - t0
+
+        # Stages interleave in the burst, so only its end-to-end numbers are kept
+        recorder.enabled = False
+        burst = [dict(PROFILES[i % len(PROFILES)], skills=PROFILES[i % len(PROFILES)]["skills"][:2 + i % 2])
+                 for i in range(args.concurrency)]
+        started = time.perf_counter()
+        concurrent = await asyncio.gather(*(one(p) for p in burst))
+        phases[f"search x{args.concurrency} concurrent"] = (list(concurrent), time.perf_counter() - started)
+        recorder.close_fetch()
+        for tier in tiers:
+            await tier.close()
+        if standin:
+            standin.shutdown()
+
+    await client.aclose()
+    return phases
+
+
+# ─── Reporting ─────────────────────────────────────────────────
+
+STAGES = ["fetch", "dedup", "score", "cache_write", "cache_read"]
+
+
+def _rows(phases, timing: StageRecorder, allocs: StageRecorder) -> list[dict]:
+    rows = []
+    for stage in STAGES:
+        if timing.latencies.get(stage):
+            rows.append({"stage": stage, **summarize(timing.latencies[stage])})
+    for name, (latencies, elapsed) in phases.items():
+        rows.append({"stage": name, **summarize(latencies, elapsed)})
+    for row in rows:
+        peaks = allocs.peak_bytes.get(row["stage"])
+        nets = allocs.net_bytes.get(row["stage"])
+        row["peak_kb"] = round(max(peaks) / 1024, 1) if peaks else "-"
+        row["net_kb"] = round(sum(nets) / len(nets) / 1024, 1) if nets else "-"
+    return rows
+
+
+async def _alloc_pass(args) -> StageRecorder:
+    """Same workload under tracemalloc (slower, so timed separately)."""
+    recorder = StageRecorder(trace=True)
+    tracemalloc.start()
+    try:
+        await run_workload(args, recorder)
+    finally:
+        tracemalloc.stop()
+    return recorder
+
+
+def _compare(rows: list[dict], baseline_path: str, tolerance: float):
+    baseline = {r["stage"]: r for r in json.loads(Path(baseline_path).read_text())}
+    for row in rows:
+        base = baseline.get(row["stage"])
+        if not base or not base.get("p95_ms"):
+            row["vs_base"] = "new"
+            continue
+        ratio = row["p95_ms"] / base["p95_ms"]
+        row["vs_base"] = f"{ratio:.2f}x" + (" REGRESSED" if ratio > 1 + tolerance else "")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=30, help="searches per phase")
+    parser.add_argument("--concurrency", type=int, default=16, help="searches in the concurrent burst")
+    parser.add_argument("--upstream-ms", type=float, default=0.0, help="simulated latency per upstream request")
+    parser.add_argument("--db-ms", type=float, default=0.0, help="simulated latency per Supabase call")
+    parser.add_argument("--shared", action="store_true", help="add the Redis-protocol tier on a local stand-in")
+    parser.add_argument("--no-alloc", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--save", help="write results as JSON (use later with --baseline)")
+    parser.add_argument("--baseline", help="compare p95 against a saved run")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="p95 growth flagged as a regression")
+    args = parser.parse_args()
+
+    timing = StageRecorder()
+    phases = asyncio.run(run_workload(args, timing))
+    allocs = StageRecorder() if args.no_alloc else asyncio.run(_alloc_pass(args))
+    rows = _rows(phases, timing, allocs)
+
+    columns = ["stage", "n", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "per_sec", "peak_kb", "net_kb"]
+    if args.baseline:
+        _compare(rows, args.baseline, args.tolerance)
+        columns.append("vs_base")
+    print(f"upstream latency {args.upstream_ms}ms, db latency {args.db_ms}ms")
+    print_table(rows, columns)
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(rows, indent=1))
+        print(f"saved {len(rows)} rows to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Benchmark: quiz start latency with and without the question bank, fully offline.
+
+Replays a stream of /api/prep/generate-quiz requests (a few popular roles and
+a long tail, users coming back for repeat quizzes) through the prep router
+against an in-memory Supabase. Gemini is replaced by a stand-in that returns
+a distinct, well-formed 20-question quiz after --gemini-ms (production calls
+take tens of seconds; the default keeps the run short). Reported per mode:
+quiz start latency, quizzes served from the bank, foreground / background
+Gemini calls, and questions a user was served twice within their recent
+sessions (must be 0).
+
+    python -m backend.benchmarks.bench_question_bank --requests 120 --gemini-ms 300
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import time
+from contextlib import ExitStack
+from unittest import mock
+
+from backend.benchmarks.common import print_table, summarize
+from backend.benchmarks.memory_supabase import MemorySupabase
+from backend.routers import prep
+from backend.services import question_bank
+from backend.utils import gemini_client, llm_scheduler
+
+ROLES = [
+    ("Backend Developer", ["Python", "Django", "PostgreSQL", "Docker"]),
+    ("Frontend Developer", ["React", "JavaScript", "CSS", "TypeScript"]),
+    ("Data Scientist", ["Python", "Machine Learning", "SQL", "Pandas"]),
+    ("Full Stack Developer", ["React", "Node.js", "MongoDB", "JavaScript"]),
+    ("DevOps Engineer", ["Docker", "Kubernetes", "AWS", "Linux"]),
+    ("Android Developer", ["Kotlin", "Android", "Firebase"]),
+    ("ML Engineer", ["Python", "TensorFlow", "Machine Learning"]),
+    ("Data Analyst", ["SQL", "Excel", "Power BI"]),
+]
+_TYPES = [("mcq", 10), ("short_answer", 6), ("coding", 4)]
+_DIFFICULTIES = ["easy"] * 6 + ["medium"] * 8 + ["hard"] * 6
+
+
+class FakeGemini:
+    """GenerativeModel stand-in: a fresh quiz on the prompt's stack after a fixed delay."""
+
+    def __init__(self, delay_s: float):
+        self.delay_s = delay_s
+        self.calls = 0
+        self._batch = itertools.count()
+
+    def model(self, _name):
+        return self
+
+    def generate_content(self, prompt, **_):
+        time.sleep(self.delay_s)
+        self.calls += 1
+        batch = next(self._batch)
+        stack_line = next(line for line in prompt.splitlines() if line.startswith("**Tech Stack:**"))
+        stack = [s.strip() for s in stack_line.split(":**", 1)[1].split(",")]
+        questions, n = [], 0
+        for qtype, count in _TYPES:
+            for j in range(count):
+                questions.append({
+                    "index": n, "type": qtype,
+                    "question": f"[{batch}] {qtype} question {j} on {stack[j % len(stack)]}",
+                    "options": ["A) a", "B) b", "C) c", "D) d"] if qtype == "mcq" else None,
+                    "correct_answer": "A) a", "topic": stack[j % len(stack)],
+                    "difficulty": _DIFFICULTIES[n],
+                })
+                n += 1
+        response = mock.Mock()
+        response.text = json.dumps(questions)
+        response.usage_metadata.total_token_count = 3000
+        return response
+
+
+def workload(n: int, users: int, seed: int = 24) -> list[prep.GenerateQuizRequest]:
+    rng = random.Random(seed)
+    weights = [1 / (i + 1) for i in range(len(ROLES))]
+    requests = []
+    for _ in range(n):
+        i = rng.choices(range(len(ROLES)), weights)[0]
+        title, stack = ROLES[i]
+        requests.append(prep.GenerateQuizRequest(
+            user_id=f"user-{rng.randrange(users)}", job_id=f"job-{i}-{rng.randrange(3)}",
+            job_title=title, company="Acme", tech_stack=stack,
+        ))
+    return requests
+
+
+async def replay(requests: list, enabled: bool, delay_s: float, gap_s: float) -> dict:
+    db = MemorySupabase({"question_bank": [], "prep_sessions": []})
+    fake = FakeGemini(delay_s)
+    latencies, from_bank = [], 0
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch("google.generativeai.GenerativeModel", fake.model))
+        stack.enter_context(mock.patch.dict(os.environ, {"GEMINI_API_KEY": "offline"}))
+        stack.enter_context(mock.patch.object(gemini_client, "_client", None))
+        # Measure the bank, not the per-minute quota
+        stack.enter_context(mock.patch.object(llm_scheduler, "_scheduler", llm_scheduler.LLMScheduler(rpm=0, tpm=0)))
+        stack.enter_context(mock.patch.object(question_bank, "ENABLED", enabled))
+        for module in (prep, question_bank):
+            stack.enter_context(mock.patch.object(module, "get_supabase", lambda: db))
+        bank = question_bank.QuestionBank()
+        stack.enter_context(mock.patch.object(prep, "_bank", bank))
+
+        foreground = 0
+        for req in requests:
+            started = time.perf_counter()
+            result = await prep.generate_quiz(req)
+            latencies.append(time.perf_counter() - started)
+            from_bank += result["source"] == "bank"
+            foreground += result["source"] == "ai"
+            await asyncio.sleep(gap_s)  # users arrive spread out; lets background top-ups land
+        while bank._tasks:
+            await asyncio.gather(*bank._tasks, return_exceptions=True)
+
+    repeats = 0
+    by_user: dict[str, list] = {}
+    for session in sorted(db.tables["prep_sessions"], key=lambda s: s["created_at"]):
+        by_user.setdefault(session["user_id"], []).append({q.get("bank_id") for q in session["questions"]})
+    for sessions in by_user.values():
+        for i, ids in enumerate(sessions):
+            recent = set().union(*sessions[max(0, i - question_bank.SEEN_SESSIONS):i])
+            repeats += len(ids & recent - {None})
+
+    stats = summarize(latencies)
+    return {
+        "mode": "bank" if enabled else "gemini only",
+        "quizzes": len(requests),
+        "from_bank": from_bank,
+        "gemini_foreground": foreground,
+        "gemini_background": fake.calls - foreground,
+        "banked_questions": len(db.tables["question_bank"]),
+        "repeat_questions": repeats,
+        "mean_ms": stats["mean_ms"],
+        "p50_ms": stats["p50_ms"],
+        "p95_ms": stats["p95_ms"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=120, help="quiz requests in the replayed workload")
+    parser.add_argument("--users", type=int, default=40)
+    parser.add_argument("--gemini-ms", type=float, default=300, help="simulated Gemini quiz generation time")
+    parser.add_argument("--gap-ms", type=float, default=50, help="time between requests")
+    args = parser.parse_args()
+
+    requests = workload(args.requests, args.users)
+    rows = [asyncio.run(replay(requests, enabled, args.gemini_ms / 1000, args.gap_ms / 1000))
+            for enabled in (False, True)]
+    print_table(rows, ["mode", "quizzes", "from_bank", "gemini_foreground", "gemini_background",
+                       "banked_questions", "repeat_questions", "mean_ms", "p50_ms", "p95_ms"])
+
+
+if __name__ == "__main__":
+    main()
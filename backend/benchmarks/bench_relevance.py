@@ -0,0 +1,119 @@
+"""
+Benchmark: /db/jobs relevance scoring — the old per-keyword substring loop
+vs the compiled Aho–Corasick matcher, over N rows and a K-term keyword set.
+
+Also times the NumPy batch path (score_batch + argpartition top-k) and
+reports how often each mode agrees with the loop; differences come from
+word-start matching (e.g. "ai" no longer hits "maintain").
+
+    python -m backend.benchmarks.bench_relevance --rows 500 --keywords 150 --top 50
+"""
+
+import argparse
+import random
+import time
+
+from backend.benchmarks.common import summarize, print_table
+from backend.routers.opportunities import (
+    _RelevanceMatcher, _DOMAIN_TITLE_MATCHES, _SKILL_EXPANSIONS,
+    _TYPE_TITLE_KEYWORDS, _IRRELEVANT_TITLE_KEYWORDS, _top_k_order,
+)
+from backend.services.job_features import compute_job_features
+
+
+def _loop_relevance(title, company, location, keyword_set, domain) -> int:
+    """The previous _compute_relevance implementation, kept here as the baseline."""
+    if not keyword_set:
+        return 0
+    title_lower = title.lower()
+    text = f"{title_lower} {company.lower()} {location.lower()}"
+    score = 0
+    matched = sum(1 for kw in keyword_set if kw in text)
+    score += 50 if matched >= 5 else 40 if matched >= 3 else 30 if matched >= 2 else 20 if matched >= 1 else 0
+    domain_hits = sum(1 for dk in _DOMAIN_TITLE_MATCHES.get(domain, []) if dk in title_lower)
+    score += 30 if domain_hits >= 3 else 25 if domain_hits >= 2 else 15 if domain_hits >= 1 else 0
+    if any(k in title_lower for k in _TYPE_TITLE_KEYWORDS):
+        score += 10
+    if "remote" in text:
+        score += 5
+    if any(ik in title_lower for ik in _IRRELEVANT_TITLE_KEYWORDS):
+        if not any(kw in title_lower for kw in keyword_set):
+            score = max(score - 40, 5)
+    return min(score, 100)
+
+
+def make_keyword_set(k: int, seed: int = 3) -> set[str]:
+    vocab = sorted(set().union(*_SKILL_EXPANSIONS.values()))
+    extra = [f"term{i}" for i in range(max(0, k - len(vocab)))]
+    rng = random.Random(seed)
+    return set(rng.sample(vocab, min(k, len(vocab))) + extra)
+
+
+def make_rows(n: int, seed: int = 5) -> list[tuple[str, str, str]]:
+    rng = random.Random(seed)
+    titles = ["Software Engineer Intern", "Data Analyst Trainee", "Machine Learning Engineer",
+              "Frontend Developer (React)", "Sales Executive", "Backend Python Developer",
+              "Cloud DevOps Engineer", "Maintenance Technician", "Full Stack Web Developer"]
+    companies = ["Acme AI Labs", "Globex", "Initech Software", "Hooli Cloud", "Umbrella Pharma"]
+    locations = ["Bangalore", "Remote", "Work From Home", "Pune, Maharashtra", "Delhi NCR"]
+    levels = ["", "Senior ", "Junior ", "Lead "]
+    return [(rng.choice(levels) + rng.choice(titles), rng.choice(companies), rng.choice(locations))
+            for _ in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Relevance scoring benchmark")
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--keywords", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--top", type=int, default=None, help="top-k cut (default: all rows)")
+    args = parser.parse_args()
+
+    keyword_set = make_keyword_set(args.keywords)
+    rows = make_rows(args.rows)
+    domain = "ai"
+    results = []
+
+    latencies = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        loop_scores = [_loop_relevance(t, c, l, keyword_set, domain) for t, c, l in rows]
+        latencies.append(time.perf_counter() - started)
+    results.append({"mode": "substring loop", **summarize(latencies)})
+
+    build = []
+    latencies = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        matcher = _RelevanceMatcher(keyword_set, domain)
+        built = time.perf_counter()
+        ac_scores = [matcher.score(t, c, l) for t, c, l in rows]
+        done = time.perf_counter()
+        build.append(built - started)
+        latencies.append(done - started)
+    results.append({"mode": "aho-corasick per row", **summarize(latencies)})
+
+    # Normalized text is precomputed at ingest (services/job_features.py), so not timed
+    features = [compute_job_features({"title": t, "company": c, "location": l}) for t, c, l in rows]
+    pairs = [(f["title_norm"], f["context_norm"]) for f in features]
+    latencies = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        matcher = _RelevanceMatcher(keyword_set, domain)
+        batch_scores = matcher.score_batch(pairs)
+        _top_k_order(batch_scores, args.top or len(rows))
+        latencies.append(time.perf_counter() - started)
+    results.append({"mode": "numpy batch + top-k", **summarize(latencies)})
+
+    def agreement(scores):
+        return sum(1 for a, b in zip(loop_scores, scores) if a == b) / len(rows)
+
+    print(f"{args.rows} rows x {len(keyword_set)} keywords, {args.repeat} runs "
+          f"(all modes include building the matcher; automaton build {summarize(build)['mean_ms']}ms)")
+    print(f"agreement with loop: per row {agreement(ac_scores):.1%}, batch {agreement(batch_scores):.1%}; "
+          f"batch == per row: {batch_scores == ac_scores}")
+    print_table(results, ["mode", "mean_ms", "p50_ms", "p95_ms"])
+
+
+if __name__ == "__main__":
+    main()
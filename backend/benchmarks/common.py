@@ -0,0 +1,53 @@
+"""
+Shared helpers for the benchmark scripts: timing, percentiles and table output.
+"""
+
+import statistics
+import time
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile (pct in 0-100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def summarize(latencies_s: list[float], elapsed_s: float | None = None) -> dict:
+    """Summarize a list of per-call latencies (seconds) as milliseconds + throughput."""
+    ms = [v * 1000 for v in latencies_s]
+    total = elapsed_s if elapsed_s is not None else sum(latencies_s)
+    return {
+        "n": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 3) if ms else 0.0,
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "per_sec": round(len(ms) / total, 1) if total > 0 else 0.0,
+    }
+
+
+def timed(fn, *args, repeat: int = 1, **kwargs) -> tuple[list[float], object]:
+    """Call fn `repeat` times; return (latencies, last result)."""
+    latencies = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args, **kwargs)
+        latencies.append(time.perf_counter() - started)
+    return latencies, result
+
+
+def print_table(rows: list[dict], columns: list[str] | None = None):
+    """Print a list of dicts as an aligned text table."""
+    if not rows:
+        print("(no results)")
+        return
+    columns = columns or list(rows[0].keys())
+    widths = {c: max(len(c), *(len(str(r.get(c, ""))) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    print("  ".join("-" * widths[c] for c in columns))
+    for r in rows:
+        print("  ".join(str(r.get(c, "")).ljust(widths[c]) for c in columns))
@@ -0,0 +1,175 @@
+"""
+Generates the upstream API corpus in fixtures/api/ for bench_opportunity_pipeline.
+
+One file per source in that API's own response shape (JSearch `data`, Adzuna
+`results`, Remotive `jobs`, Arbeitnow `data`), plus the `international_programs`
+and `skill_expansions` rows the in-memory Supabase stand-in is seeded with.
+A share of listings appear on several sources (same title + company) so the
+dedup stage has real work to do. Output is deterministic; re-run after
+changing it:
+
+    python -m backend.benchmarks.fixtures.make_api_fixtures
+"""
+
+import json
+import random
+from pathlib import Path
+
+OUT = Path(__file__).resolve().parent / "api"
+
+_LEVELS = ["", "Junior ", "Senior ", "Lead ", "Associate ", "Graduate "]
+_ROLES = ["Python Developer", "Backend Engineer", "Frontend Developer (React)", "Data Analyst",
+          "Machine Learning Engineer", "Full Stack Developer", "DevOps Engineer", "Data Scientist",
+          "Android Developer", "QA Automation Engineer", "Cloud Engineer", "Product Designer",
+          "Software Engineer", "Site Reliability Engineer", "Business Analyst", "Sales Executive"]
+_SUFFIXES = ["", " Intern", " Trainee", " - Remote", " (Contract)"]
+_COMPANIES = [f"{a} {b}" for a in ["Acme", "Globex", "Initech", "Hooli", "Umbrella", "Stark", "Wayne", "Tyrell",
+                                   "Cyberdyne", "Soylent", "Aperture", "Vandelay"]
+              for b in ["Labs", "Technologies", "Software", "Analytics"]]
+_CITIES = [("Bangalore", "Karnataka"), ("Pune", "Maharashtra"), ("Mumbai", "Maharashtra"),
+           ("Hyderabad", "Telangana"), ("Chennai", "Tamil Nadu"), ("Gurgaon", "Haryana"), ("Noida", "Uttar Pradesh")]
+_SKILLS = ["python", "django", "fastapi", "react", "typescript", "sql", "postgresql", "aws", "docker",
+           "kubernetes", "machine learning", "pandas", "tensorflow", "java", "spring", "go", "kotlin"]
+
+
+def _description(rng: random.Random, title: str) -> str:
+    skills = rng.sample(_SKILLS, 5)
+    body = " ".join([
+        f"<p>We are hiring a {title} to join our growing team.</p>",
+        f"<ul>{''.join(f'<li>Hands-on experience with {s}</li>' for s in skills)}</ul>",
+        "<p>You will design, build and ship features end to end, review code and mentor peers.</p>" * 3,
+    ])
+    return body
+
+
+def _listing_pool(rng: random.Random, n: int) -> list[dict]:
+    pool = []
+    for _ in range(n):
+        city, state = rng.choice(_CITIES)
+        title = rng.choice(_LEVELS) + rng.choice(_ROLES) + rng.choice(_SUFFIXES)
+        pool.append({"title": title, "company": rng.choice(_COMPANIES), "city": city, "state": state,
+                     "skills": rng.sample(_SKILLS, 4), "days": rng.randrange(0, 14)})
+    return pool
+
+
+def jsearch(rng: random.Random, shared: list[dict]) -> dict:
+    listings = shared[:40] + _listing_pool(rng, 60)
+    return {"status": "OK", "data": [{
+        "job_id": f"js-{i}",
+        "job_title": j["title"],
+        "employer_name": j["company"],
+        "job_description": _description(rng, j["title"]),
+        "job_apply_link": f"https://jobs.example.com/jsearch/{i}",
+        "job_city": j["city"], "job_state": j["state"], "job_country": "IN",
+        "job_is_remote": "Remote" in j["title"],
+        "job_min_salary": rng.choice([None, 300000, 600000, 1200000]),
+        "job_posted_at_datetime_utc": f"2026-10-{1 + j['days']:02d}T00:00:00.000Z",
+        "job_required_skills": j["skills"] if i % 2 else None,
+    } for i, j in enumerate(listings)]}
+
+
+def adzuna(rng: random.Random, shared: list[dict]) -> dict:
+    listings = shared[20:60] + _listing_pool(rng, 60)
+    return {"count": len(listings), "results": [{
+        "id": str(9000 + i),
+        "title": j["title"],
+        "company": {"display_name": j["company"]},
+        "description": _description(rng, j["title"]),
+        "redirect_url": f"https://www.adzuna.in/land/ad/{9000 + i}",
+        "location": {"display_name": f"{j['city']}, {j['state']}", "area": ["India", j["state"], j["city"]]},
+        "salary_min": rng.choice([None, 250000, 500000]),
+        "salary_max": rng.choice([None, 900000, 1500000]),
+        "created": f"2026-10-{1 + j['days']:02d}T08:00:00Z",
+        "category": {"tag": "it-jobs", "label": "IT Jobs"},
+    } for i, j in enumerate(listings)]}
+
+
+def remotive(rng: random.Random, shared: list[dict]) -> dict:
+    listings = shared[50:70] + _listing_pool(rng, 80)
+    return {"job-count": len(listings), "jobs": [{
+        "id": 1500 + i,
+        "url": f"https://remotive.com/remote-jobs/software-dev/{1500 + i}",
+        "title": j["title"],
+        "company_name": j["company"],
+        "category": "Software Development",
+        "tags": j["skills"],
+        "job_type": "full_time",
+        "publication_date": f"2026-10-{1 + j['days']:02d}T10:00:00",
+        "candidate_required_location": rng.choice(["Worldwide", "India", "Asia", "Europe"]),
+        "salary": rng.choice(["", "$40k - $60k", "$80k+"]),
+        "description": _description(rng, j["title"]),
+    } for i, j in enumerate(listings)]}
+
+
+def arbeitnow(rng: random.Random, shared: list[dict]) -> dict:
+    listings = shared[60:80] + _listing_pool(rng, 80)
+    return {"data": [{
+        "slug": f"arbeitnow-{i}",
+        "company_name": j["company"],
+        "title": j["title"],
+        "description": _description(rng, j["title"]),
+        "remote": "Remote" in j["title"],
+        "url": f"https://www.arbeitnow.com/jobs/arbeitnow-{i}",
+        "tags": j["skills"],
+        "job_types": ["full time"],
+        "location": rng.choice(["Berlin", "Munich", "Hamburg", "Remote"]),
+        "created_at": 1759000000 + i * 3600,
+    } for i, j in enumerate(listings)]}
+
+
+def international_programs(rng: random.Random) -> list[dict]:
+    return [{
+        "id": f"00000000-0000-0000-0001-{i:012d}",
+        "name": f"Global Research Fellowship {i}",
+        "organization": rng.choice(["DAAD", "MITACS", "CERN", "JST", "A*STAR"]),
+        "country": rng.choice(["Germany", "Canada", "Switzerland", "Japan", "Singapore"]),
+        "application_url": f"https://programs.example.org/{i}",
+        "is_active": True,
+        "is_fully_funded": i % 2 == 0,
+        "description": "Paid summer research internship for undergraduate students.",
+        "fields": rng.sample(["python", "machine learning", "physics", "react", "data science"], 2),
+        "tags": ["research"],
+        "eligibility": {"open_to": ["ALL"] if i % 3 else ["IN", "US"]},
+        "deadline_text": "Rolling",
+        "stipend": "€1,200/month",
+        "duration": "12 weeks",
+    } for i in range(25)]
+
+
+def skill_expansions() -> list[dict]:
+    """Rows for every benchmark skill and career goal, so scoring never reaches Gemini."""
+    related = {
+        "fastapi": ["python", "pydantic", "starlette", "rest api"],
+        "typescript": ["javascript", "react", "node.js", "frontend"],
+        "pandas": ["python", "numpy", "data analysis", "jupyter"],
+        "spring": ["java", "spring boot", "hibernate", "microservices"],
+        "aws": ["cloud", "ec2", "s3", "lambda", "devops"],
+        "docker": ["kubernetes", "containers", "devops", "ci/cd"],
+        "backend developer": ["python", "java", "sql", "rest api", "django", "node.js"],
+        "frontend developer": ["javascript", "react", "html", "css", "typescript"],
+        "data scientist": ["python", "machine learning", "pandas", "statistics", "sql"],
+        "software engineer": ["java", "python", "algorithms", "data structures", "git"],
+    }
+    return [{"skill": skill, "related_skills": [skill, *others]} for skill, others in related.items()]
+
+
+def main():
+    OUT.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(14)
+    shared = _listing_pool(rng, 80)
+    files = {
+        "jsearch.json": jsearch(rng, shared),
+        "adzuna.json": adzuna(rng, shared),
+        "remotive.json": remotive(rng, shared),
+        "arbeitnow.json": arbeitnow(rng, shared),
+        "supabase.json": {"international_programs": international_programs(rng),
+                          "skill_expansions": skill_expansions()},
+    }
+    for name, payload in files.items():
+        text = json.dumps(payload, indent=1, ensure_ascii=False)
+        (OUT / name).write_text(text + "\n", encoding="utf-8")
+        print(f"{name}: {len(text) / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Generates the HTML parsing corpus in fixtures/html/.
+
+The pages reproduce the markup the scrapers select on (Internshala listing +
+detail, HackerEarth challenges, LinkedIn guest search, MLH season, AICTE
+landing, a generic job page) inside the kind of boilerplate real pages
+carry: inline scripts/styles, JSON state blobs, large nav menus and footers.
+Output is deterministic; re-run after changing it:
+
+    python -m backend.benchmarks.fixtures.make_html_fixtures
+"""
+
+import json
+import random
+from pathlib import Path
+
+OUT = Path(__file__).resolve().parent / "html"
+
+_ROLES = ["Python Developer", "Machine Learning", "Web Development", "Data Science", "Android App Development",
+          "Full Stack Development", "DevOps", "UI/UX Design", "Business Analytics", "Content Writing",
+          "Digital Marketing", "Backend Development", "Cloud Computing", "Cyber Security", "Graphic Design"]
+_COMPANIES = ["Acme Labs", "Globex Technologies", "Initech Software", "Hooli India", "Pied Piper",
+              "Umbrella Analytics", "Stark Industries", "Wayne Tech", "Wonka Systems", "Tyrell Corp"]
+_CITIES = ["Bangalore", "Gurgaon", "Mumbai", "Pune", "Hyderabad", "Chennai", "Delhi", "Noida", "Work From Home"]
+
+
+def _boilerplate_head(rng: random.Random, title: str) -> str:
+    styles = "\n".join(f".c{i}{{margin:{i % 7}px;padding:{i % 5}px;color:#{rng.randrange(0xFFFFFF):06x}}}"
+                       for i in range(600))
+    state = json.dumps({"config": {f"flag_{i}": rng.random() > 0.5 for i in range(300)},
+                        "i18n": {f"key_{i}": f"Translated string number {i}" for i in range(400)}})
+    scripts = "\n".join(f"<script>window.__chunk{i}=function(a,b){{return a+b*{i};}};</script>" for i in range(40))
+    return (f"<!DOCTYPE html><html lang=\"en\"><head><meta charset=\"utf-8\"><title>{title}</title>"
+            f"<style>{styles}</style><script>window.__STATE__={state};</script>{scripts}</head>")
+
+
+def _nav(rng: random.Random, base: str) -> str:
+    items = "".join(
+        f"<li class=\"nav-item dropdown\"><a class=\"nav-link\" href=\"{base}/menu/{i}\">Menu {i}</a>"
+        f"<ul class=\"dropdown-menu\">" +
+        "".join(f"<li><a class=\"dropdown-item\" href=\"{base}/menu/{i}/{j}\">Category {i}.{j}</a></li>"
+                for j in range(12)) +
+        "</ul></li>"
+        for i in range(15)
+    )
+    return f"<header><nav class=\"navbar\"><ul class=\"navbar-nav\">{items}</ul></nav></header>"
+
+
+def _footer(base: str) -> str:
+    cols = "".join(
+        f"<div class=\"footer-col\"><h5>Section {i}</h5><ul>" +
+        "".join(f"<li><a href=\"{base}/footer/{i}/{j}\">Footer link {i}-{j}</a></li>" for j in range(20)) +
+        "</ul></div>"
+        for i in range(8)
+    )
+    return f"<footer class=\"footer\">{cols}<p class=\"copyright\">© 2025 All rights reserved.</p></footer>"
+
+
+def internshala_listing(rng: random.Random) -> str:
+    cards = []
+    for i in range(40):
+        role, company, city = rng.choice(_ROLES), rng.choice(_COMPANIES), rng.choice(_CITIES)
+        slug = f"{role.lower().replace(' ', '-').replace('/', '')}-internship-in-{city.lower().replace(' ', '-')}-at-{company.lower().replace(' ', '-')}{1700000000 + i}"
+        location = "" if i % 4 == 0 else (
+            f"<div id=\"location_names\" class=\"row-1-item locations\"><span><a href=\"/internships/{city.lower()}\">{city}</a></span></div>")
+        cards.append(
+            f"<div class=\"container-fluid individual_internship visibilityTrackerItem\" data-id=\"{3000000 + i}\" "
+            f"internshipid=\"{3000000 + i}\"><div class=\"internship_meta\">"
+            f"<div class=\"individual_internship_header\"><div class=\"company\">"
+            f"<h3 class=\"job-internship-name\"><a class=\"job-title-href\" href=\"/internship/detail/{slug}\">{role}</a></h3>"
+            f"<p class=\"company-name\">{company}</p></div><div class=\"internship_logo\"><img src=\"/logo/{i}.png\" alt=\"\"></div></div>"
+            f"<div class=\"detail-row-1\">{location}<div class=\"row-1-item\"><i class=\"ic-16-money\"></i>"
+            f"<span class=\"stipend\">₹ {rng.randrange(5, 40)},000 /month</span></div>"
+            f"<div class=\"row-1-item\"><i class=\"ic-16-calendar\"></i><span>{rng.randrange(1, 7)} Months</span></div></div>"
+            f"<div class=\"detail-row-2\"><div class=\"status-container\"><div class=\"status-inactive\">"
+            f"<span>{rng.randrange(1, 30)} days ago</span></div></div></div>"
+            f"<div class=\"about_job\"><div class=\"text\">{' '.join(['Work on real projects with the team.'] * 6)}</div></div>"
+            f"</div></div>"
+        )
+        if i == 10:
+            cards.append("<div class=\"container-fluid individual_internship result-alert\"><p>Get alerts for jobs like these</p></div>")
+    body = (f"<body>{_nav(rng, 'https://internshala.com')}<div id=\"content\"><div class=\"container\">"
+            f"<div id=\"filters\">{''.join(f'<label><input type=checkbox value={c}>{c}</label>' for c in _CITIES * 10)}</div>"
+            f"<div id=\"internship_list_container_1\">{''.join(cards)}</div></div></div>{_footer('https://internshala.com')}</body></html>")
+    return _boilerplate_head(rng, "Computer Science Internships") + body
+
+
+def internshala_detail(rng: random.Random) -> str:
+    skills = "".join(f"<span class=\"round_tab\">{s}</span>" for s in ["Python", "Django", "SQL", "REST API", "Git"])
+    perks = "".join(f"<span class=\"round_tab\">{p}</span>" for p in ["Certificate", "Letter of recommendation", "Flexible work hours"])
+    about = "".join(f"<p>Selected intern's day-to-day responsibilities include item {i}: building and testing features.</p>" for i in range(12))
+    body = (f"<body>{_nav(rng, 'https://internshala.com')}<div id=\"details_container\" class=\"detail_view\">"
+            f"<div class=\"internship_details\"><h2 class=\"section_heading\">About the internship</h2>"
+            f"<div class=\"text-container\">{about}</div>"
+            f"<h3 class=\"section_heading\">Skill(s) required</h3><div class=\"round_tabs_container\">{skills}</div>"
+            f"<div class=\"section_heading_wrapper\"><div class=\"section_heading\">Who can apply</div></div>"
+            f"<div class=\"text-container who_can_apply\"><p>Only those candidates can apply who are available for 3 months</p>"
+            f"<p>have relevant skills and interests</p></div>"
+            f"<h3 class=\"section_heading\">Perks</h3><div class=\"round_tabs_container perks_container\">{perks}</div>"
+            f"<div><h3 class=\"section_heading\">About Acme Labs</h3><div class=\"website_and_links\"><a href=\"https://acme.example\">Website</a></div>"
+            f"<div class=\"text-container about_company_text_container\">Acme Labs builds developer tools for teams across India.</div></div>"
+            f"</div></div>{_footer('https://internshala.com')}</body></html>")
+    return _boilerplate_head(rng, "Python Development Internship") + body
+
+
+def hackerearth_challenges(rng: random.Random) -> str:
+    cards = "".join(
+        f"<div class=\"challenge-card-modern\"><a class=\"challenge-card-wrapper challenge-card-link\" "
+        f"href=\"/challenges/hackathon/hack-{i}/\"><div class=\"challenge-list-title challenge-card-wrapper\">"
+        f"<div class=\"challenge-type light smaller caps weight-600\">{rng.choice(['Hackathon', 'Hiring', 'Competitive'])}</div>"
+        f"<div class=\"challenge-name ellipsis dark\"><span class=\"challenge-list-title challenge-card-wrapper large weight-600\">"
+        f"{rng.choice(_ROLES)} Hackathon {i}</span></div>"
+        f"<div class=\"company-name\">{rng.choice(_COMPANIES)}</div></div>"
+        f"<div class=\"challenge-desc\"><div class=\"date less-margin dark\">Starts on: Mar {1 + i % 28}, 2026</div>"
+        f"<div class=\"registrations\">{rng.randrange(100, 9000)} Registered</div></div></a></div>"
+        for i in range(30)
+    )
+    body = (f"<body>{_nav(rng, 'https://www.hackerearth.com')}<div class=\"upcoming challenge-list\">{cards}</div>"
+            f"<div class=\"past-challenges\">{''.join(f'<div class=past-card><a href=/p/{i}>Past {i}</a></div>' for i in range(200))}</div>"
+            f"{_footer('https://www.hackerearth.com')}</body></html>")
+    return _boilerplate_head(rng, "Hackathons | HackerEarth") + body
+
+
+def linkedin_search(rng: random.Random) -> str:
+    cards = "".join(
+        f"<li><div class=\"base-card relative w-full hover:no-underline job-search-card\" data-entity-urn=\"urn:li:jobPosting:{4000 + i}\">"
+        f"<a class=\"base-card__full-link absolute top-0 right-0 bottom-0 left-0 p-0 z-[2]\" href=\"https://in.linkedin.com/jobs/view/{4000 + i}\">"
+        f"<span class=\"sr-only\">{rng.choice(_ROLES)}</span></a><div class=\"search-entity-media\"><img alt=\"\"></div>"
+        f"<div class=\"base-search-card__info\"><h3 class=\"base-search-card__title\">{rng.choice(_ROLES)} Intern</h3>"
+        f"<h4 class=\"base-search-card__subtitle\"><a href=\"https://in.linkedin.com/company/{i}\">{rng.choice(_COMPANIES)}</a></h4>"
+        f"<div class=\"base-search-card__metadata\"><span class=\"job-search-card__location\">{rng.choice(_CITIES)}, India</span>"
+        f"<time class=\"job-search-card__listdate\" datetime=\"2026-01-{1 + i % 28:02d}\">1 week ago</time></div></div></div></li>"
+        for i in range(25)
+    )
+    body = (f"<body>{_nav(rng, 'https://www.linkedin.com')}<main><section class=\"two-pane-serp-page__results-list\">"
+            f"<ul class=\"jobs-search__results-list\">{cards}</ul></section></main>{_footer('https://www.linkedin.com')}</body></html>")
+    return _boilerplate_head(rng, "Python Intern jobs in India") + body
+
+
+def mlh_events(rng: random.Random) -> str:
+    events = "".join(
+        f"<div class=\"event-wrapper\"><a class=\"event-link\" href=\"https://events.mlh.io/events/{100 + i}\" target=\"_blank\">"
+        f"<div class=\"event\"><div class=\"image-wrap\"><img src=\"/e/{i}.png\"></div>"
+        f"<h3 class=\"event-name\">HackMLH {i}</h3><p class=\"event-date\">Mar {1 + i % 27} - {2 + i % 27}, 2026</p>"
+        f"<div class=\"event-location\"><span>Everywhere, Worldwide</span></div></div></a></div>"
+        for i in range(60)
+    )
+    body = (f"<body>{_nav(rng, 'https://mlh.io')}<div class=\"container feature\"><div class=\"row\">{events}</div></div>"
+            f"{_footer('https://mlh.io')}</body></html>")
+    return _boilerplate_head(rng, "MLH 2026 Season Events") + body
+
+
+def aicte_home(rng: random.Random) -> str:
+    rows = "".join(
+        f"<tr><td>{i}</td><td><a href=\"internship-details.php?id={500 + i}\">{rng.choice(_ROLES)} Internship at {rng.choice(_COMPANIES)}</a></td>"
+        f"<td>{rng.choice(_CITIES)}</td><td>{rng.randrange(1, 6)} months</td></tr>"
+        for i in range(40)
+    )
+    body = (f"<body>{_nav(rng, 'https://internship.aicte-india.org')}<div class=\"main\"><table class=\"table\">{rows}</table>"
+            f"<div class=\"news\">{''.join(f'<p>Notice {i}: Portal update and schedule changes.</p>' for i in range(120))}</div></div>"
+            f"{_footer('https://internship.aicte-india.org')}</body></html>")
+    return _boilerplate_head(rng, "AICTE Internship Portal") + body
+
+
+def generic_detail(rng: random.Random) -> str:
+    paragraphs = "".join(f"<p>Responsibility {i}: design, build and maintain services used by thousands of users every day.</p>"
+                         for i in range(30))
+    body = (f"<body>{_nav(rng, 'https://careers.example.com')}<main><div class=\"job-description\">"
+            f"<h1>Software Engineer Intern</h1>{paragraphs}</div><aside>{''.join(f'<p>Related job {i}</p>' for i in range(50))}</aside></main>"
+            f"{_footer('https://careers.example.com')}</body></html>")
+    return _boilerplate_head(rng, "Software Engineer Intern") + body
+
+
+PAGES = {
+    "internshala_listing.html": internshala_listing,
+    "internshala_detail.html": internshala_detail,
+    "hackerearth_challenges.html": hackerearth_challenges,
+    "linkedin_search.html": linkedin_search,
+    "mlh_events.html": mlh_events,
+    "aicte_home.html": aicte_home,
+    "generic_detail.html": generic_detail,
+}
+
+
+def main():
+    OUT.mkdir(parents=True, exist_ok=True)
+    for name, build in PAGES.items():
+        html = build(random.Random(name))
+        (OUT / name).write_text(html, encoding="utf-8")
+        print(f"{name}: {len(html) / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
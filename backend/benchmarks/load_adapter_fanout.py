@@ -0,0 +1,172 @@
+"""
+Load test: adapter fan-out latency and thread count vs concurrency.
+
+Each "search" performs the same 8-call fan-out as OpportunityService.search
+(1x JSearch, 2x Adzuna, 3x Remotive, 2x Arbeitnow) against local mock upstreams
+that answer after --delay-ms. Two modes are compared:
+
+  legacy — asyncio.to_thread(requests.get) per call (the old adapter path)
+  async  — the adapters' native path over the shared httpx.AsyncClient
+
+    python -m backend.benchmarks.load_adapter_fanout --levels 1 4 16 64
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from backend.benchmarks.common import summarize, print_table
+
+FANOUT = 8
+
+
+def _mock_payload(path: str) -> dict:
+    job = {"title": "Python Developer Intern", "description": "Build APIs with FastAPI",
+           "company_name": "Mock Co", "url": "https://example.com/job"}
+    if path.startswith("/jsearch"):
+        return {"data": [{"job_title": job["title"], "job_description": job["description"],
+                          "employer_name": job["company_name"], "job_apply_link": job["url"],
+                          "job_city": "Pune", "job_country": "IN"}] * 10}
+    if path.startswith("/adzuna"):
+        return {"results": [{"title": job["title"], "description": job["description"],
+                             "company": {"display_name": job["company_name"]},
+                             "redirect_url": job["url"],
+                             "location": {"display_name": "Pune", "area": ["India", "Pune"]}}] * 10}
+    if path.startswith("/remotive"):
+        return {"jobs": [dict(job, candidate_required_location="Worldwide")] * 10}
+    return {"data": [dict(job, location="Berlin", tags=["python"])] * 10}
+
+
+def _serve(port_queue, delay_s: float):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(delay_s)
+            body = json.dumps(_mock_payload(self.path)).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    ThreadingHTTPServer.request_queue_size = 1024
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+class _ThreadSampler:
+    """Samples threading.active_count() in the background and keeps the peak."""
+
+    def __init__(self):
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, threading.active_count())
+            time.sleep(0.005)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+async def _legacy_fanout(base: str):
+    import requests
+    paths = ["/jsearch", "/adzuna/1", "/adzuna/2", "/remotive", "/remotive", "/remotive",
+             "/arbeitnow", "/arbeitnow"]
+    await asyncio.gather(*(asyncio.to_thread(requests.get, base + p, timeout=15) for p in paths))
+
+
+async def _async_fanout(service):
+    await asyncio.gather(
+        # refresh: every round must reach the adapters, not the per-query cache
+        service._fetch_jsearch("python intern", "IN", refresh=True),
+        service._fetch_adzuna_multi("python intern", "fastapi intern", "IN", refresh=True),
+        service._fetch_remotive_multi("python intern", "software intern", refresh=True),
+        service._fetch_arbeitnow_multi("python intern", refresh=True),
+    )
+
+
+async def _run_level(mode: str, concurrency: int, rounds: int, base: str, service) -> dict:
+    latencies = []
+
+    async def one():
+        started = time.perf_counter()
+        if mode == "legacy":
+            await _legacy_fanout(base)
+        else:
+            await _async_fanout(service)
+        latencies.append(time.perf_counter() - started)
+
+    with _ThreadSampler() as sampler:
+        started = time.perf_counter()
+        for _ in range(rounds):
+            await asyncio.gather(*(one() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    stats = summarize(latencies, elapsed)
+    return {"mode": mode, "concurrency": concurrency, "p50_ms": stats["p50_ms"],
+            "p95_ms": stats["p95_ms"], "fanouts_per_sec": stats["per_sec"],
+            "peak_threads": sampler.peak}
+
+
+def _build_service(base: str):
+    os.environ.setdefault("JSEARCH_API_KEY", "mock")
+    os.environ.setdefault("ADZUNA_APP_ID", "mock")
+    os.environ.setdefault("ADZUNA_APP_KEY", "mock")
+    from backend.services.opportunity_service import OpportunityService
+
+    service = OpportunityService()
+    service.jsearch.BASE_URL = f"{base}/jsearch"
+    service.adzuna._get_base_url = lambda country: f"{base}/adzuna/{country.lower()}"
+    service.remotive.BASE_URL = f"{base}/remotive"
+    service.arbeitnow.BASE_URL = f"{base}/arbeitnow"
+    return service
+
+
+async def main_async(args):
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=_serve, args=(port_queue, args.delay_ms / 1000), daemon=True)
+    server.start()
+    base = f"http://127.0.0.1:{port_queue.get(timeout=10)}"
+    service = _build_service(base)
+
+    rows = []
+    for level in args.levels:
+        for mode in ("legacy", "async"):
+            rows.append(await _run_level(mode, level, args.rounds, base, service))
+
+    from backend.adapters.base_adapter import close_http_client
+    await close_http_client()
+    server.terminate()
+    print(f"Each fan-out = {FANOUT} upstream calls, mock delay {args.delay_ms}ms, "
+          f"default thread pool size {min(32, (os.cpu_count() or 1) + 4)}")
+    print_table(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Adapter fan-out load test")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--delay-ms", type=int, default=100)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
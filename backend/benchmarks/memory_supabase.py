@@ -0,0 +1,148 @@
+"""
+In-memory Supabase stand-in for offline benchmarks.
+Implements the slice of the supabase-py query builder the services use
+(select / eq / neq / gt / gte / lt / lte / in_ / is_ / order / limit,
+insert / upsert / update / delete, execute) over plain lists of dicts,
+with an optional per-call latency to mimic a PostgREST round trip.
+Unlike postgrest_standin it applies filters, so cache reads and writes
+behave like the real tables. Inserted rows get a `created_at` default, as
+the real tables do.
+"""
+
+import copy
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+_OPS = {
+    "eq": lambda a, b: a == b,
+    "neq": lambda a, b: a != b,
+    "gt": lambda a, b: a is not None and a > b,
+    "gte": lambda a, b: a is not None and a >= b,
+    "lt": lambda a, b: a is not None and a < b,
+    "lte": lambda a, b: a is not None and a <= b,
+    "in": lambda a, b: a in b,
+    "is": lambda a, b: a is None if b in (None, "null") else a is b,
+}
+
+
+class _Query:
+    def __init__(self, db: "MemorySupabase", table: str):
+        self._db = db
+        self._table = table
+        self._action = "select"
+        self._payload = None
+        self._on_conflict = None
+        self._ignore_duplicates = False
+        self._columns = None
+        self._filters: list[tuple[str, str, object]] = []
+        self._order: tuple[str, bool] | None = None
+        self._limit: int | None = None
+
+    # ── actions ──
+    def select(self, columns: str = "*", count: str | None = None):
+        self._action = "select"
+        self._columns = None if columns.strip() == "*" else [c.strip() for c in columns.split(",")]
+        return self
+
+    def insert(self, rows):
+        self._action, self._payload = "insert", rows
+        return self
+
+    def upsert(self, rows, on_conflict: str = "id", ignore_duplicates: bool = False, **_):
+        self._action, self._payload, self._on_conflict = "upsert", rows, on_conflict
+        self._ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, values: dict):
+        self._action, self._payload = "update", values
+        return self
+
+    def delete(self):
+        self._action = "delete"
+        return self
+
+    # ── filters / modifiers ──
+    def _filter(self, op: str, column: str, value):
+        self._filters.append((op, column, value))
+        return self
+
+    def eq(self, column, value): return self._filter("eq", column, value)
+    def neq(self, column, value): return self._filter("neq", column, value)
+    def gt(self, column, value): return self._filter("gt", column, value)
+    def gte(self, column, value): return self._filter("gte", column, value)
+    def lt(self, column, value): return self._filter("lt", column, value)
+    def lte(self, column, value): return self._filter("lte", column, value)
+    def in_(self, column, values): return self._filter("in", column, list(values))
+    def is_(self, column, value): return self._filter("is", column, value)
+
+    def order(self, column: str, desc: bool = False):
+        self._order = (column, desc)
+        return self
+
+    def limit(self, n: int):
+        self._limit = n
+        return self
+
+    def _matches(self, row: dict) -> bool:
+        return all(_OPS[op](row.get(column), value) for op, column, value in self._filters)
+
+    def execute(self):
+        return self._db._execute(self)
+
+
+class MemorySupabase:
+    """A dict of tables standing in for a Supabase client; `calls` counts (table, action) pairs."""
+
+    def __init__(self, tables: dict[str, list[dict]] | None = None, latency_ms: float = 0.0):
+        self.tables: dict[str, list[dict]] = {k: copy.deepcopy(v) for k, v in (tables or {}).items()}
+        self.latency_s = latency_ms / 1000
+        self.calls: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def table(self, name: str) -> _Query:
+        return _Query(self, name)
+
+    def _execute(self, q: _Query):
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        with self._lock:
+            self.calls[(q._table, q._action)] += 1
+            rows = self.tables.setdefault(q._table, [])
+            if q._action == "select":
+                data = [r for r in rows if q._matches(r)]
+                if q._order:
+                    column, desc = q._order
+                    data.sort(key=lambda r: (r.get(column) is None, r.get(column)), reverse=desc)
+                if q._limit is not None:
+                    data = data[:q._limit]
+                if q._columns:
+                    data = [{c: r.get(c) for c in q._columns} for r in data]
+                return SimpleNamespace(data=copy.deepcopy(data), count=len(data))
+            if q._action in ("insert", "upsert"):
+                incoming = q._payload if isinstance(q._payload, list) else [q._payload]
+                keys = [k.strip() for k in (q._on_conflict or "").split(",") if k.strip()]
+                for new in incoming:
+                    existing = None
+                    if q._action == "upsert" and keys:
+                        existing = next((r for r in rows if all(r.get(k) == new.get(k) for k in keys)), None)
+                    if existing is not None:
+                        if not q._ignore_duplicates:
+                            existing.update(copy.deepcopy(new))
+                    else:
+                        row = copy.deepcopy(new)
+                        row.setdefault("created_at", datetime.now(timezone.utc).isoformat())
+                        rows.append(row)
+                return SimpleNamespace(data=copy.deepcopy(incoming), count=len(incoming))
+            if q._action == "update":
+                touched = [r for r in rows if q._matches(r)]
+                for r in touched:
+                    r.update(copy.deepcopy(q._payload))
+                return SimpleNamespace(data=copy.deepcopy(touched), count=len(touched))
+            kept, removed = [], []
+            for r in rows:
+                (removed if q._matches(r) else kept).append(r)
+            self.tables[q._table] = kept
+            return SimpleNamespace(data=removed, count=len(removed))
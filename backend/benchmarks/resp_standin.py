@@ -0,0 +1,163 @@
+"""
+Minimal local Redis-protocol (RESP2) stand-in for benchmarks and local runs.
+Implements the commands the shared cache tier and redis-py's handshake use —
+PING, ECHO, SELECT, CLIENT, HELLO (RESP2 only), GET, SET
+(EX/PX/EXAT/PXAT/NX/XX), DEL, EXISTS, PTTL, DBSIZE, FLUSHDB/FLUSHALL, QUIT —
+over an in-memory dict with lazy expiry. Not a Redis replacement; it exists so
+the shared tier can be exercised without installing a server:
+
+    python -m backend.benchmarks.resp_standin --port 6399
+    REDIS_URL=redis://127.0.0.1:6399/0 uvicorn backend.main:app --workers 2
+"""
+
+import argparse
+import socketserver
+import threading
+import time
+
+
+class _Store:
+    def __init__(self):
+        self.data: dict[bytes, tuple[bytes, float | None]] = {}
+        self.lock = threading.Lock()
+        self.commands = 0
+
+    def get(self, key: bytes) -> bytes | None:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires is not None and expires <= time.time():
+            del self.data[key]
+            return None
+        return value
+
+
+def _bulk(value: bytes | None) -> bytes:
+    return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+def _int(n: int) -> bytes:
+    return b":%d\r\n" % n
+
+
+_OK = b"+OK\r\n"
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    store: _Store
+
+    def _read_command(self) -> list[bytes] | None:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.split()  # inline command (e.g. `PING` from telnet)
+        args = []
+        for _ in range(int(line[1:])):
+            size = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(size + 2)[:-2])
+        return args
+
+    def handle(self):
+        while True:
+            try:
+                args = self._read_command()
+            except (ConnectionError, ValueError):
+                return
+            if not args:
+                return
+            reply = self._dispatch(args[0].upper(), args[1:])
+            self.wfile.write(reply)
+            self.wfile.flush()
+            if args[0].upper() == b"QUIT":
+                return
+
+    def _dispatch(self, cmd: bytes, args: list[bytes]) -> bytes:
+        store = self.store
+        with store.lock:
+            store.commands += 1
+            if cmd == b"PING":
+                return _bulk(args[0]) if args else b"+PONG\r\n"
+            if cmd == b"ECHO":
+                return _bulk(args[0])
+            if cmd in (b"SELECT", b"CLIENT", b"QUIT"):
+                return _OK
+            if cmd == b"HELLO":
+                if args and args[0] != b"2":
+                    return b"-NOPROTO this stand-in only speaks RESP2\r\n"
+                fields = [b"server", b"resp-standin", b"version", b"7.0.0", b"proto", b"2", b"mode", b"standalone"]
+                return b"*%d\r\n" % len(fields) + b"".join(_bulk(f) for f in fields)
+            if cmd == b"GET":
+                return _bulk(store.get(args[0]))
+            if cmd == b"SET":
+                return self._set(args)
+            if cmd == b"DEL":
+                removed = sum(store.data.pop(k, None) is not None for k in args)
+                return _int(removed)
+            if cmd == b"EXISTS":
+                return _int(sum(store.get(k) is not None for k in args))
+            if cmd == b"PTTL":
+                if store.get(args[0]) is None:
+                    return _int(-2)
+                expires = store.data[args[0]][1]
+                return _int(-1 if expires is None else int((expires - time.time()) * 1000))
+            if cmd == b"DBSIZE":
+                return _int(len(store.data))
+            if cmd in (b"FLUSHDB", b"FLUSHALL"):
+                store.data.clear()
+                return _OK
+            return b"-ERR unknown command '%s'\r\n" % cmd
+
+    def _set(self, args: list[bytes]) -> bytes:
+        store = self.store
+        key, value, opts = args[0], args[1], [a.upper() for a in args[2:]]
+        expires = None
+        i = 0
+        while i < len(opts):
+            opt = opts[i]
+            if opt in (b"EX", b"PX", b"EXAT", b"PXAT"):
+                n = int(args[2 + i + 1])
+                expires = {b"EX": time.time() + n, b"PX": time.time() + n / 1000,
+                           b"EXAT": float(n), b"PXAT": n / 1000}[opt]
+                i += 2
+                continue
+            i += 1
+        exists = store.get(key) is not None
+        if (b"NX" in opts and exists) or (b"XX" in opts and not exists):
+            return _bulk(None)
+        store.data[key] = (value, expires)
+        return _OK
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def start_standin(port: int = 0) -> tuple[socketserver.ThreadingTCPServer, str]:
+    """Serve on 127.0.0.1:port in a background thread. Returns (server, redis_url)."""
+    handler = type("Handler", (_Handler,), {"store": _Store()})
+    server = _Server(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"redis://127.0.0.1:{server.server_address[1]}/0"
+
+
+def store_of(server: socketserver.ThreadingTCPServer) -> _Store:
+    return server.RequestHandlerClass.store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--port", type=int, default=6399)
+    args = parser.parse_args()
+    server, url = start_standin(args.port)
+    print(f"RESP stand-in listening on {url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
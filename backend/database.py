@@ -1,4 +1,7 @@
 import os
+import threading
+import time
+from contextvars import ContextVar
 from pathlib import Path
 from supabase import create_client, Client
 from dotenv import load_dotenv
@@ -10,12 +13,154 @@ load_dotenv(dotenv_path=env_path)
 url: str = os.environ.get("SUPABASE_URL", "")
 key: str = os.environ.get("SUPABASE_KEY", "")
 
+# Pool tuning (see .env.example)
+POOL_SIZE = max(1, int(os.environ.get("SUPABASE_POOL_SIZE", "4")))
+POOL_TIMEOUT = float(os.environ.get("SUPABASE_TIMEOUT", "15"))
+HEALTH_TABLE = os.environ.get("SUPABASE_HEALTH_TABLE", "jobs")
+
+
+class _RequestCheckouts:
+    """Mutable per-request counter (mutations survive asyncio.to_thread context copies)."""
+    __slots__ = ("count",)
+
+    def __init__(self):
+        self.count = 0
+
+
+_request_checkouts: ContextVar[_RequestCheckouts | None] = ContextVar("supabase_checkouts", default=None)
+
+
+def _new_client() -> Client:
+    """Build one Supabase client. Its PostgREST httpx session keeps connections alive across calls."""
+    try:
+        from supabase import ClientOptions
+        options = ClientOptions(postgrest_client_timeout=POOL_TIMEOUT)
+        return create_client(url, key, options=options)
+    except ImportError:
+        return create_client(url, key)
+
+
+class SupabasePool:
+    """
+    Process-wide pool of reusable Supabase clients.
+    Clients are created lazily, handed out round-robin and replaced
+    when a health check fails — so TLS sessions are paid once per slot,
+    not once per get_supabase() call.
+    """
+
+    def __init__(self, size: int = POOL_SIZE):
+        self.size = size
+        self._clients: list[Client | None] = [None] * size
+        self._healthy: list[bool] = [True] * size
+        self._next = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "checkouts": 0,
+            "clients_created": 0,
+            "clients_recycled": 0,
+            "create_errors": 0,
+            "health_checks": 0,
+            "health_failures": 0,
+            "requests": 0,
+            "request_checkouts_total": 0,
+            "request_checkouts_max": 0,
+        }
+
+    def get(self) -> Client | None:
+        """Check out a client (shared, no release needed)."""
+        with self._lock:
+            slot = self._next
+            self._next = (self._next + 1) % self.size
+            client = self._clients[slot]
+            if client is None or not self._healthy[slot]:
+                client = self._create(slot)
+            if client is None:
+                return None
+            self._stats["checkouts"] += 1
+
+        counter = _request_checkouts.get()
+        if counter is not None:
+            counter.count += 1
+        return client
+
+    def _create(self, slot: int) -> Client | None:
+        try:
+            client = _new_client()
+        except Exception as e:
+            self._stats["create_errors"] += 1
+            print(f"Error creating Supabase client: {e}")
+            return None
+        if self._clients[slot] is not None:
+            self._stats["clients_recycled"] += 1
+        self._clients[slot] = client
+        self._healthy[slot] = True
+        self._stats["clients_created"] += 1
+        return client
+
+    def health_check(self) -> dict:
+        """Ping every live client with a 1-row select; unhealthy slots are rebuilt on next checkout."""
+        results = {}
+        for slot in range(self.size):
+            client = self._clients[slot]
+            if client is None:
+                results[slot] = "idle"
+                continue
+            started = time.perf_counter()
+            try:
+                client.table(HEALTH_TABLE).select("id").limit(1).execute()
+                ok = True
+            except Exception:
+                ok = False
+            with self._lock:
+                self._stats["health_checks"] += 1
+                if not ok:
+                    self._stats["health_failures"] += 1
+                self._healthy[slot] = ok
+            results[slot] = f"ok ({(time.perf_counter() - started) * 1000:.0f}ms)" if ok else "unhealthy"
+        return results
+
+    def record_request(self, checkouts: int):
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["request_checkouts_total"] += checkouts
+            self._stats["request_checkouts_max"] = max(self._stats["request_checkouts_max"], checkouts)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = self.size
+            stats["live_clients"] = sum(1 for c in self._clients if c is not None)
+            stats["unhealthy_clients"] = sum(
+                1 for c, ok in zip(self._clients, self._healthy) if c is not None and not ok
+            )
+        requests = stats["requests"]
+        stats["request_checkouts_avg"] = round(stats["request_checkouts_total"] / requests, 2) if requests else 0
+        return stats
+
+
+_pool = SupabasePool()
+
+
+def get_pool() -> SupabasePool:
+    return _pool
+
+
 def get_supabase() -> Client:
     if not url or not key:
         print("Warning: SUPABASE_URL or SUPABASE_KEY not set.")
         return None
-    try:
-        return create_client(url, key)
-    except Exception as e:
-        print(f"Error creating Supabase client: {e}")
-        return None
+    return _pool.get()
+
+
+def begin_request_checkouts():
+    """Start counting checkouts for the current request. Returns a token for end_request_checkouts()."""
+    return _request_checkouts.set(_RequestCheckouts())
+
+
+def end_request_checkouts(token) -> int:
+    """Stop counting, record the request in pool stats and return its checkout count."""
+    counter = _request_checkouts.get()
+    _request_checkouts.reset(token)
+    count = counter.count if counter else 0
+    _pool.record_request(count)
+    return count
@@ -1,21 +1,21 @@
-import google.generativeai as genai
-import os
 import json
-from dotenv import load_dotenv
 
-load_dotenv()
+try:
+    from backend.utils.gemini_client import get_gemini_client
+    from backend.utils.llm_cache import parses_as_json
+except ImportError:
+    from utils.gemini_client import get_gemini_client
+    from utils.llm_cache import parses_as_json
 
-genai.configure(api_key=os.environ["GEMINI_API_KEY"])
+# Confirmed available: models/gemini-2.0-flash-001
+RESUME_MODEL = "gemini-2.0-flash-001"
 
-def parse_resume_to_json(text: str) -> dict:
+async def parse_resume_to_json(text: str) -> dict:
     """
     Uses Gemini to extract structured data from resume text.
     """
-    print(f"DEBUG: Using API Key: {os.environ.get('GEMINI_API_KEY')[:5]}... (Length: {len(os.environ.get('GEMINI_API_KEY'))})")
-    
     try:
-        # Confirmed available: models/gemini-2.0-flash-001
-        model = genai.GenerativeModel('gemini-2.0-flash-001')
+        client = get_gemini_client()
         
         prompt = f"""
         You are an expert Resume Parser. 
@@ -44,10 +44,10 @@ def parse_resume_to_json(text: str) -> dict:
         """
         
         print(f"DEBUG: Extracted {len(text)} chars from resume. Calling Gemini...")
-        response = model.generate_content(prompt)
+        # Same resume text, same answer: repeat uploads are served from the LLM cache
+        raw_text = await client.generate_text(prompt, model=RESUME_MODEL, cache=True, cache_if=parses_as_json)
 
         print("DEBUG: Received response from Gemini.")
-        raw_text = response.text
         print(f"DEBUG: Raw Gemini Response: {raw_text[:200]}...")
 
         # Clean response more aggressively
@@ -4,11 +4,33 @@ import os
 # Ensure the backend directory itself is always in the python path for absolute imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from fastapi import FastAPI
+import asyncio
+import time
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
+from fastapi.responses import PlainTextResponse
+
+try:
+    from .database import get_pool, begin_request_checkouts, end_request_checkouts
+    from .adapters.base_adapter import close_http_client
+    from .services.cache_service import start_sweeper, close_backends
+    from .utils import metrics
+    from .utils.llm_cache import get_llm_cache
+    from .utils.llm_scheduler import get_scheduler
+except ImportError:
+    from database import get_pool, begin_request_checkouts, end_request_checkouts
+    from adapters.base_adapter import close_http_client
+    from services.cache_service import start_sweeper, close_backends
+    from utils import metrics
+    from utils.llm_cache import get_llm_cache
+    from utils.llm_scheduler import get_scheduler
+
 app = FastAPI(title="SPORTS Backend", version="1.0.0")
 
+# Interval for background Supabase pool health checks (0 disables)
+DB_HEALTH_INTERVAL = int(os.environ.get("SUPABASE_HEALTH_INTERVAL", "60"))
+
 # CORS setup
 app.add_middleware(
     CORSMiddleware,
@@ -18,6 +40,64 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def track_db_checkouts(request: Request, call_next):
+    """Count Supabase client checkouts per request and expose them as a response header."""
+    token = begin_request_checkouts()
+    try:
+        response = await call_next(request)
+    finally:
+        checkouts = end_request_checkouts(token)
+    response.headers["X-DB-Checkouts"] = str(checkouts)
+    return response
+
+
+if metrics.ENABLED:
+    @app.middleware("http")
+    async def record_request_latency(request: Request, call_next):
+        """Request latency per route template (not raw path, to keep label cardinality bounded)."""
+        started = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = request.scope.get("route")
+            metrics.observe("http_request_seconds", time.perf_counter() - started,
+                            method=request.method, route=getattr(route, "path", "unmatched"),
+                            status=str(status))
+
+
+async def _db_health_loop():
+    while True:
+        await asyncio.sleep(DB_HEALTH_INTERVAL)
+        try:
+            await asyncio.to_thread(get_pool().health_check)
+        except Exception as e:
+            print(f"DB health check error: {e}")
+
+
+@app.on_event("startup")
+async def start_db_health_checks():
+    if DB_HEALTH_INTERVAL > 0:
+        asyncio.create_task(_db_health_loop())
+
+
+@app.on_event("startup")
+async def start_cache_sweeper():
+    start_sweeper()
+
+
+@app.on_event("shutdown")
+async def close_adapter_client():
+    await close_http_client()
+
+
+@app.on_event("shutdown")
+async def close_cache_backends():
+    await close_backends()
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to SPORTS API"}
@@ -26,6 +106,23 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Prometheus text exposition of stage timings, adapter outcomes and cache hit ratios"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/health/llm")
+async def llm_health_check():
+    """Gemini scheduler (queue depth, admission waits, quota left, retries) and response cache"""
+    return {**get_scheduler().stats(), "cache": get_llm_cache().stats()}
+
+@app.get("/health/db")
+async def db_health_check():
+    """Supabase pool health + checkout metrics"""
+    pool = get_pool()
+    clients = await asyncio.to_thread(pool.health_check)
+    return {"clients": clients, "stats": pool.stats()}
+
 try:
     from .routers import roadmap
     from .routers import chat
@@ -101,33 +198,22 @@ async def parse_resume(file: UploadFile = File(...)):
         print("ERROR: Extracted text is empty!")
         raise HTTPException(status_code=400, detail="Could not extract text from file.")
 
-    parsed_data = parse_resume_to_json(text)
+    parsed_data = await parse_resume_to_json(text)
     return parsed_data
 
 try:
-    from .scrapers.jobs import JobScraper
-    from .scrapers.hackathons import HackathonScraper
+    from .scrapers.orchestrator import start_scrape
 except ImportError:
-    from scrapers.jobs import JobScraper
-    from scrapers.hackathons import HackathonScraper
+    from scrapers.orchestrator import start_scrape
 
 @app.post("/api/scrape/jobs")
 async def trigger_job_scrape():
-    try:
-        scraper = JobScraper()
-        scraper.run()
-        return {"message": "Job scraping completed successfully"}
-    except Exception as e:
-        print(f"Error: {e}")
-        # Return success anyway for MVP so UI doesn't break if one site fails
-        return {"message": f"Scraping attempted: {str(e)}"}
+    """Start job scraping in the background (status: GET /api/opportunities/scrape/{job_id})"""
+    job = start_scrape(("jobs",))
+    return {"message": "Job scraping started", **job.to_dict()}
 
 @app.post("/api/scrape/hackathons")
 async def trigger_hackathon_scrape():
-    try:
-        scraper = HackathonScraper()
-        scraper.run()
-        return {"message": "Hackathon scraping completed successfully"}
-    except Exception as e:
-        print(f"Error: {e}")
-        return {"message": f"Scraping attempted: {str(e)}"}
+    """Start hackathon scraping in the background (status: GET /api/opportunities/scrape/{job_id})"""
+    job = start_scrape(("hackathons",))
+    return {"message": "Hackathon scraping started", **job.to_dict()}
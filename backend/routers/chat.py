@@ -2,9 +2,9 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional
 try:
-    from backend.utils.gemini_client import GeminiClient
+    from backend.utils.gemini_client import get_gemini_client
 except ImportError:
-    from utils.gemini_client import GeminiClient
+    from utils.gemini_client import get_gemini_client
 
 router = APIRouter()
 
@@ -17,7 +17,7 @@ from fastapi.responses import StreamingResponse
 @router.post("/")
 async def chat_with_tutor(request: ChatRequest):
     try:
-        client = GeminiClient()
+        client = get_gemini_client()
         return StreamingResponse(
             client.chat_with_tutor_stream(request.message, request.context),
             media_type="text/plain"
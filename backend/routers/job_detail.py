@@ -13,10 +13,16 @@ from typing import Optional
 
 try:
     from ..database import get_supabase
-    from ..utils.gemini_client import GeminiClient
+    from ..utils.gemini_client import get_gemini_client
+    from ..utils.llm_cache import parses_as_json
+    from ..utils.llm_scheduler import Priority
+    from ..scrapers.parsing import make_soup
 except ImportError:
     from backend.database import get_supabase
-    from backend.utils.gemini_client import GeminiClient
+    from backend.utils.gemini_client import get_gemini_client
+    from backend.utils.llm_cache import parses_as_json
+    from backend.utils.llm_scheduler import Priority
+    from backend.scrapers.parsing import make_soup
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/job-detail", tags=["Job Detail"])
@@ -34,11 +40,10 @@ _HEADERS = {
 def _scrape_internshala_detail(url: str) -> dict | None:
     """Scrape full job details from an Internshala detail page."""
     try:
-        from bs4 import BeautifulSoup
         resp = requests.get(url, headers=_HEADERS, timeout=10)
         if resp.status_code != 200:
             return None
-        soup = BeautifulSoup(resp.text, "html.parser")
+        soup = make_soup(resp.text)
 
         result = {}
 
@@ -108,11 +113,10 @@ def _scrape_internshala_detail(url: str) -> dict | None:
 def _scrape_generic_detail(url: str) -> dict | None:
     """Generic scraper — tries to extract structured data from any job page."""
     try:
-        from bs4 import BeautifulSoup
         resp = requests.get(url, headers=_HEADERS, timeout=10)
         if resp.status_code != 200:
             return None
-        soup = BeautifulSoup(resp.text, "html.parser")
+        soup = make_soup(resp.text)
 
         # Try to find job description in common containers
         result = {}
@@ -168,12 +172,12 @@ def _scrape_job_detail(url: str, source: str) -> dict | None:
 
 # ─── Gemini: Structure + Generate ─────────────────────────────
 
-def _structure_scraped_data(raw_text: str, title: str, company: str,
-                            existing_tech_stack: list = None) -> dict:
+async def _structure_scraped_data(raw_text: str, title: str, company: str,
+                                  existing_tech_stack: list = None) -> dict:
     """Use Gemini to structure raw scraped text into clean sections."""
     try:
         import json
-        client = GeminiClient()
+        client = get_gemini_client()
         if not client.model:
             return {"description": raw_text, "data_source": "scraped"}
 
@@ -206,8 +210,8 @@ Rules:
 - If the raw text has fields like "CTC", "Notice Period", "Location", "Shift Timing" etc., include them naturally in the description
 - For tech_stack, extract individual technologies (e.g. "Python", "TensorFlow", "AWS") not phrases"""
 
-        response = client.model.generate_content(prompt, request_options={"timeout": 30})
-        text = response.text.strip()
+        text = (await client.generate_text(prompt, timeout=30, priority=Priority.BACKGROUND,
+                                           cache=True, cache_if=parses_as_json)).strip()
         if text.startswith("```"):
             text = re.sub(r"^```\w*\n?", "", text)
             text = re.sub(r"\n?```$", "", text)
@@ -229,12 +233,12 @@ Rules:
         return {"description": raw_text, "data_source": "scraped"}
 
 
-def _generate_jd_with_gemini(title: str, company: str, location: str,
-                              job_type: str, salary: str) -> dict:
+async def _generate_jd_with_gemini(title: str, company: str, location: str,
+                                    job_type: str, salary: str) -> dict:
     """Generate a realistic job description using Gemini AI."""
     try:
         import json
-        client = GeminiClient()
+        client = get_gemini_client()
         if not client.model:
             return {}
 
@@ -259,8 +263,8 @@ Return ONLY valid JSON with this EXACT structure:
 Make it realistic and professional. Include 5-8 requirements, 5-8 responsibilities, and 4-8 tech stack items.
 Base the tech stack on what's typical for this role title."""
 
-        response = client.model.generate_content(prompt, request_options={"timeout": 30})
-        text = response.text
+        text = await client.generate_text(prompt, timeout=30, priority=Priority.BACKGROUND,
+                                          cache=True, cache_if=parses_as_json)
         if text.startswith("```"):
             text = re.sub(r"^```\w*\n?", "", text)
             text = re.sub(r"\n?```$", "", text)
@@ -371,13 +375,14 @@ async def get_job_detail(
             }
         else:
             # 3. Try scraping the job URL
-            scraped = _scrape_job_detail(job.get("url", ""), job.get("source", ""))
+            # requests-based scraping blocks, so it runs off the event loop
+            scraped = await asyncio.to_thread(_scrape_job_detail, job.get("url", ""), job.get("source", ""))
 
             if scraped and scraped.get("description"):
                 # 3b. Structure scraped data with Gemini
                 raw_desc = scraped.get("description", "")
                 existing_tech = scraped.get("tech_stack", [])
-                detail_data = _structure_scraped_data(
+                detail_data = await _structure_scraped_data(
                     raw_desc,
                     job.get("title", ""),
                     job.get("company", ""),
@@ -389,7 +394,7 @@ async def get_job_detail(
                         detail_data[key] = scraped[key]
             else:
                 # 4. Fallback to full Gemini generation
-                detail_data = _generate_jd_with_gemini(
+                detail_data = await _generate_jd_with_gemini(
                     job.get("title", ""),
                     job.get("company", ""),
                     job.get("location", ""),
@@ -4,12 +4,29 @@ Merges scraped DB data + live API adapter results.
 """
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional
+import json
 import logging
 
+try:
+    import numpy as np
+    # score()'s keyword (0-5+ hits) and domain (0-3+ hits) tiers as lookup tables for score_batch
+    _KEYWORD_POINTS = np.array([0, 20, 30, 40, 40, 50])
+    _DOMAIN_POINTS = np.array([0, 15, 25, 30])
+except ImportError:  # batch scoring falls back to the per-row matcher
+    np = None
+
 from backend.database import get_supabase
 from backend.services.opportunity_service import OpportunityService
+from backend.services.cache_service import cache_stats
+from backend.services.platform_registry import breaker_stats
+from backend.services.keyword_matcher import KeywordAutomaton
+from backend.utils import metrics
+from backend.services.job_features import (
+    DOMAIN_TITLE_MATCHES as _DOMAIN_TITLE_MATCHES, compute_job_features, has_current_features,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/opportunities", tags=["Opportunities"])
@@ -34,6 +51,38 @@ class BookmarkUpdateRequest(BaseModel):
 
 
 # ─── Unified Search ─────────────────────────────────────────────
+_EMPTY_PROFILE_RESPONSE = {
+    "opportunities": [],
+    "total": 0,
+    "cached": False,
+    "source_breakdown": {},
+    "message": "Complete your profile to get personalized results",
+}
+
+
+def _load_search_profile(user_id: str) -> dict | None:
+    """The user's profile with skills normalized to a list, or None if they have none yet."""
+    supabase = get_supabase()
+    if not supabase:
+        raise HTTPException(status_code=500, detail="Database not configured")
+
+    with metrics.span("profile_fetch"):
+        profile_result = supabase.table("profiles") \
+            .select("*") \
+            .eq("id", user_id) \
+            .execute()
+
+    if not profile_result.data or len(profile_result.data) == 0:
+        return None
+
+    profile = profile_result.data[0]
+    skills = profile.get("skills", [])
+    if isinstance(skills, str):
+        skills = [s.strip() for s in skills.split(",") if s.strip()]
+    profile["skills"] = skills
+    return profile
+
+
 @router.post("/search")
 async def search_opportunities(request: SearchRequest):
     """
@@ -41,29 +90,9 @@ async def search_opportunities(request: SearchRequest):
     searches all live API sources, scores, returns results.
     """
     try:
-        supabase = get_supabase()
-        if not supabase:
-            raise HTTPException(status_code=500, detail="Database not configured")
-
-        profile_result = supabase.table("profiles") \
-            .select("*") \
-            .eq("id", request.user_id) \
-            .execute()
-
-        if not profile_result.data or len(profile_result.data) == 0:
-            return {
-                "opportunities": [],
-                "total": 0,
-                "cached": False,
-                "source_breakdown": {},
-                "message": "Complete your profile to get personalized results",
-            }
-
-        profile = profile_result.data[0]
-        skills = profile.get("skills", [])
-        if isinstance(skills, str):
-            skills = [s.strip() for s in skills.split(",") if s.strip()]
-        profile["skills"] = skills
+        profile = _load_search_profile(request.user_id)
+        if profile is None:
+            return dict(_EMPTY_PROFILE_RESPONSE)
 
         result = await _service.search(profile, force_refresh=request.force_refresh)
         return result
@@ -75,6 +104,49 @@ async def search_opportunities(request: SearchRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/search/stream")
+async def search_opportunities_stream(request: SearchRequest):
+    """
+    Streaming search as NDJSON: one {"event": "batch", ...} line per source as it
+    completes (scored, new items only), then a final {"event": "done", ...} line
+    with the merged ranking — the same payload /search returns.
+    """
+    try:
+        profile = _load_search_profile(request.user_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Search stream error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def events():
+        if profile is None:
+            yield json.dumps({"event": "done", **_EMPTY_PROFILE_RESPONSE}) + "\n"
+            return
+        try:
+            async for event in _service.search_stream(profile, force_refresh=request.force_refresh):
+                yield json.dumps(event, default=str) + "\n"
+        except Exception as e:
+            logger.error(f"Search stream error: {e}")
+            yield json.dumps({"event": "error", "detail": str(e)}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+# ─── Cache Stats ───────────────────────────────────────────────
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """L1/L2 cache size, hit/miss and eviction counters"""
+    return cache_stats()
+
+
+# ─── Source Health ─────────────────────────────────────────────
+@router.get("/sources/health")
+async def get_source_health():
+    """Circuit state, adaptive timeout and recent p95 per live API source"""
+    return breaker_stats()
+
+
 # ─── International Opportunities ───────────────────────────────
 
 from datetime import datetime as _dt
@@ -377,16 +449,6 @@ _SKILL_EXPANSIONS = {
     "css": {"css", "web", "frontend", "web developer"},
 }
 
-# Domain keywords that make generic titles relevant
-_DOMAIN_TITLE_MATCHES = {
-    "ai": ["software", "engineer", "developer", "research", "data", "analyst", "ml", "ai", "intern", "full stack"],
-    "web": ["software", "developer", "engineer", "frontend", "backend", "full stack", "web", "intern"],
-    "data": ["software", "engineer", "data", "analyst", "developer", "research", "intern", "science"],
-    "mobile": ["software", "developer", "mobile", "android", "ios", "flutter", "intern"],
-    "devops": ["software", "engineer", "devops", "cloud", "infrastructure", "sre", "developer", "intern"],
-}
-
-
 def _detect_domain(skills: list[str], career_goal: str) -> str:
     """Detect the user's primary domain from skills and goal."""
     all_text = " ".join(skills).lower() + " " + career_goal.lower()
@@ -456,63 +518,188 @@ def _build_keyword_set(skills: list[str], career_goal: str, resume_data: dict) -
     return keywords
 
 
-def _compute_relevance(title: str, company: str, location: str,
-                       keyword_set: set[str], domain: str) -> int:
-    """Smart relevance scoring: 0-100 based on expanded keyword matching and domain awareness."""
-    if not keyword_set:
-        return 0
-
-    title_lower = title.lower()
-    text = f"{title_lower} {company.lower()} {location.lower()}"
-    score = 0
-
-    # ─── 1. Keyword matching (up to 50 points) ───
-    matched = 0
-    for kw in keyword_set:
-        if kw in text:
-            matched += 1
-    # Score based on how many keywords hit (diminishing returns)
-    if matched >= 5:
-        score += 50
-    elif matched >= 3:
-        score += 40
-    elif matched >= 2:
-        score += 30
-    elif matched >= 1:
-        score += 20
-
-    # ─── 2. Domain-aware title matching (up to 30 points) ───
-    domain_keywords = _DOMAIN_TITLE_MATCHES.get(domain, [])
-    domain_hits = sum(1 for dk in domain_keywords if dk in title_lower)
-    if domain_hits >= 3:
-        score += 30
-    elif domain_hits >= 2:
-        score += 25
-    elif domain_hits >= 1:
-        score += 15
-
-    # ─── 3. Type bonus (up to 15 points) ───
-    if any(k in title_lower for k in ["intern", "trainee", "fresher", "entry level", "apprentice"]):
-        score += 10
-    if "remote" in text:
-        score += 5
-
-    # ─── 4. Penalty for clearly irrelevant domains ───
-    irrelevant_keywords = ["finance", "accounting", "legal", "law", "hr", "human resource",
-                           "sales", "marketing", "content writer", "graphic design",
-                           "civil", "mechanical", "chemical", "pharmacy", "medical",
-                           "architecture"]
-    if any(ik in title_lower for ik in irrelevant_keywords):
-        if not any(kw in title_lower for kw in keyword_set):
+_TYPE_TITLE_KEYWORDS = ["intern", "trainee", "fresher", "entry level", "apprentice"]
+_IRRELEVANT_TITLE_KEYWORDS = ["finance", "accounting", "legal", "law", "hr", "human resource",
+                              "sales", "marketing", "content writer", "graphic design",
+                              "civil", "mechanical", "chemical", "pharmacy", "medical",
+                              "architecture"]
+
+
+class _RelevanceMatcher:
+    """
+    Keyword profile compiled into one Aho–Corasick automaton.
+    Each row is scanned once as "title company location"; title-only groups
+    are read from the hits that end inside the title.
+    """
+
+    def __init__(self, keyword_set: set[str], domain: str):
+        self.has_keywords = bool(keyword_set)
+        self.automaton = KeywordAutomaton({
+            "keyword": keyword_set,
+            "domain": _DOMAIN_TITLE_MATCHES.get(domain, []),
+            "type": _TYPE_TITLE_KEYWORDS,
+            "remote": ["remote"],
+            "irrelevant": _IRRELEVANT_TITLE_KEYWORDS,
+        })
+        self._group_masks = {}
+        if np is not None:
+            for group, pids in self.automaton.groups.items():
+                mask = np.zeros(len(self.automaton.patterns))
+                mask[list(pids)] = 1.0
+                self._group_masks[group] = mask
+
+    def score(self, title: str, company: str, location: str) -> int:
+        """Smart relevance scoring: 0-100 based on expanded keyword matching and domain awareness."""
+        if not self.has_keywords:
+            return 0
+
+        title_lower = title.lower()
+        text = f"{title_lower} {company.lower()} {location.lower()}"
+        hits, title_hits = self.automaton.scan(text, split=len(title_lower))
+        count = self.automaton.count
+        score = 0
+
+        # ─── 1. Keyword matching (up to 50 points) ───
+        matched = count(hits, "keyword")
+        # Score based on how many keywords hit (diminishing returns)
+        if matched >= 5:
+            score += 50
+        elif matched >= 3:
+            score += 40
+        elif matched >= 2:
+            score += 30
+        elif matched >= 1:
+            score += 20
+
+        # ─── 2. Domain-aware title matching (up to 30 points) ───
+        domain_hits = count(title_hits, "domain")
+        if domain_hits >= 3:
+            score += 30
+        elif domain_hits >= 2:
+            score += 25
+        elif domain_hits >= 1:
+            score += 15
+
+        # ─── 3. Type bonus (up to 15 points) ───
+        if count(title_hits, "type"):
+            score += 10
+        if count(hits, "remote"):
+            score += 5
+
+        # ─── 4. Penalty for clearly irrelevant domains ───
+        if count(title_hits, "irrelevant") and not count(title_hits, "keyword"):
             score = max(score - 40, 5)
 
-    return min(score, 100)
+        return min(score, 100)
+
+    def score_batch(self, rows: list[tuple[str, str]]) -> list[int]:
+        """
+        Score a whole result set at once from precomputed (title_norm, context_norm)
+        pairs (see services/job_features.py). Each distinct string is scanned once
+        into a sparse (row, pattern) hit matrix; the point rules then run as
+        NumPy array operations.
+        """
+        if not self.has_keywords or not rows:
+            return [0] * len(rows)
+        if np is None:
+            return [self.score(t, c, "") for t, c in rows]
+
+        scan = self.automaton.scan
+        title_cache: dict[str, set[int]] = {}
+        rest_cache: dict[str, set[int]] = {}
+        title_rows, title_pids, rest_rows, rest_pids = [], [], [], []
+        for i, (title_norm, rest) in enumerate(rows):
+            t_hits = title_cache.get(title_norm)
+            if t_hits is None:
+                t_hits = title_cache[title_norm] = scan(title_norm)[0]
+            r_hits = rest_cache.get(rest)
+            if r_hits is None:
+                r_hits = rest_cache[rest] = scan(rest)[0]
+            title_rows.extend([i] * len(t_hits))
+            title_pids.extend(t_hits)
+            rest_rows.extend([i] * len(r_hits))
+            rest_pids.extend(r_hits)
+
+        n = len(rows)
+        n_patterns = len(self.automaton.patterns)
+        title_rows = np.asarray(title_rows, dtype=np.int64)
+        title_pids = np.asarray(title_pids, dtype=np.int64)
+        # Distinct (row, pattern) pairs across title + rest
+        pairs = np.unique(np.concatenate([
+            title_rows * n_patterns + title_pids,
+            np.asarray(rest_rows, dtype=np.int64) * n_patterns + np.asarray(rest_pids, dtype=np.int64),
+        ]))
+        all_rows, all_pids = pairs // n_patterns, pairs % n_patterns
+
+        def counts(row_idx, pid_idx, group):
+            mask = self._group_masks[group]
+            return np.bincount(row_idx, weights=mask[pid_idx], minlength=n)
+
+        keyword = np.minimum(counts(all_rows, all_pids, "keyword"), 5).astype(np.int64)
+        domain = np.minimum(counts(title_rows, title_pids, "domain"), 3).astype(np.int64)
+
+        score = _KEYWORD_POINTS[keyword] + _DOMAIN_POINTS[domain]
+        score += np.where(counts(title_rows, title_pids, "type") > 0, 10, 0)
+        score += np.where(counts(all_rows, all_pids, "remote") > 0, 5, 0)
+
+        penalized = (counts(title_rows, title_pids, "irrelevant") > 0) & \
+                    (counts(title_rows, title_pids, "keyword") == 0)
+        score = np.where(penalized, np.maximum(score - 40, 5), score)
+        return np.minimum(score, 100).astype(int).tolist()
+
+
+def _top_k_order(scores: list[int], k: int) -> list[int]:
+    """
+    Indices of the k best scores, highest first; ties keep their input order
+    (newest first). Uses argpartition so only the top k are fully sorted.
+    """
+    n = len(scores)
+    k = min(k, n)
+    if np is None:
+        return sorted(range(n), key=lambda i: (-scores[i], i))[:k]
+    # Unique composite key: higher score first, then lower index
+    key = -np.asarray(scores, dtype=np.int64) * n + np.arange(n)
+    if k < n:
+        top = np.argpartition(key, k - 1)[:k]
+        return top[np.argsort(key[top])].tolist()
+    return np.argsort(key).tolist()
+
+
+_JOB_COLUMNS = "id, title, company, location, type, url, source, salary_range, posted_at, " \
+               "title_norm, context_norm, category, is_remote, domain_tags, features_version"
+
+
+def _fetch_recent_jobs(supabase, cutoff: str, limit: int) -> list[dict]:
+    """
+    Jobs a scrape has seen since `cutoff`, newest first, with their precomputed
+    features. Falls back to posted_at before sql/016 and to * before sql/010.
+    """
+    def query(columns, window):
+        return supabase.table("jobs") \
+            .select(columns) \
+            .gte(window, cutoff) \
+            .order("posted_at", desc=True) \
+            .limit(limit) \
+            .execute()
+
+    columns, window = _JOB_COLUMNS, "last_seen_at"
+    while True:
+        try:
+            return query(columns, window).data or []
+        except Exception as e:
+            if window != "posted_at" and "last_seen_at" in str(e):
+                window = "posted_at"
+            elif columns != "*" and ("title_norm" in str(e) or "features_version" in str(e)):
+                columns = "*"
+            else:
+                raise
 
 
 @router.get("/db/jobs")
 async def get_db_jobs(
     limit: int = Query(100, ge=1, le=500),
     user_id: str = Query(None, description="Optional user ID for skill-based relevance sorting"),
+    top: int = Query(None, ge=1, le=500, description="Only return the N most relevant rows"),
 ):
     """Read jobs from the scraped `jobs` table — sorted by profile relevance if logged in"""
     try:
@@ -543,50 +730,44 @@ async def get_db_jobs(
                 pass
 
 
-        # Only fetch jobs posted within the last 60 days
+        # Only fetch jobs still listed within the last 60 days
         cutoff = (datetime.now() - timedelta(days=60)).isoformat()
 
-        result = supabase.table("jobs") \
-            .select("*") \
-            .gte("posted_at", cutoff) \
-            .order("posted_at", desc=True) \
-            .limit(limit) \
-            .execute()
-
-        rows = result.data or []
-        # Normalize into unified format
-        items = []
+        rows = _fetch_recent_jobs(supabase, cutoff, limit)
         for r in rows:
-            title = r.get("title", "")
-            job_type = (r.get("type") or "").lower()
-            if "intern" in job_type or "intern" in title.lower():
-                category = "internship"
-            else:
-                category = "job"
+            if not has_current_features(r):
+                r.update(compute_job_features(r))
+
+        matcher = _RelevanceMatcher(keyword_set, domain)
+        scores = matcher.score_batch([(r["title_norm"], r["context_norm"]) for r in rows])
 
-            location = r.get("location", "")
-            score = _compute_relevance(title, r.get("company", ""), location, keyword_set, domain)
+        # Relevance order (highest first, ties keep posted_at order), cut to `top`
+        if keyword_set:
+            order = _top_k_order(scores, top or len(rows))
+        else:
+            order = range(min(top or len(rows), len(rows)))
 
+        # Project into unified format
+        items = []
+        for i in order:
+            r = rows[i]
             items.append({
                 "id": str(r.get("id", "")),
-                "title": title,
+                "title": r.get("title", ""),
                 "company": r.get("company", ""),
-                "location": location,
+                "location": r.get("location", ""),
                 "url": r.get("url", ""),
                 "source": r.get("source", ""),
-                "type": category,
+                "type": r["category"],
                 "salary": r.get("salary_range", None),
                 "posted_date": r.get("posted_at", ""),
-                "is_remote": "remote" in location.lower() or "work from home" in location.lower(),
+                "is_remote": bool(r["is_remote"]),
                 "tags": [],
+                "domain_tags": r.get("domain_tags") or [],
                 "description": "",
-                "match_score": score,
+                "match_score": scores[i],
             })
 
-        # Sort by relevance score (highest first), then by posted_date
-        if keyword_set:
-            items.sort(key=lambda x: x["match_score"], reverse=True)
-
         return {"items": items, "total": len(items)}
 
     except HTTPException:
@@ -687,25 +868,27 @@ async def get_international_programs(user_id: str = Query(None)):
 # ─── Scrape Trigger ────────────────────────────────────────────
 @router.post("/scrape")
 async def trigger_scrape():
-    """Trigger the scrapers to refresh DB data"""
-    results = {}
-    try:
-        from backend.scrapers.jobs import JobScraper
-        JobScraper().run()
-        results["jobs"] = "ok"
-    except Exception as e:
-        logger.warning(f"Job scrape failed: {e}")
-        results["jobs"] = str(e)
-
-    try:
-        from backend.scrapers.hackathons import HackathonScraper
-        HackathonScraper().run()
-        results["hackathons"] = "ok"
-    except Exception as e:
-        logger.warning(f"Hackathon scrape failed: {e}")
-        results["hackathons"] = str(e)
-
-    return {"message": "Scrape completed", "results": results}
+    """Start a background scrape of all sources (poll GET /scrape/{job_id} for progress)"""
+    from backend.scrapers.orchestrator import start_scrape
+    job = start_scrape(("jobs", "hackathons"))
+    return {"message": "Scrape started", **job.to_dict()}
+
+
+@router.get("/scrape")
+async def list_scrapes():
+    """Recent scrape jobs, newest first"""
+    from backend.scrapers.orchestrator import list_jobs
+    return {"jobs": [job.to_dict() for job in list_jobs()]}
+
+
+@router.get("/scrape/{job_id}")
+async def get_scrape_status(job_id: str):
+    """Status of one scrape job, with per-source duration and row counts"""
+    from backend.scrapers.orchestrator import get_job
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Scrape job not found")
+    return job.to_dict()
 
 
 # ─── Bookmarks ─────────────────────────────────────────────────
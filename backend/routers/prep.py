@@ -1,8 +1,8 @@
 """
 Phase 2 — Interview Preparation Lab
 Endpoints:
-  POST /api/prep/generate-quiz  → Generate 20 questions from job data
-  POST /api/prep/submit         → Submit answers, auto-grade + Gemini evaluate
+  POST /api/prep/generate-quiz  → 20 questions from the question bank, or generated from job data
+  POST /api/prep/submit         → Submit answers, auto-grade, local grader + Gemini evaluate
   GET  /api/prep/history        → Fetch user's prep history
 """
 
@@ -17,13 +17,18 @@ from pydantic import BaseModel
 
 try:
     from ..database import get_supabase
-    from ..utils.gemini_client import GeminiClient
+    from ..utils.gemini_client import get_gemini_client
+    from ..services.question_bank import QuestionBank, build_quiz_prompt, parse_questions
+    from ..services.local_grader import grade_answers
 except ImportError:
     from backend.database import get_supabase
-    from backend.utils.gemini_client import GeminiClient
+    from backend.utils.gemini_client import get_gemini_client
+    from backend.services.question_bank import QuestionBank, build_quiz_prompt, parse_questions
+    from backend.services.local_grader import grade_answers
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/prep", tags=["prep"])
+_bank = QuestionBank()
 
 
 # ─── Request / Response Models ────────────────────────────────
@@ -48,98 +53,30 @@ class SubmitQuizRequest(BaseModel):
 
 @router.post("/generate-quiz")
 async def generate_quiz(req: GenerateQuizRequest):
-    """Generate 20 interview questions tailored to the job."""
+    """Generate 20 interview questions tailored to the job (from the question bank when it covers the role)."""
     try:
-        client = GeminiClient()
-        if not client.model:
-            raise HTTPException(status_code=500, detail="AI not configured")
-
-        tech_str = ", ".join(req.tech_stack[:15]) if req.tech_stack else "general programming"
-        reqs_str = "\n".join(f"- {r}" for r in req.requirements[:8]) if req.requirements else "Not specified"
-        resp_str = "\n".join(f"- {r}" for r in req.responsibilities[:6]) if req.responsibilities else "Not specified"
-
-        prompt = f"""You are an expert technical interviewer. Generate exactly 20 interview questions for this role.
-
-**Role:** {req.job_title}
-**Company:** {req.company}
-**Tech Stack:** {tech_str}
-**Requirements:**
-{reqs_str}
-**Responsibilities:**
-{resp_str}
-
-Generate a MIX of question types:
-- 10 Multiple Choice Questions (MCQ) — 4 options each, exactly one correct
-- 6 Short Answer Questions — need 1-3 sentence answers
-- 4 Coding Questions — small code problems solvable in 5-15 lines
-
-Return ONLY valid JSON array with this exact structure for each question:
-[
-  {{
-    "index": 0,
-    "type": "mcq",
-    "question": "What is...",
-    "options": ["A) ...", "B) ...", "C) ...", "D) ..."],
-    "correct_answer": "B) ...",
-    "topic": "Python",
-    "difficulty": "easy"
-  }},
-  {{
-    "index": 10,
-    "type": "short_answer",
-    "question": "Explain...",
-    "correct_answer": "Expected answer summary",
-    "topic": "System Design",
-    "difficulty": "medium"
-  }},
-  {{
-    "index": 16,
-    "type": "coding",
-    "question": "Write a function that...",
-    "correct_answer": "def solution():\\n    ...",
-    "topic": "Algorithms",
-    "difficulty": "medium"
-  }}
-]
-
-Rules:
-- Questions must be relevant to the tech stack and role
-- MCQ options must be plausible — no obviously wrong answers
-- Coding questions should be solvable in 5-15 lines
-- Difficulty spread: 6 easy, 8 medium, 6 hard
-- Index from 0 to 19
-- Topics should match the tech stack items"""
-
-        # Generate with retries (Gemini can 504 on complex prompts)
-        text = None
-        for attempt in range(3):
-            try:
-                response = client.model.generate_content(prompt, request_options={"timeout": 120})
-                text = response.text.strip()
-                break
-            except Exception as gen_err:
-                logger.warning(f"Quiz generation attempt {attempt+1} failed: {gen_err}")
-                if attempt < 2:
-                    import time
-                    time.sleep(2 * (attempt + 1))
-                else:
-                    raise gen_err
-
-        if not text:
-            raise HTTPException(status_code=500, detail="AI generation failed after retries")
-
-        if text.startswith("```"):
-            text = re.sub(r"^```\w*\n?", "", text)
-            text = re.sub(r"\n?```$", "", text)
-
-        questions = json.loads(text)
-
-        # Validate and fix indices
-        for i, q in enumerate(questions):
-            q["index"] = i
-
-        # Ensure we have exactly 20 (trim or pad)
-        questions = questions[:20]
+        questions = await _bank.assemble_quiz(
+            req.user_id, req.job_id, req.job_title, req.company,
+            req.tech_stack, req.requirements, req.responsibilities,
+        )
+        source = "bank"
+        if questions is None:
+            client = get_gemini_client()
+            if not client.model:
+                raise HTTPException(status_code=500, detail="AI not configured")
+
+            prompt = build_quiz_prompt(req.job_title, req.company, req.tech_stack,
+                                       req.requirements, req.responsibilities)
+            # 504s on complex prompts and 429s are retried by the LLM scheduler
+            text = (await client.generate_text(prompt, timeout=120)).strip()
+            if not text:
+                raise HTTPException(status_code=500, detail="AI returned an empty quiz")
+
+            questions = parse_questions(text)
+            # Bank the new questions for later quizzes; the session's copies get the banked rows' ids
+            await _bank.store(questions, _bank.tag(questions, req.job_id, req.job_title, req.company,
+                                                   req.tech_stack))
+            source = "ai"
 
         # Create session in DB
         session_id = str(uuid4())
@@ -175,6 +112,7 @@ Rules:
             "session_id": session_id,
             "questions": safe_questions,
             "total": len(safe_questions),
+            "source": source,
         }
 
     except json.JSONDecodeError as e:
@@ -187,9 +125,67 @@ Rules:
 
 # ─── Submit & Evaluate ────────────────────────────────────────
 
+async def _gemini_evaluate(text_questions: list[dict]) -> dict[int, dict]:
+    """Gemini verdicts for the answers the local grader couldn't decide, keyed by question index."""
+    def fallback(note: str) -> dict[int, dict]:
+        return {tq["index"]: {"is_correct": False, "feedback": note, "graded_by": "none"} for tq in text_questions}
+
+    try:
+        client = get_gemini_client()
+        if not client.model:
+            # No Gemini — mark text answers as needing review
+            return fallback("Could not evaluate — AI unavailable")
+
+        eval_items = []
+        for tq in text_questions:
+            eval_items.append(
+                f"Q{tq['index']} ({tq['type']}): {tq['question']}\n"
+                f"Expected: {tq['correct_answer']}\n"
+                f"Student answered: {tq['user_answer'] or '(skipped)'}"
+            )
+
+        eval_prompt = f"""You are grading interview answers. For each question below, evaluate the student's answer.
+
+{chr(10).join(eval_items)}
+
+Return ONLY valid JSON array — one object per question:
+[
+  {{
+    "index": 0,
+    "is_correct": true/false,
+    "score": 0 or 1,
+    "feedback": "Brief feedback on the answer (1-2 sentences)"
+  }}
+]
+
+Rules:
+- For short answers: correct if it captures the key concept, even if not word-for-word
+- For coding: correct if the logic is right, even if syntax is slightly off
+- Skipped answers are always wrong (score 0)
+- Be fair but not lenient — the answer must demonstrate understanding"""
+
+        eval_text = (await client.generate_text(eval_prompt, timeout=30)).strip()
+        if eval_text.startswith("```"):
+            eval_text = re.sub(r"^```\w*\n?", "", eval_text)
+            eval_text = re.sub(r"\n?```$", "", eval_text)
+
+        evaluations = json.loads(eval_text)
+        eval_map = {e["index"]: e for e in evaluations}
+    except Exception as e:
+        logger.warning(f"Gemini evaluation failed: {e}")
+        return fallback("Evaluation error")
+
+    verdicts = {}
+    for tq in text_questions:
+        ev = eval_map.get(tq["index"], {})
+        verdicts[tq["index"]] = {"is_correct": ev.get("is_correct", False), "feedback": ev.get("feedback", ""),
+                                 "graded_by": "ai"}
+    return verdicts
+
+
 @router.post("/submit")
 async def submit_quiz(req: SubmitQuizRequest):
-    """Submit answers, auto-grade MCQs, Gemini-evaluate text answers."""
+    """Submit answers, auto-grade MCQs, grade text answers locally where possible and with Gemini otherwise."""
     try:
         supabase = get_supabase()
         if not supabase:
@@ -258,98 +254,36 @@ async def submit_quiz(req: SubmitQuizRequest):
                     "correct_answer": correct_answer,
                     "user_answer": user_answer,
                     "topic": q.get("topic", ""),
+                    # Coding questions carry test cases for the local grader
+                    "function_name": q.get("function_name"),
+                    "tests": q.get("tests"),
                 })
 
-        # ─── Gemini-evaluate text/coding answers ───
+        # ─── Grade text/coding answers: local tier first, Gemini for the rest ───
         if text_questions:
-            try:
-                client = GeminiClient()
-                if client.model:
-                    eval_items = []
-                    for tq in text_questions:
-                        eval_items.append(
-                            f"Q{tq['index']} ({tq['type']}): {tq['question']}\n"
-                            f"Expected: {tq['correct_answer']}\n"
-                            f"Student answered: {tq['user_answer'] or '(skipped)'}"
-                        )
-
-                    eval_prompt = f"""You are grading interview answers. For each question below, evaluate the student's answer.
-
-{chr(10).join(eval_items)}
-
-Return ONLY valid JSON array — one object per question:
-[
-  {{
-    "index": 0,
-    "is_correct": true/false,
-    "score": 0 or 1,
-    "feedback": "Brief feedback on the answer (1-2 sentences)"
-  }}
-]
-
-Rules:
-- For short answers: correct if it captures the key concept, even if not word-for-word
-- For coding: correct if the logic is right, even if syntax is slightly off
-- Skipped answers are always wrong (score 0)
-- Be fair but not lenient — the answer must demonstrate understanding"""
-
-                    eval_response = client.model.generate_content(eval_prompt, request_options={"timeout": 30})
-                    eval_text = eval_response.text.strip()
-                    if eval_text.startswith("```"):
-                        eval_text = re.sub(r"^```\w*\n?", "", eval_text)
-                        eval_text = re.sub(r"\n?```$", "", eval_text)
-
-                    evaluations = json.loads(eval_text)
-                    eval_map = {e["index"]: e for e in evaluations}
-
-                    for tq in text_questions:
-                        ev = eval_map.get(tq["index"], {})
-                        is_correct = ev.get("is_correct", False)
-                        if is_correct:
-                            correct_count += 1
-                        elif tq["user_answer"]:
-                            wrong_count += 1
-                        else:
-                            wrong_count += 1
-
-                        feedback.append({
-                            "index": tq["index"],
-                            "type": tq["type"],
-                            "user_answer": tq["user_answer"],
-                            "correct_answer": tq["correct_answer"],
-                            "is_correct": is_correct,
-                            "skipped": not tq["user_answer"],
-                            "feedback": ev.get("feedback", ""),
-                            "topic": tq.get("topic", ""),
-                        })
+            verdicts = {i: {**v, "graded_by": "local"} for i, v in (await grade_answers(text_questions)).items()}
+            undecided = [tq for tq in text_questions if tq["index"] not in verdicts]
+            if undecided:
+                verdicts.update(await _gemini_evaluate(undecided))
+
+            for tq in text_questions:
+                verdict = verdicts[tq["index"]]
+                if verdict["is_correct"]:
+                    correct_count += 1
                 else:
-                    # No Gemini — mark text answers as needing review
-                    for tq in text_questions:
-                        wrong_count += 1
-                        feedback.append({
-                            "index": tq["index"],
-                            "type": tq["type"],
-                            "user_answer": tq["user_answer"],
-                            "correct_answer": tq["correct_answer"],
-                            "is_correct": False,
-                            "skipped": not tq["user_answer"],
-                            "feedback": "Could not evaluate — AI unavailable",
-                            "topic": tq.get("topic", ""),
-                        })
-            except Exception as e:
-                logger.warning(f"Gemini evaluation failed: {e}")
-                for tq in text_questions:
                     wrong_count += 1
-                    feedback.append({
-                        "index": tq["index"],
-                        "type": tq["type"],
-                        "user_answer": tq["user_answer"],
-                        "correct_answer": tq["correct_answer"],
-                        "is_correct": False,
-                        "skipped": not tq["user_answer"],
-                        "feedback": "Evaluation error",
-                        "topic": tq.get("topic", ""),
-                    })
+
+                feedback.append({
+                    "index": tq["index"],
+                    "type": tq["type"],
+                    "user_answer": tq["user_answer"],
+                    "correct_answer": tq["correct_answer"],
+                    "is_correct": verdict["is_correct"],
+                    "skipped": not tq["user_answer"],
+                    "feedback": verdict["feedback"],
+                    "graded_by": verdict["graded_by"],
+                    "topic": tq.get("topic", ""),
+                })
 
         # Sort feedback by index
         feedback.sort(key=lambda f: f["index"])
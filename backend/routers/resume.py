@@ -9,11 +9,11 @@ from pydantic import BaseModel
 from typing import List, Optional, Any, Dict
 
 try:
-    from utils.gemini_client import GeminiClient
-    from database import get_supabase
+    from ..utils.gemini_client import get_gemini_client
+    from ..database import get_supabase
 except ImportError:
-    from utils.gemini_client import GeminiClient
-    from database import get_supabase
+    from backend.utils.gemini_client import get_gemini_client
+    from backend.database import get_supabase
 
 router = APIRouter(prefix="/resume", tags=["Resume"])
 logger = logging.getLogger(__name__)
@@ -31,7 +31,7 @@ class TailorResumeRequest(BaseModel):
 async def tailor_resume(req: TailorResumeRequest):
     """Tailor a resume using Gemini to optimize for a specific job."""
     try:
-        client = GeminiClient()
+        client = get_gemini_client()
         if not client.model:
             raise HTTPException(status_code=500, detail="AI not configured")
 
@@ -82,8 +82,7 @@ Return the result as a raw JSON string matching the exact structure below:
 }}
 IMPORTANT: ONLY return the JSON. No markdown backticks, no markdown formatting. Keep the core information accurate to the user's original data, just optimize the phrasing and keywords. Make sure the output is valid JSON.
 """
-        response = client.model.generate_content(prompt, request_options={"timeout": 120})
-        text = response.text.strip()
+        text = (await client.generate_text(prompt, timeout=120)).strip()
         
         # Clean up any potential markdown formatting
         if text.startswith("```"):
@@ -132,6 +131,7 @@ IMPORTANT: ONLY return the JSON. No markdown backticks, no markdown formatting.
     except Exception as e:
         logger.error(f"Tailoring failed: {e}")
         error_str = str(e)
+        # Only reached once the LLM scheduler has exhausted its retries
         if "429" in error_str or "quota" in error_str.lower():
             raise HTTPException(status_code=429, detail="AI Rate Limit Exceeded: Please wait about a minute before generating another resume.")
         if "504" in error_str or "deadline" in error_str.lower():
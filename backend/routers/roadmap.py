@@ -1,8 +1,12 @@
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import Optional
-from database import get_supabase
-from utils.gemini_client import GeminiClient
+try:
+    from ..database import get_supabase
+    from ..utils.gemini_client import get_gemini_client
+except ImportError:
+    from backend.database import get_supabase
+    from backend.utils.gemini_client import get_gemini_client
 
 router = APIRouter()
 
@@ -29,8 +33,8 @@ async def generate_roadmap(request: RoadmapRequest):
     
     # 3. Call Gemini
     try:
-        client = GeminiClient()
-        roadmap_data = client.generate_roadmap(profile.get('resume_data', {}), request.goal)
+        client = get_gemini_client()
+        roadmap_data = await client.generate_roadmap(profile.get('resume_data', {}), request.goal)
         
         if "error" in roadmap_data:
             print(f"Roadmap Generation Error: {roadmap_data['error']}")
@@ -1,6 +1,5 @@
 from .base import BaseScraper
-import requests
-from bs4 import BeautifulSoup
+from .parsing import make_soup, LINKS
 from datetime import datetime
 import urllib3
 
@@ -23,12 +22,14 @@ class AictScraper(BaseScraper):
         print(f"Scraping AICTE: {url}")
         
         try:
-            response = requests.get(url, headers=self.headers, verify=False)
+            response = self.fetch(url, headers=self.headers, verify=False)
+            if response is None:
+                return
             if response.status_code != 200:
                 print(f"Failed to fetch AICTE: {response.status_code}")
                 return
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = make_soup(response.text, LINKS)
             
             # AICTE structure is complex and changes. 
             # We'll look for generic internship cards or list items.
@@ -74,6 +75,7 @@ class AictScraper(BaseScraper):
 
     def run(self):
         self.scrape_internships()
+        self.flush()
 
 if __name__ == "__main__":
     AictScraper().run()
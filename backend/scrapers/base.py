@@ -1,31 +1,400 @@
+import atexit
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date
+
+import requests
 from supabase import Client
 from backend.database import get_supabase
+from backend.services.job_features import compute_job_features, FEATURE_COLUMNS
+from .dates import extract_end_date
+from .scrape_state import get_state_store, body_hash, request_key
+
+# Buffered writer tuning (see .env.example)
+BATCH_SIZE = max(1, int(os.environ.get("SCRAPER_BATCH_SIZE", "100")))
+FLUSH_SECONDS = float(os.environ.get("SCRAPER_FLUSH_SECONDS", "5"))
+MAX_RETRIES = int(os.environ.get("SCRAPER_MAX_RETRIES", "3"))
+
+# Per-row content hashing (sql/012_incremental_scraping.sql)
+HASH_COLUMN = "content_hash"
+SEEN_COLUMN = "last_seen_at"                 # sql/016_last_seen.sql
+# Volatile: rewritten on every scrape (scrapers stamp posted_at with the scrape date)
+HASH_EXCLUDE = {"created_at", "posted_at", SEEN_COLUMN, HASH_COLUMN}
+HASH_LOOKUP_CHUNK = 50                       # urls per `url IN (...)` lookup
+
+
+def row_hash(row: dict) -> str:
+    content = {k: v for k, v in row.items() if k not in HASH_EXCLUDE}
+    return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+
+_SQLSTATE = re.compile(r"[0-9A-Z]{5}")
+# Connection, transaction rollback (deadlock / serialization), resources, operator intervention (timeouts)
+_TRANSIENT_SQLSTATE_CLASSES = ("08", "40", "53", "57")
+
+
+def is_transient(e: Exception) -> bool:
+    """
+    Whether a failed write is worth retrying. PostgREST errors carry a SQLSTATE,
+    a PGRST code or (for non-JSON gateway responses) the HTTP status as `code`:
+    bad columns and constraint violations fail the same way every time.
+    Network errors and anything unrecognised are treated as transient.
+    """
+    code = str(getattr(e, "code", None) or "")
+    if code.startswith("PGRST"):
+        return code.startswith("PGRST0")  # PGRST0xx: PostgREST can't reach the database
+    if code.isdigit() and len(code) == 3:
+        return code == "429" or code.startswith("5")
+    if _SQLSTATE.fullmatch(code):
+        return code[:2] in _TRANSIENT_SQLSTATE_CLASSES
+    return True
+
+
+class UpsertBuffer:
+    """
+    Collects rows for one table and upserts them in batches.
+    Rows are deduplicated on the conflict key within a batch (last write wins),
+    flushed when `batch_size` rows are pending or `flush_seconds` have passed
+    since the last flush. Chunks failing with a transient error are retried with
+    backoff; a chunk that still fails (or fails deterministically, e.g. a
+    constraint violation) is split in half so one bad row cannot sink the rest.
+    With `hash_column`, each row carries a content hash and rows whose stored
+    hash is unchanged are not written at all; with `seen_column` as well, such
+    rows only get that column bumped (one UPDATE per date) when it is stale.
+    `optional_columns` are groups of columns added by one migration; a group
+    is dropped for the rest of the run if the table rejects any of its columns.
+    Rows may be queued with an `owner` (the scraper that fetched them); rows
+    that finally fail are counted against their owners, whichever thread's
+    flush wrote them, and collected with take_failures().
+    The queue lock only covers adding rows and swapping out a batch; lookups,
+    upserts, backoff and bisection run outside it, so other sources keep
+    queueing while one thread writes. Counters have their own small lock.
+    """
+
+    def __init__(self, table: str, on_conflict: str = "url", batch_size: int = BATCH_SIZE,
+                 flush_seconds: float = FLUSH_SECONDS, max_retries: int = MAX_RETRIES,
+                 optional_columns: tuple[tuple[str, ...], ...] = (),
+                 hash_column: str | None = None, seen_column: str | None = None):
+        self.table = table
+        self.on_conflict = on_conflict
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.max_retries = max_retries
+        self.optional_columns = [set(group) for group in optional_columns]
+        self.hash_column = hash_column
+        self.seen_column = seen_column
+        self._dropped: set[str] = set()
+        self._pending: dict = {}
+        self._owners: dict = {}           # conflict key -> owners that queued it
+        self._owner_failures: dict = {}   # owner -> failed rows not yet collected
+        self._in_flight: dict = {}        # owner -> flushes still writing its rows
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()               # _pending, _owners, _last_flush
+        self._stats_lock = threading.Lock()         # stats, _owner_failures, _in_flight, _dropped
+        self._written = threading.Condition(self._stats_lock)
+        self.stats = {"queued": 0, "deduplicated": 0, "unchanged": 0, "touched": 0, "written": 0, "failed": 0,
+                      "batches": 0, "retries": 0, "write_seconds": 0.0}
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def add(self, row: dict, client: Client, owner=None):
+        with self._lock:
+            key = row.get(self.on_conflict)
+            duplicate = key in self._pending
+            self._pending[key] = row
+            if owner is not None:
+                self._owners.setdefault(key, set()).add(owner)
+            due = len(self._pending) >= self.batch_size or \
+                time.monotonic() - self._last_flush >= self.flush_seconds
+        self._count(queued=1, deduplicated=int(duplicate))
+        if due:
+            self.flush(client)
+
+    def flush(self, client: Client):
+        with self._lock:
+            rows = list(self._pending.values())
+            owners, self._owners = self._owners, {}
+            self._pending = {}
+            self._last_flush = time.monotonic()
+        batch_owners = set().union(*owners.values())
+        with self._stats_lock:
+            for owner in batch_owners:
+                self._in_flight[owner] = self._in_flight.get(owner, 0) + 1
+        try:
+            for i in range(0, len(rows), self.batch_size):
+                self._write(client, rows[i:i + self.batch_size], owners)
+        finally:
+            with self._written:
+                for owner in batch_owners:
+                    self._in_flight[owner] -= 1
+                    if not self._in_flight[owner]:
+                        del self._in_flight[owner]
+                self._written.notify_all()
+
+    def take_failures(self, owner) -> int:
+        """Rows queued by `owner` that failed to write since the last call; waits for flushes still writing them."""
+        with self._written:
+            self._written.wait_for(lambda: owner not in self._in_flight)
+            return self._owner_failures.pop(owner, 0)
+
+    def _count(self, **deltas):
+        with self._stats_lock:
+            for name, delta in deltas.items():
+                self.stats[name] += delta
+
+    def _drop_rejected(self, error: str) -> set[str]:
+        """Drop the optional column group(s) named in a PostgREST error; returns the dropped columns."""
+        dropped = set()
+        with self._stats_lock:
+            for group in self.optional_columns:
+                if not group & self._dropped and any(c in error for c in group):
+                    print(f"{self.table}: dropping unsupported columns {sorted(group)} (migration not applied?)")
+                    dropped |= group
+            self._dropped |= dropped
+        return dropped
+
+    def _skip_unchanged(self, client: Client, rows: list[dict]) -> list[dict]:
+        """Stamp content hashes and drop rows whose stored hash matches."""
+        if not self.hash_column or self.hash_column in self._dropped:
+            return rows
+        for row in rows:
+            row[self.hash_column] = row_hash(row)
+
+        seen = self.seen_column if self.seen_column and self.seen_column not in self._dropped else None
+        columns = ",".join(filter(None, (self.on_conflict, self.hash_column, seen)))
+        stored = {}
+        keys = [row.get(self.on_conflict) for row in rows]
+        try:
+            for i in range(0, len(keys), HASH_LOOKUP_CHUNK):
+                r = client.table(self.table) \
+                    .select(columns) \
+                    .in_(self.on_conflict, keys[i:i + HASH_LOOKUP_CHUNK]) \
+                    .execute()
+                stored.update({x[self.on_conflict]: x for x in r.data or []})
+        except Exception as e:
+            if not self._drop_rejected(str(e)):
+                print(f"{self.table}: content hash lookup failed ({e}); writing all rows")
+            return rows
+
+        changed, stale = [], {}
+        for row in rows:
+            key = row.get(self.on_conflict)
+            previous = stored.get(key) or {}
+            if previous.get(self.hash_column) != row[self.hash_column]:
+                changed.append(row)
+            elif seen and row.get(seen) and str(previous.get(seen) or "") < str(row[seen]):
+                stale.setdefault(row[seen], []).append(key)
+        self._count(unchanged=len(rows) - len(changed))
+        for value, stale_keys in stale.items():
+            self._touch(client, seen, value, stale_keys)
+        return changed
+
+    def _touch(self, client: Client, column: str, value, keys: list):
+        """Set `column` on existing unchanged rows without rewriting them."""
+        try:
+            for i in range(0, len(keys), HASH_LOOKUP_CHUNK):
+                chunk = keys[i:i + HASH_LOOKUP_CHUNK]
+                client.table(self.table).update({column: value}).in_(self.on_conflict, chunk).execute()
+                self._count(touched=len(chunk))
+        except Exception as e:
+            if not self._drop_rejected(str(e)):
+                print(f"{self.table}: failed to update {column} ({e})")
+
+    def _write(self, client: Client, rows: list[dict], owners: dict):
+        rows = self._skip_unchanged(client, rows)
+        # PostgREST bulk upserts need one column set per request; rows with missing
+        # keys would otherwise overwrite existing values with NULL
+        shapes: dict[frozenset, list[dict]] = {}
+        for row in rows:
+            row = {k: v for k, v in row.items() if k not in self._dropped}
+            shapes.setdefault(frozenset(row), []).append(row)
+        for chunk in shapes.values():
+            self._write_chunk(client, chunk, owners)
+
+    def _write_chunk(self, client: Client, chunk: list[dict], owners: dict):
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            try:
+                client.table(self.table).upsert(chunk, on_conflict=self.on_conflict).execute()
+                self._count(write_seconds=time.perf_counter() - started, written=len(chunk), batches=1)
+                return
+            except Exception as e:
+                self._count(write_seconds=time.perf_counter() - started)
+                error = str(e)
+                dropped = self._drop_rejected(error)
+                if dropped:
+                    chunk = [{k: v for k, v in row.items() if k not in dropped} for row in chunk]
+                    continue
+                if not is_transient(e):
+                    break  # bisect right away; retrying a bad row only sleeps
+                if attempt < self.max_retries:
+                    self._count(retries=1)
+                    time.sleep(0.5 * 2 ** attempt)
+
+        if len(chunk) > 1:
+            mid = len(chunk) // 2
+            self._write_chunk(client, chunk[:mid], owners)
+            self._write_chunk(client, chunk[mid:], owners)
+        else:
+            with self._stats_lock:
+                self.stats["failed"] += 1
+                for owner in owners.get(chunk[0].get(self.on_conflict), ()):
+                    self._owner_failures[owner] = self._owner_failures.get(owner, 0) + 1
+            print(f"Error saving {self.table} row {chunk[0].get(self.on_conflict)}: {error}")
+
+    def report(self) -> str:
+        s = self.stats
+        rate = s["written"] / s["write_seconds"] if s["write_seconds"] else 0.0
+        return (f"{self.table}: {s['written']} rows upserted in {s['batches']} batches "
+                f"({rate:.0f} rows/s, {s['unchanged']} unchanged skipped, {s['touched']} marked seen, "
+                f"{s['deduplicated']} duplicates merged, {s['retries']} retries, {s['failed']} failed)")
+
+
+# Shared per table, so nested scrapers (JobScraper → InternshalaScraper, ...) batch together
+_buffers = {
+    "jobs": UpsertBuffer("jobs", optional_columns=(FEATURE_COLUMNS, (HASH_COLUMN,), (SEEN_COLUMN,)),
+                         hash_column=HASH_COLUMN, seen_column=SEEN_COLUMN),
+    "hackathons": UpsertBuffer("hackathons", optional_columns=(("ends_on",), (HASH_COLUMN,)),
+                               hash_column=HASH_COLUMN),
+}
+
+
+def get_buffers() -> dict[str, UpsertBuffer]:
+    return _buffers
+
+
+def flush_all():
+    """Flush every buffer (also registered at interpreter exit)."""
+    if not any(buffer.pending for buffer in _buffers.values()):
+        return
+    client = get_supabase()
+    if not client:
+        return
+    for buffer in _buffers.values():
+        buffer.flush(client)
+
+
+atexit.register(flush_all)
+
+_row_counts = threading.local()
+
+
+@contextmanager
+def count_saved_rows():
+    """Count rows queued by save_job/save_hackathon on this thread (per-source stats)."""
+    counts = {"jobs": 0, "hackathons": 0}
+    _row_counts.counts = counts
+    try:
+        yield counts
+    finally:
+        _row_counts.counts = None
+
+
+def _count_row(table: str):
+    counts = getattr(_row_counts, "counts", None)
+    if counts is not None:
+        counts[table] += 1
+
 
 class BaseScraper:
     def __init__(self):
         self.supabase: Client = get_supabase()
         if not self.supabase:
             raise ValueError("Supabase credentials not found or client failed to initialize.")
+        # Validators of pages fetched by this scraper, saved once their rows are written
+        self._fetched_state: list[dict] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+    def fetch(self, url, method="GET", json_body=None, **kwargs):
+        """
+        Conditional HTTP request for a scrape page.
+        Sends If-None-Match / If-Modified-Since from the last successful scrape and
+        returns None if the server answers 304 or the body hash is unchanged, so
+        the caller can skip parsing. Other responses are returned as-is.
+        Set SCRAPER_FORCE=1 to always re-parse.
+        """
+        key = request_key(url, json_body)
+        previous = get_state_store().get(self.supabase, key)
+        headers = dict(kwargs.pop("headers", None) or {})
+        if previous and method == "GET":
+            if previous.get("etag"):
+                headers["If-None-Match"] = previous["etag"]
+            if previous.get("last_modified"):
+                headers["If-Modified-Since"] = previous["last_modified"]
+
+        kwargs.setdefault("timeout", 30)
+        response = requests.request(method, url, headers=headers, json=json_body, **kwargs)
+        if response.status_code == 304:
+            print(f"  Unchanged (304): {url}")
+            return None
+        if response.status_code != 200:
+            return response
+
+        digest = body_hash(response.content)
+        if previous and previous.get("body_hash") == digest:
+            print(f"  Unchanged (same content): {url}")
+            return None
+        self._fetched_state.append({
+            "url": key,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "body_hash": digest,
+        })
+        return response
 
     def save_job(self, job_data):
         """
-        Upsert a job into the database.
-        job_data: dict with keys matching the jobs table columns
+        Queue a job for a batched upsert (on url).
+        job_data: dict with keys matching the jobs table columns.
+        Precomputed features (services/job_features.py) and `last_seen_at`
+        (the liveness date /db/jobs filters on) are added here.
         """
         try:
-            # Upsert based on URL to avoid duplicates
-            data, count = self.supabase.table("jobs").upsert(job_data, on_conflict="url").execute()
-            print(f"Saved job: {job_data.get('title')} at {job_data.get('company')}")
+            job_data = {**job_data, **compute_job_features(job_data), SEEN_COLUMN: date.today().isoformat()}
+            _buffers["jobs"].add(job_data, self.supabase, owner=self)
+            _count_row("jobs")
         except Exception as e:
             print(f"Error saving job: {e}")
 
     def save_hackathon(self, hackathon_data):
         """
-        Upsert a hackathon into the database.
-        hackathon_data: dict with keys matching the hackathons table columns
+        Queue a hackathon for a batched upsert (on url).
+        hackathon_data: dict with keys matching the hackathons table columns.
+        `ends_on` is derived from `dates` here so cleanup can delete by range.
         """
         try:
-            data, count = self.supabase.table("hackathons").upsert(hackathon_data, on_conflict="url").execute()
-            print(f"Saved hackathon: {hackathon_data.get('name')}")
+            ends_on = extract_end_date(hackathon_data.get("dates"))
+            hackathon_data = {**hackathon_data, "ends_on": ends_on.isoformat() if ends_on else None}
+            _buffers["hackathons"].add(hackathon_data, self.supabase, owner=self)
+            _count_row("hackathons")
         except Exception as e:
             print(f"Error saving hackathon: {e}")
+
+    def flush(self):
+        """
+        Write everything still buffered and print per-table throughput.
+        Page validators from fetch() are saved only if none of this scraper's
+        rows failed (other sources share the buffers and may have flushed
+        them), so a page whose rows were not stored is re-parsed next time.
+        """
+        failed = 0
+        for buffer in _buffers.values():
+            buffer.flush(self.supabase)
+            failed += buffer.take_failures(self)
+            if buffer.stats["queued"]:
+                print(buffer.report())
+        if not failed:
+            get_state_store().commit(self.supabase, self._fetched_state)
+        self._fetched_state = []
@@ -0,0 +1,63 @@
+"""Event date parsing shared by the hackathon scrapers and the writer in base.py."""
+
+import re
+from datetime import date
+
+
+def extract_end_date(dates_str):
+    """Try to extract an end date from a dates string. Returns a date or None."""
+    if not dates_str:
+        return None
+    s = str(dates_str).strip()
+
+    # Skip things that are clearly ongoing/future
+    s_lower = s.lower()
+    if any(kw in s_lower for kw in ["rolling", "ongoing", "upcoming", "open", "always", "cohorts"]):
+        return None  # Treat as always-valid
+
+    # Try to find ISO dates like 2025-04-15
+    iso_dates = re.findall(r'(\d{4})-(\d{2})-(\d{2})', s)
+    if iso_dates:
+        last = iso_dates[-1]  # Use the last (end) date
+        try:
+            return date(int(last[0]), int(last[1]), int(last[2]))
+        except ValueError:
+            pass
+
+    # Try "Month YYYY" patterns like "Aug 2025", "October 2025"
+    month_map = {
+        "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+        "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12
+    }
+    month_year = re.findall(r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\w*\s+(\d{4})', s, re.IGNORECASE)
+    if month_year:
+        year = int(month_year[-1])
+        # Find the month name before this year
+        months_found = re.findall(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)', s, re.IGNORECASE)
+        if months_found:
+            m = month_map.get(months_found[-1][:3].lower())
+            if m and year:
+                try:
+                    # End of the month
+                    if m == 12:
+                        return date(year, 12, 31)
+                    return date(year, m + 1, 1)
+                except ValueError:
+                    return date(year, m, 28)
+
+    # Try just a year like "2025"
+    years = re.findall(r'(\d{4})', s)
+    if years:
+        last_year = int(years[-1])
+        if last_year >= 2020:
+            return date(last_year, 12, 31)
+
+    return None
+
+
+def is_past_event(dates_str):
+    """Returns True if the event has definitely ended."""
+    end = extract_end_date(dates_str)
+    if end is None:
+        return False  # Can't determine — keep it
+    return end < date.today()
@@ -1,69 +1,10 @@
 from .base import BaseScraper
-import requests
-from bs4 import BeautifulSoup
+from .parsing import make_soup, LINKS
 from datetime import datetime, date
-import re
-from .unstop import UnstopScraper
-from .hackerearth import HackerEarthScraper
+from .dates import is_past_event
 
-
-def extract_end_date(dates_str):
-    """Try to extract an end date from a dates string. Returns a date or None."""
-    if not dates_str:
-        return None
-    s = str(dates_str).strip()
-
-    # Skip things that are clearly ongoing/future
-    s_lower = s.lower()
-    if any(kw in s_lower for kw in ["rolling", "ongoing", "upcoming", "open", "always", "cohorts"]):
-        return None  # Treat as always-valid
-
-    # Try to find ISO dates like 2025-04-15
-    iso_dates = re.findall(r'(\d{4})-(\d{2})-(\d{2})', s)
-    if iso_dates:
-        last = iso_dates[-1]  # Use the last (end) date
-        try:
-            return date(int(last[0]), int(last[1]), int(last[2]))
-        except ValueError:
-            pass
-
-    # Try "Month YYYY" patterns like "Aug 2025", "October 2025"
-    month_map = {
-        "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
-        "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12
-    }
-    month_year = re.findall(r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\w*\s+(\d{4})', s, re.IGNORECASE)
-    if month_year:
-        year = int(month_year[-1])
-        # Find the month name before this year
-        months_found = re.findall(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)', s, re.IGNORECASE)
-        if months_found:
-            m = month_map.get(months_found[-1][:3].lower())
-            if m and year:
-                try:
-                    # End of the month
-                    if m == 12:
-                        return date(year, 12, 31)
-                    return date(year, m + 1, 1)
-                except ValueError:
-                    return date(year, m, 28)
-
-    # Try just a year like "2025"
-    years = re.findall(r'(\d{4})', s)
-    if years:
-        last_year = int(years[-1])
-        if last_year >= 2020:
-            return date(last_year, 12, 31)
-
-    return None
-
-
-def is_past_event(dates_str):
-    """Returns True if the event has definitely ended."""
-    end = extract_end_date(dates_str)
-    if end is None:
-        return False  # Can't determine — keep it
-    return end < date.today()
+# Max ids per `id IN (...)` delete (keeps the request URL short)
+CLEANUP_CHUNK = 200
 
 
 class HackathonScraper(BaseScraper):
@@ -90,12 +31,14 @@ class HackathonScraper(BaseScraper):
         ]:
             print(f"Scraping MLH: {season_url}")
             try:
-                response = requests.get(season_url, headers=self.headers, timeout=15)
+                response = self.fetch(season_url, headers=self.headers, timeout=15)
+                if response is None:
+                    continue
                 if response.status_code != 200:
                     print(f"  Failed: {response.status_code}")
                     continue
 
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = make_soup(response.text)
 
                 # Try known selectors
                 events = soup.find_all('div', class_='event-wrapper')
@@ -174,10 +117,12 @@ class HackathonScraper(BaseScraper):
                 "size": 30,
                 "from": 0,
             }
-            response = requests.post(url, json=payload, headers={
+            response = self.fetch(url, method="POST", json_body=payload, headers={
                 **self.headers,
                 'Content-Type': 'application/json',
             }, timeout=15)
+            if response is None:
+                return
 
             if response.status_code != 200:
                 print(f"  Devfolio API status: {response.status_code}")
@@ -219,10 +164,10 @@ class HackathonScraper(BaseScraper):
     def _scrape_devfolio_html(self):
         """Fallback: scrape Devfolio discover page."""
         try:
-            r = requests.get("https://devfolio.co/hackathons", headers=self.headers, timeout=15)
-            if r.status_code != 200:
+            r = self.fetch("https://devfolio.co/hackathons", headers=self.headers, timeout=15)
+            if r is None or r.status_code != 200:
                 return
-            soup = BeautifulSoup(r.text, 'html.parser')
+            soup = make_soup(r.text, LINKS)
             links = soup.find_all('a', href=True)
             for link in links:
                 href = link['href']
@@ -381,55 +326,38 @@ class HackathonScraper(BaseScraper):
             self.save_hackathon(item)
 
     def cleanup_past_events(self):
-        """Remove past events from the hackathons table."""
+        """
+        Remove past events from the hackathons table.
+        Rows with an `ends_on` date (set at write time) go in one range delete;
+        legacy rows without it are parsed in one pass and removed with one
+        `id IN (...)` delete per chunk.
+        """
         print("Cleaning up past events from DB...")
+        today = date.today().isoformat()
+        removed = 0
         try:
-            r = self.supabase.table("hackathons").select("id,name,dates").execute()
-            rows = r.data or []
-            removed = 0
-            for row in rows:
-                if is_past_event(row.get("dates")):
-                    try:
-                        self.supabase.table("hackathons").delete().eq("id", row["id"]).execute()
-                        print(f"  Removed past event: {row['name']} ({row.get('dates')})")
-                        removed += 1
-                    except Exception as e:
-                        print(f"  Error removing {row['name']}: {e}")
+            try:
+                r = self.supabase.table("hackathons").delete().lt("ends_on", today).execute()
+                removed += len(r.data or [])
+                legacy = self.supabase.table("hackathons").select("id,dates").is_("ends_on", "null").execute()
+            except Exception as e:
+                if "ends_on" not in str(e):
+                    raise
+                # sql/011 not applied yet: every row is legacy
+                legacy = self.supabase.table("hackathons").select("id,dates").execute()
+
+            past_ids = [row["id"] for row in legacy.data or [] if is_past_event(row.get("dates"))]
+            for i in range(0, len(past_ids), CLEANUP_CHUNK):
+                r = self.supabase.table("hackathons").delete().in_("id", past_ids[i:i + CLEANUP_CHUNK]).execute()
+                removed += len(r.data or [])
             print(f"  Cleanup complete: removed {removed} past events")
         except Exception as e:
             print(f"  Cleanup error: {e}")
 
     def run(self):
-        # 0. Clean up past events first
-        self.cleanup_past_events()
-
-        # 1. MLH
-        self.scrape_mlh()
-
-        # 2. Unstop
-        try:
-            UnstopScraper().scrape_hackathons()
-        except Exception as e:
-            print(f"Error running Unstop scraper: {e}")
-
-        # 3. HackerEarth
-        try:
-            HackerEarthScraper().run()
-        except Exception as e:
-            print(f"Error running HackerEarth scraper: {e}")
-
-        # 4. Devfolio
-        try:
-            self.scrape_devfolio()
-        except Exception as e:
-            print(f"Error running Devfolio scraper: {e}")
-
-        # 5. Curated programs
-        try:
-            self.add_curated_programs()
-        except Exception as e:
-            print(f"Error adding curated programs: {e}")
-
+        """Clean up past events, then run every hackathon source concurrently (see orchestrator.py)."""
+        from .orchestrator import run_scrape
+        run_scrape(("hackathons",))
 
 if __name__ == "__main__":
     HackathonScraper().run()
@@ -1,6 +1,5 @@
 from .base import BaseScraper
-import requests
-from bs4 import BeautifulSoup
+from .parsing import make_soup, HACKEREARTH_CARDS
 from datetime import datetime
 import time
 import random
@@ -18,12 +17,14 @@ class HackerEarthScraper(BaseScraper):
         print(f"Scraping HackerEarth: {url}")
         
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.fetch(url, headers=self.headers)
+            if response is None:
+                return
             if response.status_code != 200:
                 print(f"Failed to fetch HackerEarth: {response.status_code}")
                 return
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = make_soup(response.text, HACKEREARTH_CARDS)
             # Try specific modern card class first, then generic
             cards = soup.find_all('div', class_='challenge-card-modern')
             if not cards:
@@ -98,6 +99,7 @@ class HackerEarthScraper(BaseScraper):
 
     def run(self):
         self.scrape_hackathons()
+        self.flush()
 
 if __name__ == "__main__":
     HackerEarthScraper().run()
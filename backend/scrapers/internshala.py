@@ -1,6 +1,5 @@
 from .base import BaseScraper
-import requests
-from bs4 import BeautifulSoup
+from .parsing import make_soup, INTERNSHALA_LISTING
 from datetime import datetime
 import time
 import random
@@ -19,12 +18,14 @@ class InternshalaScraper(BaseScraper):
             # Add random delay
             time.sleep(random.uniform(1, 3))
             
-            response = requests.get(url, headers=self.headers)
+            response = self.fetch(url, headers=self.headers)
+            if response is None:
+                return
             if response.status_code != 200:
                 print(f"Failed to fetch {url}: {response.status_code}")
                 return
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = make_soup(response.text, INTERNSHALA_LISTING)
             containers = soup.find_all('div', class_='individual_internship')
             
             print(f"Found {len(containers)} items.")
@@ -128,6 +129,7 @@ class InternshalaScraper(BaseScraper):
         self.scrape_url("https://internshala.com/internships/computer-science-internship/", "Internship")
         # Jobs (Junior/Fresher)
         self.scrape_url("https://internshala.com/jobs/computer-science-jobs/", "Job")
+        self.flush()
 
 if __name__ == "__main__":
     InternshalaScraper().run()
@@ -1,8 +1,4 @@
 from .base import BaseScraper
-from .internshala import InternshalaScraper
-from .linkedin import LinkedInScraper
-from .unstop import UnstopScraper
-from .aicte import AictScraper
 import requests
 from bs4 import BeautifulSoup
 import time
@@ -96,35 +92,10 @@ class JobScraper(BaseScraper):
             self.save_job(job_data)
 
     def run(self):
+        """Run every job source concurrently (see orchestrator.py)."""
+        from .orchestrator import run_scrape
         print("Starting Job Scraping Pipeline...")
-        
-        # 1. VikashPR (Research Interns)
-        self.scrape_vikash_india()
-        
-        # 2. Internshala (Internships & Jobs)
-        try:
-            InternshalaScraper().run()
-        except Exception as e:
-            print(f"Error running Internshala scraper: {e}")
-
-        # 3. LinkedIn (Guest Search)
-        try:
-            LinkedInScraper().run()
-        except Exception as e:
-            print(f"Error running LinkedIn scraper: {e}")
-
-        # 4. Unstop (Jobs)
-        try:
-            UnstopScraper().scrape_jobs()
-        except Exception as e:
-            print(f"Error running Unstop Jobs scraper: {e}")
-
-        # 5. AICTE (Govt Internships)
-        try:
-            AictScraper().run()
-        except Exception as e:
-            print(f"Error running AICTE scraper: {e}")
-            
+        run_scrape(("jobs",))
         print("Job Scraping Pipeline Completed.")
 
 if __name__ == "__main__":
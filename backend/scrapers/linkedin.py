@@ -1,6 +1,5 @@
 from .base import BaseScraper
-import requests
-from bs4 import BeautifulSoup
+from .parsing import make_soup
 from datetime import datetime
 import time
 import random
@@ -22,12 +21,14 @@ class LinkedInScraper(BaseScraper):
         print(f"Scraping LinkedIn Guest: {url}")
         
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.fetch(url, headers=self.headers)
+            if response is None:
+                return
             if response.status_code != 200:
                 print(f"Failed to fetch LinkedIn: {response.status_code}")
                 return
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = make_soup(response.text)
             
             # Cards are usually 'li' with class 'base-card' or div 'job-search-card'
             # Based on verification dump: <div class="base-card ...">
@@ -85,6 +86,7 @@ class LinkedInScraper(BaseScraper):
 
     def run(self):
         self.scrape_guest_jobs()
+        self.flush()
 
 if __name__ == "__main__":
     LinkedInScraper().run()
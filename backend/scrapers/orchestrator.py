@@ -0,0 +1,221 @@
+"""
+Scrape Orchestrator — runs scraper sources concurrently, off the request path.
+Sources run on a thread pool (SCRAPER_MAX_WORKERS); sources that hit the same
+site share a per-site limit. Each run is tracked as a ScrapeJob with
+per-source status, duration and row counts.
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable
+
+from .base import count_saved_rows, flush_all
+
+MAX_WORKERS = max(1, int(os.environ.get("SCRAPER_MAX_WORKERS", "4")))
+
+# Concurrent sources allowed per site (default 1: be polite to each host)
+SITE_LIMITS = {"local": 4}
+
+# Finished jobs kept for the status endpoint
+MAX_TRACKED_JOBS = 20
+
+KINDS = ("jobs", "hackathons")
+
+
+@dataclass
+class Source:
+    name: str
+    kind: str                   # "jobs" | "hackathons"
+    site: str                   # sources with the same site share SITE_LIMITS
+    run: Callable[[], None]
+
+
+def _sources() -> list[Source]:
+    from .jobs import JobScraper
+    from .internshala import InternshalaScraper
+    from .linkedin import LinkedInScraper
+    from .unstop import UnstopScraper
+    from .aicte import AictScraper
+    from .hackathons import HackathonScraper
+    from .hackerearth import HackerEarthScraper
+
+    def call(scraper_cls, method):
+        # The context manager flushes the scraper's rows and page state when it exits
+        def run():
+            with scraper_cls() as scraper:
+                getattr(scraper, method)()
+        return run
+
+    return [
+        # Jobs
+        Source("vikash_india", "jobs", "github", call(JobScraper, "scrape_vikash_india")),
+        Source("internshala", "jobs", "internshala", call(InternshalaScraper, "run")),
+        Source("linkedin", "jobs", "linkedin", call(LinkedInScraper, "run")),
+        Source("unstop_jobs", "jobs", "unstop", call(UnstopScraper, "scrape_jobs")),
+        Source("aicte", "jobs", "aicte", call(AictScraper, "run")),
+        # Hackathons
+        Source("mlh", "hackathons", "mlh", call(HackathonScraper, "scrape_mlh")),
+        Source("unstop_hackathons", "hackathons", "unstop", call(UnstopScraper, "scrape_hackathons")),
+        Source("hackerearth", "hackathons", "hackerearth", call(HackerEarthScraper, "run")),
+        Source("devfolio", "hackathons", "devfolio", call(HackathonScraper, "scrape_devfolio")),
+        Source("curated", "hackathons", "local", call(HackathonScraper, "add_curated_programs")),
+    ]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass
+class ScrapeJob:
+    kinds: tuple[str, ...]
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    status: str = "queued"      # queued → running → completed | failed
+    created_at: str = field(default_factory=_now)
+    started_at: str | None = None
+    finished_at: str | None = None
+    duration_s: float | None = None
+    sources: dict = field(default_factory=dict)   # filled in before the job is published
+    error: str | None = None
+    # Source entries are updated by pool threads while the status endpoint reads them
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def update_source(self, name: str, **values):
+        with self._lock:
+            self.sources[name].update(values)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            sources = {name: dict(s) for name, s in self.sources.items()}
+        rows = {"jobs": 0, "hackathons": 0}
+        for s in sources.values():
+            for table, n in s.get("rows", {}).items():
+                rows[table] += n
+        return {
+            "job_id": self.id,
+            "kinds": list(self.kinds),
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_s": self.duration_s,
+            "rows": rows,
+            "sources": sources,
+            "error": self.error,
+        }
+
+
+_jobs: "OrderedDict[str, ScrapeJob]" = OrderedDict()
+_jobs_lock = threading.Lock()
+
+
+def _register(job: ScrapeJob):
+    """Track a job, dropping the oldest finished ones. Caller holds _jobs_lock."""
+    _jobs[job.id] = job
+    while len(_jobs) > MAX_TRACKED_JOBS:
+        oldest = next(iter(_jobs))
+        if _jobs[oldest].status in ("queued", "running"):
+            break
+        _jobs.pop(oldest)
+
+
+def get_job(job_id: str) -> ScrapeJob | None:
+    with _jobs_lock:
+        return _jobs.get(job_id)
+
+
+def list_jobs() -> list[ScrapeJob]:
+    """Tracked jobs, newest first."""
+    with _jobs_lock:
+        return list(reversed(_jobs.values()))
+
+
+def _run_source(job: ScrapeJob, source: Source, site_limits: dict[str, threading.Semaphore]):
+    with site_limits[source.site]:
+        job.update_source(source.name, status="running")
+        started = time.perf_counter()
+        result = {"status": "ok"}
+        try:
+            with count_saved_rows() as counts:
+                source.run()
+        except Exception as e:
+            result = {"status": "error", "error": str(e)}
+            print(f"Error running {source.name} scraper: {e}")
+        job.update_source(source.name, **result, duration_s=round(time.perf_counter() - started, 2),
+                          rows={k: v for k, v in counts.items() if v})
+
+
+def _new_job(kinds: tuple[str, ...]) -> tuple[ScrapeJob, list[Source]]:
+    """A job with its per-source entries in place, so it can be published before it runs."""
+    sources = [s for s in _sources() if s.kind in kinds]
+    job = ScrapeJob(kinds=kinds, sources={s.name: {"kind": s.kind, "status": "queued"} for s in sources})
+    return job, sources
+
+
+def _execute(job: ScrapeJob, sources: list[Source]):
+    job.status = "running"
+    job.started_at = _now()
+    started = time.perf_counter()
+    try:
+        if "hackathons" in job.kinds:
+            from .hackathons import HackathonScraper
+            HackathonScraper().cleanup_past_events()
+
+        site_limits = {s.site: threading.Semaphore(SITE_LIMITS.get(s.site, 1)) for s in sources}
+
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="scrape") as pool:
+            for future in [pool.submit(_run_source, job, s, site_limits) for s in sources]:
+                future.result()
+
+        flush_all()
+        job.status = "completed"
+    except Exception as e:
+        job.status = "failed"
+        job.error = str(e)
+        print(f"Scrape job {job.id} failed: {e}")
+    job.duration_s = round(time.perf_counter() - started, 2)
+    job.finished_at = _now()
+
+    summary = ", ".join(
+        f"{name}={s['status']} {s.get('duration_s', 0)}s {sum(s.get('rows', {}).values())} rows"
+        for name, s in job.sources.items()
+    )
+    print(f"Scrape job {job.id} {job.status} in {job.duration_s}s: {summary}")
+
+
+def _validate(kinds) -> tuple[str, ...]:
+    kinds = tuple(k for k in KINDS if k in kinds)
+    if not kinds:
+        raise ValueError(f"kinds must include one of {KINDS}")
+    return kinds
+
+
+def run_scrape(kinds=KINDS) -> ScrapeJob:
+    """Run a scrape synchronously (CLI / scraper run() methods)."""
+    job, sources = _new_job(_validate(kinds))
+    with _jobs_lock:
+        _register(job)
+    _execute(job, sources)
+    return job
+
+
+def start_scrape(kinds=KINDS) -> ScrapeJob:
+    """
+    Start a scrape in a background thread and return its job immediately.
+    If a queued/running job already covers these kinds, that job is returned instead.
+    """
+    kinds = _validate(kinds)
+    job, sources = _new_job(kinds)
+    with _jobs_lock:
+        for running in _jobs.values():
+            if running.status in ("queued", "running") and set(kinds) <= set(running.kinds):
+                return running
+        _register(job)
+    threading.Thread(target=_execute, args=(job, sources), name=f"scrape-{job.id}", daemon=True).start()
+    return job
@@ -0,0 +1,54 @@
+"""
+HTML Parsing — builds BeautifulSoup trees for the scrapers and job_detail.
+Uses lxml when it is installed (set HTML_PARSER to override) and, for pages
+whose callers only read a few containers, a SoupStrainer so only those
+subtrees are built. Selectors written against full trees keep working as
+long as they stay inside the strained containers.
+"""
+
+import os
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+
+def _default_parser() -> str:
+    configured = os.environ.get("HTML_PARSER")
+    if configured:
+        return configured
+    try:
+        import lxml  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+
+PARSER = _default_parser()
+
+
+def class_token(*names: str):
+    """
+    Attribute matcher for SoupStrainer: true if any of `names` is one of the
+    element's classes. (While parsing, a strainer sees the raw class string, so
+    class_="x" would miss class="x y".)
+    """
+    wanted = set(names)
+
+    def match(value) -> bool:
+        if not value:
+            return False
+        tokens = value.split() if isinstance(value, str) else value
+        return not wanted.isdisjoint(tokens)
+
+    return match
+
+
+# Pages whose scrapers only read these elements and their descendants
+INTERNSHALA_LISTING = SoupStrainer("div", class_=class_token("individual_internship"))
+HACKEREARTH_CARDS = SoupStrainer("div", class_=class_token("challenge-card-modern", "challenge-card"))
+LINKS = SoupStrainer("a", href=True)
+
+
+def make_soup(markup: str | bytes, parse_only: SoupStrainer | None = None,
+              parser: str | None = None) -> BeautifulSoup:
+    """Parse `markup`, optionally building only the subtrees matched by `parse_only`."""
+    return BeautifulSoup(markup, parser or PARSER, parse_only=parse_only)
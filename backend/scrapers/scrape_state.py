@@ -0,0 +1,92 @@
+"""
+Scrape State — per-URL HTTP validators for incremental scraping.
+Remembers ETag, Last-Modified and a hash of the last body seen for every
+scraped URL (table `scrape_state`, sql/012_incremental_scraping.sql) so
+BaseScraper.fetch can send conditional requests and skip unchanged pages.
+Validators older than SCRAPER_STATE_MAX_AGE are ignored, so every page is
+re-parsed at least that often and its rows' `last_seen_at` stays current.
+"""
+
+import hashlib
+import os
+import threading
+from datetime import datetime, timezone
+
+# Set SCRAPER_FORCE=1 to ignore stored state and re-parse every page
+FORCE = os.environ.get("SCRAPER_FORCE", "").lower() in ("1", "true", "yes")
+# Seconds a stored validator is trusted before the page is fetched unconditionally (0 = always)
+MAX_AGE = float(os.environ.get("SCRAPER_STATE_MAX_AGE", "86400"))
+
+
+def body_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def _expired(entry: dict) -> bool:
+    try:
+        fetched = datetime.fromisoformat(str(entry.get("fetched_at")))
+    except ValueError:
+        return True
+    if fetched.tzinfo is None:
+        fetched = fetched.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - fetched).total_seconds() >= MAX_AGE
+
+
+def request_key(url: str, payload=None) -> str:
+    """State key for a request; POST bodies (e.g. Devfolio search) are part of the key."""
+    if payload is None:
+        return url
+    return f"{url}#{hashlib.sha256(repr(payload).encode()).hexdigest()[:16]}"
+
+
+class ScrapeStateStore:
+    """In-memory view of `scrape_state`, loaded once per process and written back on commit."""
+
+    def __init__(self):
+        self._state: dict[str, dict] | None = None
+        self._enabled = True
+        self._lock = threading.Lock()
+
+    def _load(self, client) -> dict[str, dict]:
+        if self._state is None:
+            try:
+                rows = client.table("scrape_state").select("*").execute().data or []
+                self._state = {r["url"]: r for r in rows}
+            except Exception as e:
+                print(f"scrape_state unavailable ({e}); scraping without conditional requests")
+                self._enabled = False
+                self._state = {}
+        return self._state
+
+    def get(self, client, key: str) -> dict | None:
+        if FORCE:
+            return None
+        with self._lock:
+            entry = self._load(client).get(key)
+        if entry and _expired(entry):
+            return None
+        return entry
+
+    def commit(self, client, entries: list[dict]):
+        """Persist validators for pages whose rows have been written."""
+        if not entries:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [{**e, "fetched_at": now} for e in entries]
+        with self._lock:
+            state = self._load(client)
+            for row in rows:
+                state[row["url"]] = row
+            if not self._enabled:
+                return
+        try:
+            client.table("scrape_state").upsert(rows, on_conflict="url").execute()
+        except Exception as e:
+            print(f"Error saving scrape_state: {e}")
+
+
+_store = ScrapeStateStore()
+
+
+def get_state_store() -> ScrapeStateStore:
+    return _store
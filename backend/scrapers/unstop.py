@@ -1,5 +1,4 @@
 from .base import BaseScraper
-import requests
 from datetime import datetime
 import time
 import random
@@ -18,7 +17,9 @@ class UnstopScraper(BaseScraper):
         print(f"Scraping Unstop Hackathons: {url}")
         
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.fetch(url, headers=self.headers)
+            if response is None:
+                return
             if response.status_code != 200:
                 print(f"Failed to fetch Unstop: {response.status_code}")
                 return
@@ -93,7 +94,9 @@ class UnstopScraper(BaseScraper):
         print(f"Scraping Unstop Jobs: {url}")
         
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.fetch(url, headers=self.headers)
+            if response is None:
+                return
             if response.status_code != 200:
                 print(f"Failed to fetch Unstop Jobs: {response.status_code}")
                 return
@@ -145,6 +148,7 @@ class UnstopScraper(BaseScraper):
     def run(self):
         self.scrape_hackathons()
         self.scrape_jobs()
+        self.flush()
 
 if __name__ == "__main__":
     UnstopScraper().run()
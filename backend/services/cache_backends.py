@@ -0,0 +1,385 @@
+"""
+Cache Backends — the tiers behind cache_service.
+
+Every tier stores the dicts set_cached builds (opportunities, source_breakdown,
+cached_at, expires_at) and answers get() with (value, is_stale) or None:
+  MemoryBackend    in-process LRU, per worker (fastest, not shared)
+  RedisBackend     any Redis-protocol server, shared by every worker
+  SupabaseBackend  the opportunity_cache table (cold, survives restarts)
+cache_service reads them in order and promotes a hit into the faster tiers.
+The remote tiers store entries through cache_codec (compact, compressed).
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from backend.database import get_supabase
+from backend.services import cache_codec
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # optional: the shared tier is skipped without it
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+
+def expiry_ts(data: dict) -> float:
+    """Epoch seconds of an entry's expires_at."""
+    return datetime.fromisoformat(data["expires_at"]).timestamp()
+
+
+class LRUCache:
+    """
+    Bounded LRU cache with per-entry expiry and a stale grace window.
+    Entry size is approximated by its JSON-encoded length; the least recently
+    used entries are evicted once either max_entries or max_bytes is exceeded.
+    """
+
+    def __init__(self, max_entries: int = 500, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: OrderedDict[str, tuple[dict, int, float, float]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _sizeof(value: dict) -> int:
+        return len(json.dumps(value, default=str))
+
+    def get(self, key: str) -> dict | None:
+        found = self.get_entry(key)
+        return found[0] if found and not found[1] else None
+
+    def get_entry(self, key: str, allow_stale: bool = False) -> tuple[dict, bool] | None:
+        """Return (value, is_stale) or None. Stale entries are only returned when allow_stale."""
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, size, expires, stale_until = entry
+            if stale_until <= now:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            is_stale = expires <= now
+            if is_stale and not allow_stale:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            if is_stale:
+                self.stale_hits += 1
+            else:
+                self.hits += 1
+            return value, is_stale
+
+    def set(self, key: str, value: dict, expires: float, stale_until: float | None = None):
+        size = self._sizeof(value)
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            if size > self.max_bytes:
+                logger.debug(f"L1 entry {key[:8]}... ({size} bytes) exceeds byte budget, not cached")
+                return
+            self._data[key] = (value, size, expires, max(expires, stale_until or expires))
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+    def _remove(self, key: str):
+        _, size, _, _ = self._data.pop(key)
+        self._bytes -= size
+
+    def sweep(self) -> int:
+        """Drop every entry past its stale window. Returns how many were removed."""
+        now = time.time()
+        with self._lock:
+            expired = [k for k, (_, _, _, stale_until) in self._data.items() if stale_until <= now]
+            for k in expired:
+                self._remove(k)
+            self.expirations += len(expired)
+        return len(expired)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale_hits": self.stale_hits,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class CacheBackend:
+    """One cache tier. Backends swallow their own errors: a failing tier reads as a miss."""
+
+    name = "base"
+
+    async def get(self, key: str, allow_stale: bool = False) -> tuple[dict, bool] | None:
+        raise NotImplementedError
+
+    async def set(self, key: str, data: dict):
+        raise NotImplementedError
+
+    async def purge(self) -> int:
+        """Drop entries past their stale window; tiers with native expiry do nothing."""
+        return 0
+
+    async def close(self):
+        pass
+
+    def stats(self) -> dict:
+        return {}
+
+
+class _CountingBackend(CacheBackend):
+    """Shared hit/stale/miss/error counters for the remote tiers."""
+
+    def __init__(self):
+        self._counts = {"hits": 0, "stale_hits": 0, "misses": 0, "errors": 0}
+
+    def _count(self, result: str):
+        self._counts[result] += 1
+
+    def stats(self) -> dict:
+        counts = dict(self._counts)
+        lookups = counts["hits"] + counts["misses"]
+        counts["hit_ratio"] = round(counts["hits"] / lookups, 3) if lookups else 0.0
+        return counts
+
+
+# ─── In-process ────────────────────────────────────────────────
+
+class MemoryBackend(CacheBackend):
+    """
+    LRU tier. An entry is fresh for at most `ttl` seconds and never past its
+    expires_at; it stays stale-readable until expires_at + stale_grace.
+    """
+
+    name = "memory"
+
+    def __init__(self, lru: LRUCache, ttl: float, stale_grace: float):
+        self.lru = lru
+        self.ttl = ttl
+        self.stale_grace = stale_grace
+
+    async def get(self, key: str, allow_stale: bool = False) -> tuple[dict, bool] | None:
+        return self.lru.get_entry(key, allow_stale=allow_stale)
+
+    async def set(self, key: str, data: dict):
+        expires = expiry_ts(data)
+        self.lru.set(key, data, min(expires, time.time() + self.ttl), expires + self.stale_grace)
+
+    async def purge(self) -> int:
+        return self.lru.sweep()
+
+    def stats(self) -> dict:
+        return self.lru.stats()
+
+
+# ─── Shared (Redis protocol) ───────────────────────────────────
+
+class RedisBackend(_CountingBackend):
+    """
+    Cross-worker tier on any Redis-protocol server. Values are cache_codec
+    blobs; the server expires them at expires_at + stale_grace. After a
+    connection error the tier is skipped for `retry_seconds` so a dead server
+    costs one timeout, not one per request.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, stale_grace: float, prefix: str = "sports:opp:",
+                 timeout: float = 0.25, retry_seconds: float = 15.0, compression: str = "auto"):
+        super().__init__()
+        self.url = url
+        self.stale_grace = stale_grace
+        self.compression = compression
+        self.prefix = prefix
+        self.timeout = timeout
+        self.retry_seconds = retry_seconds
+        self._client = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+        self._down_until = 0.0
+
+    def _get_client(self):
+        """The redis client for the running loop (connections are bound to the loop that opened them)."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = aioredis.from_url(
+                self.url,
+                protocol=2,
+                socket_timeout=self.timeout,
+                socket_connect_timeout=self.timeout,
+            )
+            self._client_loop = loop
+        return self._client
+
+    def _available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _failed(self, action: str, e: Exception):
+        self._count("errors")
+        self._down_until = time.monotonic() + self.retry_seconds
+        logger.warning(f"Redis cache {action} failed, skipping tier for {self.retry_seconds:.0f}s: {e}")
+
+    async def get(self, key: str, allow_stale: bool = False) -> tuple[dict, bool] | None:
+        if not self._available():
+            return None
+        try:
+            raw = await self._get_client().get(self.prefix + key)
+        except Exception as e:
+            self._failed("read", e)
+            return None
+        if raw is None:
+            self._count("misses")
+            return None
+        try:
+            data = cache_codec.decode(raw)
+        except ValueError as e:
+            self._count("errors")
+            logger.debug(f"Redis cache entry {key[:8]}... could not be decoded: {e}")
+            return None
+        is_stale = expiry_ts(data) <= time.time()
+        if is_stale and not allow_stale:
+            self._count("misses")
+            return None
+        self._count("stale_hits" if is_stale else "hits")
+        return data, is_stale
+
+    async def set(self, key: str, data: dict):
+        if not self._available():
+            return
+        stale_until_ms = int((expiry_ts(data) + self.stale_grace) * 1000)
+        try:
+            blob = cache_codec.encode(data, self.compression)
+            await self._get_client().set(self.prefix + key, blob, pxat=stale_until_ms)
+        except Exception as e:
+            self._failed("write", e)
+
+    async def close(self):
+        if self._client is not None:
+            try:
+                await self._client.aclose()
+            except Exception as e:
+                logger.debug(f"Redis cache close failed: {e}")
+        self._client = None
+        self._client_loop = None
+
+    def stats(self) -> dict:
+        return {**super().stats(), "available": self._available()}
+
+# ─── Cold (Supabase table) ─────────────────────────────────────
+
+class SupabaseBackend(_CountingBackend):
+    """
+    The opportunity_cache table, one row per key. Results go in `payload` as a
+    base64 cache_codec blob; with compression="json" (or for rows written
+    before the codec) they are the JSONB `results` column instead.
+    """
+
+    name = "supabase"
+
+    def __init__(self, stale_grace: float, compression: str = "auto"):
+        super().__init__()
+        self.stale_grace = stale_grace
+        self.compression = compression
+
+    async def get(self, key: str, allow_stale: bool = False) -> tuple[dict, bool] | None:
+        try:
+            supabase = get_supabase()
+            if not supabase:
+                return None
+            now = time.time()
+            floor = now - self.stale_grace if allow_stale else now
+            result = supabase.table("opportunity_cache") \
+                .select("*") \
+                .eq("cache_key", key) \
+                .gt("expires_at", datetime.fromtimestamp(floor, timezone.utc).isoformat()) \
+                .execute()
+            if not result.data:
+                self._count("misses")
+                return None
+            entry = result.data[0]
+            if entry.get("payload"):
+                data = cache_codec.decode(base64.b64decode(entry["payload"]))
+                data["expires_at"] = entry["expires_at"]
+            else:
+                data = {
+                    "opportunities": entry["results"],
+                    "source_breakdown": entry.get("source_breakdown"),
+                    "cached_at": entry["created_at"],
+                    "expires_at": entry["expires_at"],
+                }
+            is_stale = expiry_ts(data) <= now
+            self._count("stale_hits" if is_stale else "hits")
+            return data, is_stale
+        except Exception as e:
+            self._count("errors")
+            logger.debug(f"L2 cache check failed: {e}")
+            return None
+
+    async def set(self, key: str, data: dict):
+        try:
+            supabase = get_supabase()
+            if supabase:
+                row = {
+                    "cache_key": key,
+                    "source_breakdown": data.get("source_breakdown"),
+                    "expires_at": data["expires_at"],
+                }
+                if self.compression == "json":
+                    row.update(results=data.get("opportunities", []), payload=None)
+                else:
+                    blob = cache_codec.encode(data, self.compression)
+                    row.update(results=[], payload=base64.b64encode(blob).decode("ascii"))
+                supabase.table("opportunity_cache").upsert(row, on_conflict="cache_key").execute()
+        except Exception as e:
+            logger.debug(f"L2 cache write failed: {e}")
+
+    async def purge(self) -> int:
+        try:
+            supabase = get_supabase()
+            if supabase:
+                cutoff = datetime.fromtimestamp(time.time() - self.stale_grace, timezone.utc).isoformat()
+                result = supabase.table("opportunity_cache") \
+                    .delete() \
+                    .lt("expires_at", cutoff) \
+                    .execute()
+                return len(result.data or [])
+        except Exception as e:
+            logger.debug(f"Cache cleanup failed: {e}")
+        return 0
@@ -0,0 +1,167 @@
+"""
+Cache Codec — compact binary encoding for cached opportunity result sets.
+
+A cache entry is {"opportunities": [...], "source_breakdown", "cached_at",
+"expires_at"}. Encoded, it becomes a small header plus a (compressed) compact
+JSON body where:
+  - rows are stored column-wise, grouped by key layout, so field names are
+    not repeated per row and decoding rebuilds rows with zip() in C;
+  - low-cardinality strings (source, type, company, location, ...) are
+    indexes into one string table;
+  - descriptions are stored once per content hash and referenced by index.
+
+Layout: b"OC" + version byte + compression byte (n/z/s/l) + body.
+decode() also accepts plain JSON, so entries written before the codec
+(or with OPPORTUNITY_CACHE_CODEC=json) stay readable.
+"""
+
+import hashlib
+import json
+import os
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # optional
+    lz4_frame = None
+
+MAGIC = b"OC"
+VERSION = 1
+
+# Opportunity fields whose string values are interned in the string table
+DICT_FIELDS = frozenset({"source", "type", "company", "location", "city", "state", "country"})
+DESCRIPTION_FIELD = "description"
+
+_ZSTD_LEVEL = 3
+_ZLIB_LEVEL = 6
+
+
+def _compressors() -> dict[str, tuple]:
+    """name -> (flag byte, compress, decompress) for the codecs available here."""
+    table = {
+        "none": (b"n", lambda b: b, lambda b: b),
+        "zlib": (b"z", lambda b: zlib.compress(b, _ZLIB_LEVEL), zlib.decompress),
+    }
+    if zstandard is not None:
+        table["zstd"] = (b"s", zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress,
+                         zstandard.ZstdDecompressor().decompress)
+    if lz4_frame is not None:
+        table["lz4"] = (b"l", lz4_frame.compress, lz4_frame.decompress)
+    return table
+
+
+_COMPRESSORS = _compressors()
+_BY_FLAG = {flag: decompress for flag, _, decompress in _COMPRESSORS.values()}
+
+
+def resolve_compression(name: str) -> str:
+    """Map a configured name ("auto", "zstd", "lz4", "zlib", "none") to one that is installed."""
+    name = (name or "auto").lower()
+    if name in _COMPRESSORS:
+        return name
+    return next(c for c in ("zstd", "lz4", "zlib") if c in _COMPRESSORS)
+
+
+def _pack(data: dict) -> dict:
+    fields: dict[str, int] = {}
+    groups: dict[tuple, dict] = {}
+    for pos, opp in enumerate(data.get("opportunities") or []):
+        keys = tuple(fields.setdefault(k, len(fields)) for k in opp)
+        group = groups.get(keys)
+        if group is None:
+            group = groups[keys] = {"k": list(keys), "n": [], "c": [[] for _ in keys]}
+        group["n"].append(pos)
+        for column, v in zip(group["c"], opp.values()):
+            column.append(v)
+
+    strings: dict[str, int] = {}
+    descriptions: dict[bytes, int] = {}
+    description_texts: list[str] = []
+    names = list(fields)
+    for group in groups.values():
+        encoded = []
+        for fi, column in zip(group["k"], group["c"]):
+            name = names[fi]
+            # Only all-string columns are interned, so every value in them is a table index (-1 = None)
+            if name not in DICT_FIELDS and name != DESCRIPTION_FIELD \
+                    or not all(v is None or isinstance(v, str) for v in column):
+                continue
+            if name == DESCRIPTION_FIELD:
+                refs = []
+                for v in column:
+                    if v is None:
+                        refs.append(-1)
+                        continue
+                    digest = hashlib.blake2b(v.encode(), digest_size=12).digest()
+                    if digest not in descriptions:
+                        descriptions[digest] = len(description_texts)
+                        description_texts.append(v)
+                    refs.append(descriptions[digest])
+            else:
+                refs = [-1 if v is None else strings.setdefault(v, len(strings)) for v in column]
+            column[:] = refs
+            encoded.append(fi)
+        group["x"] = encoded
+        if len(groups) == 1:
+            del group["n"]  # rows are in order
+
+    meta = {k: v for k, v in data.items() if k != "opportunities"}
+    return {"f": names, "s": list(strings), "d": description_texts, "g": list(groups.values()), "m": meta}
+
+
+def _unpack(body: dict) -> dict:
+    fields = body["f"]
+    # A trailing None makes index -1 decode to None without a per-value branch
+    strings = body["s"] + [None]
+    description_texts = body["d"] + [None]
+    groups = body["g"]
+
+    opportunities = [] if len(groups) == 1 else [None] * sum(len(g["n"]) for g in groups)
+    for group in groups:
+        names = [fields[fi] for fi in group["k"]]
+        interned = set(group["x"])
+        columns = []
+        for fi, column in zip(group["k"], group["c"]):
+            if fi in interned:
+                table = description_texts if fields[fi] == DESCRIPTION_FIELD else strings
+                column = list(map(table.__getitem__, column))
+            columns.append(column)
+        rows = [dict(zip(names, values)) for values in zip(*columns)]
+        if "n" not in group:
+            opportunities = rows
+        else:
+            for pos, row in zip(group["n"], rows):
+                opportunities[pos] = row
+    return {"opportunities": opportunities, **body["m"]}
+
+
+def encode(data: dict, compression: str = "auto") -> bytes:
+    """Encode a cache entry. compression="json" writes plain JSON (the pre-codec format)."""
+    if compression == "json":
+        return json.dumps(data, default=str, separators=(",", ":")).encode()
+    flag, compress, _ = _COMPRESSORS[resolve_compression(compression)]
+    body = json.dumps(_pack(data), default=str, separators=(",", ":"), ensure_ascii=False).encode()
+    return MAGIC + bytes([VERSION]) + flag + compress(body)
+
+
+def decode(blob: bytes) -> dict:
+    """Decode an entry written by encode(), or a plain JSON one."""
+    if not blob.startswith(MAGIC):
+        return json.loads(blob)
+    if blob[2] != VERSION:
+        raise ValueError(f"unsupported cache codec version {blob[2]}")
+    decompress = _BY_FLAG.get(blob[3:4])
+    if decompress is None:
+        raise ValueError(f"cache entry compressed with an unavailable codec ({blob[3:4]!r})")
+    return _unpack(json.loads(decompress(blob[4:])))
+
+
+def configured_compression() -> str:
+    """OPPORTUNITY_CACHE_CODEC: auto (best installed), zstd, lz4, zlib, none, or json (uncompacted)."""
+    name = os.environ.get("OPPORTUNITY_CACHE_CODEC", "auto").lower()
+    return "json" if name == "json" else resolve_compression(name)
@@ -1,108 +1,184 @@
 """
-Cache Service — 2-level caching for opportunity results.
-L1: In-memory Python dict (30 min TTL)
-L2: Supabase opportunity_cache table (2 hour TTL)
+Cache Service — tiered caching for opportunity results.
+Tiers are read in OPPORTUNITY_CACHE_TIERS order (default memory,redis,supabase)
+and a hit is promoted into every faster tier:
+  memory:   in-process LRU, bounded by entry count and byte budget (30 min TTL)
+  redis:    Redis-protocol server shared by all workers (needs REDIS_URL)
+  supabase: opportunity_cache table (2 hour TTL)
+Expired entries stay readable as "stale" for a grace window so callers
+can serve them while a refresh runs (stale-while-revalidate).
 """
 
+import asyncio
 import hashlib
-import json
 import logging
+import os
 from datetime import datetime, timedelta, timezone
-from backend.database import get_supabase
+from backend.services import cache_codec
+from backend.services.query_builder import build_queries
+from backend.services.cache_backends import (
+    CacheBackend, LRUCache, MemoryBackend, RedisBackend, SupabaseBackend, aioredis,
+)
+from backend.utils import metrics
 
 logger = logging.getLogger(__name__)
 
-# L1: In-memory cache
-_memory_cache: dict[str, dict] = {}
 _memory_ttl = timedelta(minutes=30)
+L1_MAX_ENTRIES = int(os.environ.get("OPPORTUNITY_CACHE_MAX_ENTRIES", "500"))
+L1_MAX_BYTES = int(os.environ.get("OPPORTUNITY_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+L1_SWEEP_INTERVAL = int(os.environ.get("OPPORTUNITY_CACHE_SWEEP_SECONDS", "60"))
+STALE_GRACE = timedelta(seconds=int(os.environ.get("OPPORTUNITY_CACHE_STALE_SECONDS", "3600")))
+CACHE_TIERS = os.environ.get("OPPORTUNITY_CACHE_TIERS", "memory,redis,supabase")
+REDIS_URL = os.environ.get("REDIS_URL", "")
+REDIS_TIMEOUT = float(os.environ.get("REDIS_CACHE_TIMEOUT", "0.25"))
+REDIS_RETRY_SECONDS = float(os.environ.get("REDIS_CACHE_RETRY_SECONDS", "15"))
+CACHE_CODEC = cache_codec.configured_compression()
+
+# Names reported by cache_stats() and /metrics (kept from the two-level layout)
+_LEVELS = {"memory": "l1", "redis": "shared", "supabase": "l2"}
+
+# L1: In-memory cache (always present, even when the memory tier is not configured)
+_memory_cache = LRUCache(L1_MAX_ENTRIES, L1_MAX_BYTES)
+_tiers: list[CacheBackend] = []
+
+
+def configure_tiers(names: str = CACHE_TIERS, redis_url: str = REDIS_URL) -> list[CacheBackend]:
+    """(Re)build the tier chain from a comma-separated list of tier names."""
+    global _tiers
+    grace = STALE_GRACE.total_seconds()
+    tiers: list[CacheBackend] = []
+    for name in (n.strip().lower() for n in names.split(",")):
+        if name == "memory":
+            tiers.append(MemoryBackend(_memory_cache, _memory_ttl.total_seconds(), grace))
+        elif name == "redis":
+            if not redis_url:
+                logger.info("REDIS_URL not set, shared cache tier disabled")
+            elif aioredis is None:
+                logger.warning("REDIS_URL is set but the redis package is not installed, shared cache tier disabled")
+            else:
+                tiers.append(RedisBackend(redis_url, grace, timeout=REDIS_TIMEOUT,
+                                          retry_seconds=REDIS_RETRY_SECONDS, compression=CACHE_CODEC))
+        elif name == "supabase":
+            tiers.append(SupabaseBackend(grace, compression=CACHE_CODEC))
+        elif name:
+            logger.warning(f"Unknown cache tier '{name}' ignored")
+    _tiers = tiers
+    return tiers
+
+
+configure_tiers()
 
 
 def build_cache_key(profile: dict) -> str:
-    """Build cache key from profile. Similar profiles share cache."""
+    """
+    Build cache key from the upstream queries the profile would issue, so every
+    profile that fetches the same thing shares one entry. Results are re-scored
+    per caller, and per-profile extras (international programs) are added on read.
+    """
     country = (profile.get("country") or "UNKNOWN").upper()
-    skills = sorted([s.lower() for s in profile.get("skills", [])[:3]])
-    level = profile.get("experience_level", "student")
-    raw = f"{country}:{':'.join(skills)}:{level}"
+    raw = f"{country}:{'|'.join(build_queries(profile))}"
     return hashlib.md5(raw.encode()).hexdigest()
 
 
-async def get_cached(cache_key: str) -> dict | None:
-    """Check both cache levels. Returns cached data or None."""
-    now = datetime.now(timezone.utc)
+def build_query_cache_key(source: str, query: str, *params) -> str:
+    """Cache key for one adapter call's raw results, shared by every profile that issues it."""
+    raw = ":".join(["q", source, query.lower(), *(str(p) for p in params)])
+    return hashlib.md5(raw.encode()).hexdigest()
 
-    # L1: Check in-memory
-    if cache_key in _memory_cache:
-        entry = _memory_cache[cache_key]
-        if datetime.fromisoformat(entry["expires_at"]) > now:
-            logger.info(f"Cache L1 HIT for key {cache_key[:8]}...")
-            return entry
-        else:
-            del _memory_cache[cache_key]
-
-    # L2: Check Supabase
-    try:
-        supabase = get_supabase()
-        if supabase:
-            result = supabase.table("opportunity_cache") \
-                .select("*") \
-                .eq("cache_key", cache_key) \
-                .gt("expires_at", now.isoformat()) \
-                .execute()
-            if result.data and len(result.data) > 0:
-                entry = result.data[0]
-                data = {
-                    "opportunities": entry["results"],
-                    "source_breakdown": entry.get("source_breakdown"),
-                    "cached_at": entry["created_at"],
-                    "expires_at": entry["expires_at"],
-                }
-                # Promote to L1
-                _memory_cache[cache_key] = data
-                logger.info(f"Cache L2 HIT for key {cache_key[:8]}...")
-                return data
-    except Exception as e:
-        logger.debug(f"L2 cache check failed: {e}")
+
+async def get_cached(cache_key: str, allow_stale: bool = False) -> dict | None:
+    """
+    Check each cache tier in order. Returns cached data or None.
+    With allow_stale, an expired entry still inside STALE_GRACE is returned
+    with "stale": True instead of being treated as a miss.
+    """
+    for i, tier in enumerate(_tiers):
+        found = await tier.get(cache_key, allow_stale=allow_stale)
+        if found is None:
+            continue
+        entry, is_stale = found
+        # Promote into the faster tiers
+        for faster in _tiers[:i]:
+            await faster.set(cache_key, entry)
+        level = _LEVELS.get(tier.name, tier.name).upper()
+        if is_stale:
+            logger.info(f"Cache {level} STALE HIT for key {cache_key[:8]}...")
+            return {**entry, "stale": True}
+        logger.info(f"Cache {level} HIT for key {cache_key[:8]}...")
+        return entry
 
     logger.info(f"Cache MISS for key {cache_key[:8]}...")
     return None
 
 
 async def set_cached(cache_key: str, data: dict, ttl_seconds: int = 7200):
-    """Store in both cache levels."""
+    """Store in every cache tier."""
     now = datetime.now(timezone.utc)
-    expires_at = (now + timedelta(seconds=ttl_seconds)).isoformat()
 
     # Attach expiry
-    data["expires_at"] = expires_at
+    data["expires_at"] = (now + timedelta(seconds=ttl_seconds)).isoformat()
     data["cached_at"] = now.isoformat()
 
-    # L1: In-memory
-    _memory_cache[cache_key] = data
-
-    # L2: Supabase
-    try:
-        supabase = get_supabase()
-        if supabase:
-            supabase.table("opportunity_cache").upsert({
-                "cache_key": cache_key,
-                "results": data.get("opportunities", []),
-                "source_breakdown": data.get("source_breakdown"),
-                "expires_at": expires_at,
-            }).execute()
-            logger.info(f"Cached {len(data.get('opportunities', []))} results for key {cache_key[:8]}...")
-    except Exception as e:
-        logger.debug(f"L2 cache write failed: {e}")
+    for tier in _tiers:
+        await tier.set(cache_key, data)
+    logger.info(f"Cached {len(data.get('opportunities', []))} results for key {cache_key[:8]}...")
 
 
 async def clear_expired():
-    """Remove expired entries from L2 cache"""
-    try:
-        supabase = get_supabase()
-        if supabase:
-            now = datetime.now(timezone.utc).isoformat()
-            supabase.table("opportunity_cache") \
-                .delete() \
-                .lt("expires_at", now) \
-                .execute()
-    except Exception as e:
-        logger.debug(f"Cache cleanup failed: {e}")
+    """Remove entries that are past their stale grace window from every tier"""
+    for tier in _tiers:
+        await tier.purge()
+
+
+async def close_backends():
+    """Close tier connections (shared-tier client) on shutdown."""
+    for tier in _tiers:
+        await tier.close()
+
+
+def cache_stats() -> dict:
+    """Hit/miss/eviction counters per cache level (l1 = memory, shared = redis, l2 = supabase)."""
+    stats = {"l1": _memory_cache.stats()}
+    for tier in _tiers:
+        if tier.name != "memory":
+            stats[_LEVELS.get(tier.name, tier.name)] = tier.stats()
+    return stats
+
+
+def _metric_families() -> list:
+    """Scrape-time view of cache_stats() for /metrics."""
+    stats = cache_stats()
+    l1 = stats["l1"]
+    lookups, ratios = [], []
+    for level, counts in stats.items():
+        for r, k in (("hit", "hits"), ("stale_hit", "stale_hits"), ("miss", "misses"), ("error", "errors")):
+            if k in counts:
+                lookups.append(({"level": level, "result": r}, counts[k]))
+        ratios.append(({"level": level}, counts["hit_ratio"]))
+    return [
+        ("cache_lookups_total", "counter", "Opportunity cache lookups by level and result", lookups),
+        ("cache_hit_ratio", "gauge", "Fresh hits / lookups per cache level", ratios),
+        ("cache_entries", "gauge", "Entries held in the L1 cache", [({}, l1["entries"])]),
+        ("cache_bytes", "gauge", "Approximate bytes held in the L1 cache", [({}, l1["bytes"])]),
+        ("cache_evictions_total", "counter", "L1 evictions (LRU + expiry)", [
+            ({"reason": "lru"}, l1["evictions"]), ({"reason": "expired"}, l1["expirations"]),
+        ]),
+    ]
+
+
+metrics.register_collector(_metric_families)
+
+
+async def _sweep_loop(interval: int):
+    while True:
+        await asyncio.sleep(interval)
+        removed = _memory_cache.sweep()
+        if removed:
+            logger.debug(f"L1 sweep removed {removed} expired entries")
+
+
+def start_sweeper(interval: int = L1_SWEEP_INTERVAL) -> asyncio.Task | None:
+    """Start the background L1 expiry sweep on the running loop."""
+    if interval <= 0:
+        return None
+    return asyncio.create_task(_sweep_loop(interval))
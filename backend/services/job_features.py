@@ -0,0 +1,61 @@
+"""
+Job Features — per-row text features computed once at ingest.
+BaseScraper.save_job stores them next to the job (see sql/010_job_features.sql)
+so /api/opportunities/db/jobs only projects and scores, without re-deriving
+lowercase text, category or remote flags on every request.
+"""
+
+# Bump when the feature definitions change; rows with an older version are re-backfilled
+FEATURES_VERSION = 1
+
+FEATURE_COLUMNS = ("title_norm", "context_norm", "category", "is_remote", "domain_tags", "features_version")
+
+# Domain keywords that make generic titles relevant
+DOMAIN_TITLE_MATCHES = {
+    "ai": ["software", "engineer", "developer", "research", "data", "analyst", "ml", "ai", "intern", "full stack"],
+    "web": ["software", "developer", "engineer", "frontend", "backend", "full stack", "web", "intern"],
+    "data": ["software", "engineer", "data", "analyst", "developer", "research", "intern", "science"],
+    "mobile": ["software", "developer", "mobile", "android", "ios", "flutter", "intern"],
+    "devops": ["software", "engineer", "devops", "cloud", "infrastructure", "sre", "developer", "intern"],
+}
+
+_REMOTE_LOCATION_KEYWORDS = ("remote", "work from home")
+
+
+def normalize_text(text: str | None) -> str:
+    """Lowercase and collapse whitespace."""
+    return " ".join((text or "").lower().split())
+
+
+def _domain_tags(title_norm: str) -> list[str]:
+    """Domains whose title keywords appear in the title as whole-word prefixes."""
+    words = title_norm.split()
+    padded = f" {title_norm}"
+    tags = []
+    for domain, keywords in DOMAIN_TITLE_MATCHES.items():
+        for kw in keywords:
+            hit = f" {kw}" in padded if " " in kw else any(w.startswith(kw) for w in words)
+            if hit:
+                tags.append(domain)
+                break
+    return tags
+
+
+def compute_job_features(job: dict) -> dict:
+    """Derived columns for one `jobs` row (keys = FEATURE_COLUMNS)."""
+    title_norm = normalize_text(job.get("title"))
+    location_norm = normalize_text(job.get("location"))
+    job_type = normalize_text(job.get("type"))
+
+    return {
+        "title_norm": title_norm,
+        "context_norm": f"{normalize_text(job.get('company'))} {location_norm}".strip(),
+        "category": "internship" if "intern" in job_type or "intern" in title_norm else "job",
+        "is_remote": any(k in location_norm for k in _REMOTE_LOCATION_KEYWORDS),
+        "domain_tags": _domain_tags(title_norm),
+        "features_version": FEATURES_VERSION,
+    }
+
+
+def has_current_features(row: dict) -> bool:
+    return row.get("features_version") == FEATURES_VERSION and row.get("title_norm") is not None
@@ -0,0 +1,100 @@
+"""
+Keyword Matcher — Aho–Corasick multi-pattern automaton.
+Compiled once per keyword profile, then finds every pattern of every
+group in a single pass over the text.
+
+Matches are word-start aware: a pattern that begins with a letter/digit
+only matches at the start of a word ("ai" hits "ai engineer" but not
+"maintain"), while still allowing suffixes ("intern" hits "internship").
+"""
+
+from collections import deque
+from typing import Iterable
+
+
+class KeywordAutomaton:
+    """Aho–Corasick automaton over named groups of lowercase patterns."""
+
+    def __init__(self, groups: dict[str, Iterable[str]]):
+        self.patterns: list[str] = []
+        pattern_ids: dict[str, int] = {}
+        group_ids: dict[str, set[int]] = {}
+
+        for group, patterns in groups.items():
+            ids = group_ids.setdefault(group, set())
+            for p in patterns:
+                p = p.lower().strip()
+                if not p:
+                    continue
+                if p not in pattern_ids:
+                    pattern_ids[p] = len(self.patterns)
+                    self.patterns.append(p)
+                ids.add(pattern_ids[p])
+
+        self.groups: dict[str, frozenset[int]] = {g: frozenset(ids) for g, ids in group_ids.items()}
+        self._lengths = [len(p) for p in self.patterns]
+        self._word_start = [p[0].isalnum() for p in self.patterns]
+        self._build()
+
+    def _build(self):
+        goto: list[dict[str, int]] = [{}]
+        out: list[list[int]] = [[]]
+
+        # 1. Trie
+        for pid, pattern in enumerate(self.patterns):
+            node = 0
+            for ch in pattern:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                node = nxt
+            out[node].append(pid)
+
+        # 2. Failure links (BFS), merging outputs along them
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in goto[node].items():
+                queue.append(nxt)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def scan(self, text: str, split: int = 0) -> tuple[set[int], set[int]]:
+        """
+        Find all patterns in `text` (expected lowercase) in one pass.
+        Returns (ids matched anywhere, ids matched entirely within text[:split]).
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        lengths, word_start = self._lengths, self._word_start
+        hits: set[int] = set()
+        head: set[int] = set()
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            for pid in out[node]:
+                start = i - lengths[pid] + 1
+                if word_start[pid] and start > 0 and text[start - 1].isalnum():
+                    continue
+                hits.add(pid)
+                if i < split:
+                    head.add(pid)
+        return hits, head
+
+    def count(self, hits: set[int], group: str) -> int:
+        """How many distinct patterns of `group` are in `hits`."""
+        return len(hits & self.groups.get(group, frozenset()))
@@ -0,0 +1,336 @@
+"""
+Local Grader — deterministic first pass over short-answer and coding answers
+in /api/prep/submit, so Gemini only evaluates the answers it can't decide.
+
+  short_answer  concept overlap: the share of the expected answer's key terms
+                (stop words dropped, abbreviations expanded, lightly stemmed)
+                that the answer covers. At or below REJECT it is wrong;
+                anything higher goes to Gemini, since a bag of words can't tell
+                "lists are mutable, tuples immutable" from its reverse.
+  coding        the answer runs against the question's stored test cases in a
+                bubblewrap (bwrap) sandbox. Cases the reference solution fails
+                are discarded. All remaining cases passing is correct, all
+                failing (or a timeout) is wrong. Partial passes, code that
+                isn't runnable Python and questions without tests are left to
+                Gemini, whose rubric accepts the right logic despite
+                slightly-off syntax.
+
+The sandbox starts from an empty root with only the interpreter's directories
+bound read-only, unshares the network, PID, IPC, UTS and user namespaces, runs
+as uid 65534 with every capability dropped and dies with its parent; the
+runner adds CPU / memory / file / process rlimits before the answer executes.
+Without a working bwrap (not installed, or user namespaces disabled) coding
+answers are never executed and all go to Gemini. A skipped answer is always
+wrong.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import secrets
+import shutil
+import signal
+import sys
+from collections import OrderedDict
+
+from backend.services.skill_matcher import ABBREVIATIONS
+from backend.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.environ.get("LOCAL_GRADER_ENABLED", "1").lower() not in ("0", "false", "no")
+REJECT = float(os.environ.get("LOCAL_GRADER_REJECT", "0.15"))
+TIMEOUT = float(os.environ.get("LOCAL_GRADER_TIMEOUT", "3"))
+MEMORY_MB = int(os.environ.get("LOCAL_GRADER_MEMORY_MB", "256"))
+MAX_PROCS = int(os.environ.get("LOCAL_GRADER_MAX_PROCS", "4"))
+# "auto" uses bwrap when it works on this host; "none" never executes coding answers
+SANDBOX = os.environ.get("LOCAL_GRADER_SANDBOX", "auto").lower()
+BWRAP = os.environ.get("LOCAL_GRADER_BWRAP") or shutil.which("bwrap")
+
+# Fewer key concepts than this is too little signal to decide a short answer
+MIN_CONCEPTS = 3
+MAX_OUTPUT_BYTES = 64 * 1024
+# Questions whose reference-solution results are remembered (banked questions repeat)
+REFERENCE_CACHE_ENTRIES = 512
+
+_STOPWORDS = frozenset("""
+a an the and or but if then else of to in on at by for with from into onto over under as is are was were be been
+being it its this that these those there here which who whom whose what when where why how can could should would
+will shall may might must do does did done has have had having not no nor so than too very just also such each
+any all both either neither some more most other only own same i you he she we they them their our your his her
+me my us let lets use used using uses like e.g eg etc via per one two way ways thing things make makes made get gets
+""".split())
+
+_TOKEN = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9]+)*")
+_SUFFIXES = ("ingly", "edly", "ing", "ies", "ed", "es", "ly", "s")
+
+
+def _stem(word: str) -> str:
+    if word.endswith("ss"):
+        return word
+    for suffix in _SUFFIXES:
+        if len(word) - len(suffix) >= 3 and word.endswith(suffix):
+            return word[: -len(suffix)] + ("y" if suffix == "ies" else "")
+    return word
+
+
+def concepts(text: str) -> dict[str, str]:
+    """Stemmed content words of a text (abbreviations like ml, oop, api expanded) -> first surface form."""
+    words = []
+    for token in _TOKEN.findall((text or "").lower()):
+        if token in _STOPWORDS:
+            continue  # before expansion: "be" is also an abbreviation (backend)
+        words.extend(ABBREVIATIONS[token].split() if token in ABBREVIATIONS else [token])
+    found = {}
+    for w in words:
+        if w not in _STOPWORDS and len(w) > 1:
+            found.setdefault(_stem(w), w)
+    return found
+
+
+def grade_short_answer(question: str, expected: str, answer: str) -> dict | None:
+    """{"is_correct": False, "feedback"} for a clear miss, else None (only Gemini can accept an answer)."""
+    expected_words = concepts(expected)
+    key = set(expected_words)
+    # Terms the question already states show little; keep them only if little else is left
+    distinctive = key - set(concepts(question))
+    if len(distinctive) >= MIN_CONCEPTS:
+        key = distinctive
+    if len(key) < MIN_CONCEPTS:
+        return None
+    covered = key & set(concepts(answer))
+    coverage = len(covered) / len(key)
+    if coverage <= REJECT:
+        shown = ", ".join(sorted(expected_words[c] for c in key - covered)[:5])
+        return {"is_correct": False, "feedback": f"Misses the key concepts: {shown}."}
+    return None
+
+
+# ─── Coding: sandboxed test run ───────────────────────────────
+
+# Runs in the child. Limits are applied before the answer is compiled, the
+# answer's own output is swallowed, and the verdict line carries a nonce so
+# printed text can't forge it.
+_RUNNER = r"""
+import io, json, math, sys
+payload = json.loads(sys.stdin.read())
+try:
+    import resource
+    cpu, mem = payload["cpu"], payload["mem"]
+    for limit, value in ((resource.RLIMIT_CPU, cpu), (resource.RLIMIT_AS, mem),
+                         (resource.RLIMIT_FSIZE, 0), (resource.RLIMIT_NPROC, 0), (resource.RLIMIT_CORE, 0)):
+        try:
+            resource.setrlimit(limit, (value, value))
+        except (ValueError, OSError):
+            pass
+except ImportError:
+    pass
+out = sys.stdout
+sys.stdout = sys.stderr = io.StringIO()
+
+def emit(result):
+    out.write(payload["nonce"] + json.dumps(result) + "\n")
+    out.flush()
+
+def same(got, expected):
+    if isinstance(got, float) or isinstance(expected, float):
+        try:
+            return math.isclose(got, expected, rel_tol=1e-6, abs_tol=1e-9)
+        except TypeError:
+            return False
+    return got == expected
+
+ns = {"__name__": "__answer__"}
+try:
+    exec(compile(payload["code"], "<answer>", "exec"), ns)
+except SyntaxError as e:
+    emit({"status": "syntax_error", "detail": str(e)})
+    sys.exit(0)
+except BaseException as e:
+    emit({"status": "error", "detail": type(e).__name__ + ": " + str(e)})
+    sys.exit(0)
+fn = ns.get(payload["function"])
+if not callable(fn):
+    defined = [v for k, v in ns.items() if callable(v) and getattr(v, "__module__", None) == "__answer__"]
+    fn = defined[0] if len(defined) == 1 else None
+if fn is None:
+    emit({"status": "missing_function"})
+    sys.exit(0)
+results = []
+for case in payload["tests"]:
+    try:
+        got = json.loads(json.dumps(fn(*case.get("args", [])), default=repr))
+        results.append({"ok": same(got, case.get("expected")), "got": repr(got)[:120]})
+    except BaseException as e:
+        results.append({"ok": False, "error": type(e).__name__ + ": " + str(e)[:120],
+                        "signature": isinstance(e, TypeError) and "argument" in str(e)})
+emit({"status": "ran", "results": results})
+"""
+
+_limiter: asyncio.Semaphore | None = None
+_limiter_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _get_limiter() -> asyncio.Semaphore:
+    """Caps concurrent grading subprocesses per worker (semaphores are bound to one loop)."""
+    global _limiter, _limiter_loop
+    loop = asyncio.get_running_loop()
+    if _limiter is None or _limiter_loop is not loop:
+        _limiter = asyncio.Semaphore(MAX_PROCS)
+        _limiter_loop = loop
+    return _limiter
+
+
+# System directories the interpreter may load from; everything else is absent in the sandbox
+_READONLY_PATHS = ("/usr", "/lib", "/lib64", "/lib32", "/bin", "/etc/ld.so.cache")
+
+
+def _sandbox_command() -> list[str]:
+    """bwrap invocation running the runner as nobody, with no network and only read-only system paths."""
+    python = os.path.realpath(sys.executable)  # the base interpreter, not a venv under the project
+    command = [BWRAP, "--unshare-all", "--unshare-user", "--uid", "65534", "--gid", "65534",
+               "--cap-drop", "ALL", "--die-with-parent", "--new-session", "--clearenv",
+               "--proc", "/proc", "--dev", "/dev", "--chdir", "/"]
+    bound: list[str] = []
+    for path in (*_READONLY_PATHS, sys.base_prefix, os.path.dirname(python)):
+        if not any(path == b or path.startswith(b + "/") for b in bound):
+            command += ["--ro-bind-try", path, path]
+            bound.append(path)
+    return command + ["--", python, "-I", "-S", "-B", "-c", _RUNNER]
+
+
+_sandbox_ok: bool | None = None
+
+
+async def sandbox_ready() -> bool:
+    """Whether coding answers can be executed: bwrap is configured and a probe run succeeds (checked once)."""
+    global _sandbox_ok
+    if _sandbox_ok is None:
+        if SANDBOX == "none" or not BWRAP or not sys.platform.startswith("linux"):
+            _sandbox_ok = False
+            logger.info("Local grader: no bwrap sandbox, coding answers go to Gemini")
+        else:
+            probe = await run_tests("def f():\n    return 1", "f", [{"args": [], "expected": 1}])
+            _sandbox_ok = probe["status"] == "ran" and probe["results"][0]["ok"]
+            if not _sandbox_ok:
+                logger.warning(f"Local grader: bwrap sandbox unusable ({probe}), coding answers go to Gemini")
+    return _sandbox_ok
+
+
+async def run_tests(code: str, function: str, tests: list[dict]) -> dict:
+    """Run `code` against `tests` in the bwrap sandbox. Returns the runner's verdict or {"status": "timeout"}."""
+    nonce = secrets.token_hex(8)
+    payload = json.dumps({"code": code, "function": function, "tests": tests, "nonce": nonce,
+                          "cpu": max(1, int(TIMEOUT)), "mem": MEMORY_MB * 1024 * 1024}).encode()
+    async with _get_limiter():
+        proc = await asyncio.create_subprocess_exec(
+            *_sandbox_command(),
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL, env={}, start_new_session=True,
+        )
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(payload), TIMEOUT)
+        except asyncio.TimeoutError:
+            return {"status": "timeout"}
+        finally:
+            # Killing bwrap ends its PID namespace, and with it anything the answer forked
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+            await proc.wait()
+    for line in stdout[:MAX_OUTPUT_BYTES].decode(errors="replace").splitlines():
+        if line.startswith(nonce):
+            return json.loads(line[len(nonce):])
+    # Killed by a resource limit (CPU, memory) before reporting
+    return {"status": "crashed", "returncode": proc.returncode}
+
+
+_reference_cache: OrderedDict[str, list[int] | None] = OrderedDict()
+
+
+async def _valid_cases(reference: str, function: str, tests: list) -> list[int] | None:
+    """Indexes of the test cases the reference solution passes, or None if it can't be run."""
+    key = hashlib.sha256(json.dumps([reference, function, tests], sort_keys=True).encode()).hexdigest()
+    if key in _reference_cache:
+        _reference_cache.move_to_end(key)
+        return _reference_cache[key]
+    result = await run_tests(reference, function, tests) if reference else {"status": "missing"}
+    valid = [i for i, o in enumerate(result["results"]) if o["ok"]] if result["status"] == "ran" else None
+    _reference_cache[key] = valid
+    while len(_reference_cache) > REFERENCE_CACHE_ENTRIES:
+        _reference_cache.popitem(last=False)
+    return valid
+
+
+async def grade_coding_answer(answer: str, reference: str, function: str | None, tests: list | None) -> dict | None:
+    """{"is_correct", "feedback"} or None when the tests can't decide."""
+    if not (function and tests and await sandbox_ready()):
+        return None
+    result = await run_tests(answer, function, tests)
+    status = result["status"]
+    if status == "timeout":
+        return {"is_correct": False, "feedback": f"Did not finish within {TIMEOUT:g}s on the test cases."}
+    if status != "ran":
+        return None
+    outcomes = result["results"]
+    if any(o.get("signature") for o in outcomes):
+        return None  # different signature than the stored tests expect
+    if not all(o["ok"] for o in outcomes):
+        # Only count cases the reference solution passes
+        valid = await _valid_cases(reference, function, tests)
+        if not valid:
+            return None
+        outcomes = [outcomes[i] for i in valid]
+    passed = sum(o["ok"] for o in outcomes)
+    if passed == len(outcomes):
+        return {"is_correct": True, "feedback": f"Passed all {passed} test cases."}
+    if passed == 0:
+        first = outcomes[0]
+        detail = first.get("error") or f"returned {first.get('got')}"
+        return {"is_correct": False, "feedback": f"Failed all {len(outcomes)} test cases (first: {detail})."}
+    return None
+
+
+async def grade_answers(questions: list[dict]) -> dict[int, dict]:
+    """
+    Local verdicts for submit_quiz's text questions, keyed by question index.
+    Questions missing from the result need Gemini.
+    """
+    if not ENABLED:
+        return {}
+    verdicts: dict[int, dict] = {}
+    coding = []
+    for q in questions:
+        if not (q.get("user_answer") or "").strip():
+            verdicts[q["index"]] = {"is_correct": False, "feedback": "Skipped."}
+        elif q["type"] == "coding":
+            coding.append(q)
+        else:
+            verdict = grade_short_answer(q["question"], q["correct_answer"], q["user_answer"])
+            if verdict:
+                verdicts[q["index"]] = verdict
+
+    results = await asyncio.gather(
+        *(grade_coding_answer(q["user_answer"], q["correct_answer"], q.get("function_name"), q.get("tests"))
+          for q in coding),
+        return_exceptions=True,
+    )
+    for q, verdict in zip(coding, results):
+        if isinstance(verdict, Exception):
+            logger.warning(f"Local grading of Q{q['index']} failed: {verdict}")
+        elif verdict:
+            verdicts[q["index"]] = verdict
+
+    for q in questions:
+        verdict = verdicts.get(q["index"])
+        outcome = "undecided" if verdict is None else "correct" if verdict["is_correct"] else "wrong"
+        metrics.inc("local_grader_decisions_total", type=q["type"], outcome=outcome)
+    return verdicts
+
+
+metrics.get_registry().describe("local_grader_decisions_total", "counter",
+                                "Quiz answers graded locally (correct / wrong) or left to Gemini (undecided)")
@@ -1,79 +1,112 @@
 """
 Match Scorer — Scores opportunities against user profile (0-100).
 Uses the 3-layer skill matching system.
+The profile is expanded once (ProfileMatcher.build); a whole batch of
+opportunities is then scored in one synchronous pass.
 """
 
+import asyncio
 import logging
 from .skill_matcher import get_related_skills, fuzzy_match
 
 logger = logging.getLogger(__name__)
 
+_JUNIOR_TITLE_KEYWORDS = ("intern", "fresher", "trainee", "junior", "entry")
+_SENIOR_TITLE_KEYWORDS = ("senior", "lead", "manager", "principal", "staff")
+_ENTRY_TITLE_KEYWORDS = ("junior", "entry", "associate")
 
-async def score_opportunity(opportunity: dict, profile: dict) -> int:
-    """Score 0-100 how well an opportunity matches the user's profile"""
-    score = 0
-
-    # === SKILL MATCH (max 50 points) ===
-    user_skills = [s.lower() for s in profile.get("skills", [])]
-    opp_tags = [t.lower() for t in opportunity.get("tags", [])]
-    opp_text = (
-        opportunity.get("title", "") + " " +
-        (opportunity.get("description", "") or "")
-    ).lower()
-
-    matched = 0.0
-    for skill in user_skills:
-        # Layer 1+3: Get expanded skill set
-        expanded = await get_related_skills(skill)
-
-        # Check expanded skills against opportunity
-        if any(exp in opp_tags or exp in opp_text for exp in expanded):
-            matched += 1.0
-        # Layer 2: Fuzzy fallback
-        elif any(fuzzy_match(skill, tag) for tag in opp_tags):
-            matched += 0.7
-
-    if user_skills:
-        score += min(int((matched / len(user_skills)) * 50), 50)
-
-    # === LOCATION MATCH (max 20 points) ===
-    opp_location = (opportunity.get("location", "") or "").lower()
-    if opportunity.get("is_remote"):
-        score += 15
-    user_city = (profile.get("city", "") or "").lower()
-    user_state = (profile.get("state", "") or "").lower()
-    if user_city and user_city in opp_location:
-        score += 20
-    elif user_state and user_state in opp_location:
-        score += 10
-
-    # === LEVEL MATCH (max 15 points) ===
-    opp_title = opportunity.get("title", "").lower()
-    user_level = profile.get("experience_level", "student")
-    if user_level in ["student", "fresher"]:
-        if any(kw in opp_title for kw in ["intern", "fresher", "trainee", "junior", "entry"]):
+
+class ProfileMatcher:
+    """A user profile with every skill (and the career goal) expanded up front."""
+
+    def __init__(self, profile: dict, skill_expansions: list[tuple[str, frozenset[str]]],
+                 goal_related: frozenset[str]):
+        self.skill_expansions = skill_expansions
+        self.goal_related = goal_related
+        self.user_city = (profile.get("city", "") or "").lower()
+        self.user_state = (profile.get("state", "") or "").lower()
+        self.user_level = profile.get("experience_level", "student")
+
+    @classmethod
+    async def build(cls, profile: dict) -> "ProfileMatcher":
+        """Expand each user skill and the goal exactly once."""
+        user_skills = [s.lower() for s in profile.get("skills", [])]
+        goal = (profile.get("career_goal", "") or "").lower()
+
+        expansions = await asyncio.gather(*(get_related_skills(s) for s in user_skills))
+        goal_related = await get_related_skills(goal) if goal else set()
+
+        return cls(
+            profile,
+            [(skill, frozenset(exp)) for skill, exp in zip(user_skills, expansions)],
+            frozenset(goal_related),
+        )
+
+    def score(self, opportunity: dict) -> int:
+        """Score 0-100 how well an opportunity matches the user's profile"""
+        score = 0
+
+        # === SKILL MATCH (max 50 points) ===
+        opp_tags = [t.lower() for t in opportunity.get("tags", [])]
+        opp_tag_set = set(opp_tags)
+        opp_text = (
+            opportunity.get("title", "") + " " +
+            (opportunity.get("description", "") or "")
+        ).lower()
+
+        matched = 0.0
+        for skill, expanded in self.skill_expansions:
+            # Layer 1+3: Check expanded skills against opportunity
+            if not expanded.isdisjoint(opp_tag_set) or any(exp in opp_text for exp in expanded):
+                matched += 1.0
+            # Layer 2: Fuzzy fallback
+            elif any(fuzzy_match(skill, tag) for tag in opp_tags):
+                matched += 0.7
+
+        if self.skill_expansions:
+            score += min(int((matched / len(self.skill_expansions)) * 50), 50)
+
+        # === LOCATION MATCH (max 20 points) ===
+        opp_location = (opportunity.get("location", "") or "").lower()
+        if opportunity.get("is_remote"):
             score += 15
-        elif any(kw in opp_title for kw in ["senior", "lead", "manager", "principal", "staff"]):
-            score -= 10
-    elif user_level == "entry-level":
-        if any(kw in opp_title for kw in ["junior", "entry", "associate"]):
+        if self.user_city and self.user_city in opp_location:
+            score += 20
+        elif self.user_state and self.user_state in opp_location:
             score += 10
 
-    # === GOAL MATCH (max 15 points) ===
-    goal = (profile.get("career_goal", "") or "").lower()
-    if goal:
-        goal_related = await get_related_skills(goal)
-        if any(g in opp_text for g in goal_related):
+        # === LEVEL MATCH (max 15 points) ===
+        opp_title = opportunity.get("title", "").lower()
+        if self.user_level in ["student", "fresher"]:
+            if any(kw in opp_title for kw in _JUNIOR_TITLE_KEYWORDS):
+                score += 15
+            elif any(kw in opp_title for kw in _SENIOR_TITLE_KEYWORDS):
+                score -= 10
+        elif self.user_level == "entry-level":
+            if any(kw in opp_title for kw in _ENTRY_TITLE_KEYWORDS):
+                score += 10
+
+        # === GOAL MATCH (max 15 points) ===
+        if self.goal_related and any(g in opp_text for g in self.goal_related):
             score += 15
 
-    return max(0, min(score, 100))
+        return max(0, min(score, 100))
+
+    def score_all(self, opportunities: list[dict]) -> list[dict]:
+        """Score and sort a batch in place (highest score first)"""
+        for opp in opportunities:
+            opp["match_score"] = self.score(opp)
+        opportunities.sort(key=lambda x: x.get("match_score", 0), reverse=True)
+        return opportunities
+
+
+async def score_opportunity(opportunity: dict, profile: dict) -> int:
+    """Score a single opportunity. Prefer score_opportunities for batches."""
+    matcher = await ProfileMatcher.build(profile)
+    return matcher.score(opportunity)
 
 
 async def score_opportunities(opportunities: list[dict], profile: dict) -> list[dict]:
     """Score and sort a list of opportunities"""
-    for opp in opportunities:
-        opp["match_score"] = await score_opportunity(opp, profile)
-
-    # Sort: highest score first
-    opportunities.sort(key=lambda x: x.get("match_score", 0), reverse=True)
-    return opportunities
+    matcher = await ProfileMatcher.build(profile)
+    return matcher.score_all(opportunities)
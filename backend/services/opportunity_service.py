@@ -1,11 +1,19 @@
 """
 Opportunity Service — Main orchestrator.
 Coordinates API adapters, caching, scoring, and international programs.
+Identical searches (same cache key) are coalesced into one upstream fetch,
+and expired cache entries are served while a single background refresh runs.
+search_stream() yields each source's scored results as soon as it completes.
+Each adapter call's raw results are cached per query, so profiles that issue
+some of the same queries reuse them; the profile-level entry holds only API
+results, and international programs are matched per caller on every read.
 """
 
 import asyncio
 import logging
-from typing import Optional
+import os
+import time
+from typing import AsyncIterator, Awaitable, Callable, Optional
 
 from backend.database import get_supabase
 from backend.adapters.jsearch_adapter import JSearchAdapter
@@ -13,12 +21,22 @@ from backend.adapters.adzuna_adapter import AdzunaAdapter
 from backend.adapters.remotive_adapter import RemotiveAdapter
 from backend.adapters.arbeitnow_adapter import ArbeitnowAdapter
 from backend.services.query_builder import build_queries
-from backend.services.match_scorer import score_opportunities
-from backend.services.platform_registry import get_sources_for_user
-from backend.services.cache_service import build_cache_key, get_cached, set_cached
+from backend.services.match_scorer import ProfileMatcher, score_opportunities
+from backend.services.platform_registry import get_sources_for_user, filter_available
+from backend.services.cache_service import build_cache_key, build_query_cache_key, get_cached, set_cached
+from backend.utils import metrics
 
 logger = logging.getLogger(__name__)
 
+# Raw per-query adapter results (0 disables the per-query cache)
+QUERY_CACHE_TTL = int(os.environ.get("OPPORTUNITY_QUERY_CACHE_SECONDS", "7200"))
+# Active international_programs rows, held in-process for per-caller matching
+PROGRAMS_TTL = int(os.environ.get("INTERNATIONAL_PROGRAMS_CACHE_SECONDS", "600"))
+PROGRAMS_SOURCE = "international_programs"
+
+# on_batch(source, opportunity dicts), awaited as each source completes
+BatchCallback = Callable[[str, list[dict]], Awaitable[None]]
+
 
 class OpportunityService:
     """Main service that orchestrates all opportunity search logic"""
@@ -28,47 +46,201 @@ class OpportunityService:
         self.adzuna = AdzunaAdapter()
         self.remotive = RemotiveAdapter()
         self.arbeitnow = ArbeitnowAdapter()
+        # cache_key -> (in-flight fetch shared by every caller with that key, is a refresh)
+        self._inflight: dict[str, tuple[asyncio.Task, bool]] = {}
+        # (fetched_at, active international_programs rows)
+        self._programs: tuple[float, list] | None = None
 
     async def search(self, profile: dict, force_refresh: bool = False) -> dict:
         """
         Main search entry point.
-        1. Check cache
-        2. Build queries from profile
-        3. Fetch from all sources in parallel (multiple queries)
-        4. Deduplicate + Score + Sort
-        5. Cache results
-        6. Return
+        1. Check cache (stale entries are served and refreshed in the background)
+        2. Join the in-flight fetch for this cache key, or start one
+        3. Re-score shared results for this caller's profile
+        4. Return
         """
         cache_key = build_cache_key(profile)
 
         # Check cache (unless force refresh)
         if not force_refresh:
-            cached = await get_cached(cache_key)
-            if cached:
-                # Re-score cached results with current profile
-                opportunities = cached.get("opportunities", [])
-                scored = await score_opportunities(opportunities, profile)
-                return {
-                    "opportunities": scored,
-                    "total": len(scored),
-                    "cached": True,
-                    "source_breakdown": cached.get("source_breakdown", {}),
-                }
+            cached = await self._from_cache(cache_key, profile)
+            if cached is not None:
+                return cached
+
+        task, leader = self._start_fetch(cache_key, profile, refresh=force_refresh)
+        if not leader:
+            return await self._join(task, profile)
+        # Shield so one disconnecting caller doesn't cancel the fetch the others wait on
+        result = await asyncio.shield(task)
+        return {
+            "opportunities": result["opportunities"],
+            "total": len(result["opportunities"]),
+            "cached": False,
+            "source_breakdown": result["source_breakdown"],
+        }
+
+    async def _join(self, task: asyncio.Task, profile: dict) -> dict:
+        """Another caller's fetch, re-scored for this profile once it finishes."""
+        result = await asyncio.shield(task)
+        scored, source_breakdown = await self._personalize(result["opportunities"],
+                                                           result["source_breakdown"], profile)
+        return {
+            "opportunities": scored,
+            "total": len(scored),
+            "cached": False,
+            "source_breakdown": source_breakdown,
+        }
 
+    async def _from_cache(self, cache_key: str, profile: dict) -> dict | None:
+        """Cached results re-scored for this profile, or None on a miss (stale hits trigger a refresh)."""
+        with metrics.span("cache_read"):
+            cached = await get_cached(cache_key, allow_stale=True)
+        if not cached:
+            return None
+        stale = bool(cached.get("stale"))
+        if stale:
+            self._start_fetch(cache_key, profile)
+        # Re-score cached results with current profile
+        scored, source_breakdown = await self._personalize(
+            cached.get("opportunities", []), cached.get("source_breakdown"), profile)
+        return {
+            "opportunities": scored,
+            "total": len(scored),
+            "cached": True,
+            "stale": stale,
+            "source_breakdown": source_breakdown,
+        }
+
+    async def _personalize(self, opportunities: list[dict], source_breakdown: dict | None,
+                           profile: dict) -> tuple[list[dict], dict]:
+        """
+        Shared (cached or another caller's) results made this caller's: their
+        international programs swapped in, then everything re-scored.
+        """
+        shared = [dict(o) for o in opportunities if o.get("source") != PROGRAMS_SOURCE]
+        programs = await self._program_opportunities(profile)
+        seen = {self._dedup_key(o) for o in shared}
+        shared.extend(p for p in programs if self._dedup_key(p) not in seen)
+        with metrics.span("rescore"):
+            scored = await score_opportunities(shared, profile)
+        breakdown = {k: v for k, v in (source_breakdown or {}).items() if k != PROGRAMS_SOURCE}
+        breakdown[PROGRAMS_SOURCE] = len(programs)
+        return scored, breakdown
+
+    async def search_stream(self, profile: dict, force_refresh: bool = False) -> AsyncIterator[dict]:
+        """
+        Streaming search. Yields events as each source completes, so the first
+        results arrive as soon as the fastest source answers:
+          {"event": "batch", "source", "opportunities", "count", "elapsed_ms"}
+              one per source, scored and sorted, minus anything an earlier batch sent
+          {"event": "done", "opportunities", "total", "cached", "source_breakdown", "elapsed_ms"}
+              the merged, deduplicated ranking (same as search()); it supersedes the batches
+        Cache hits and joins of an identical in-flight fetch yield only "done".
+        The fetch is a shared task like search(): it finishes and fills the cache
+        even if the consumer stops reading.
+        """
+        started = time.perf_counter()
+        cache_key = build_cache_key(profile)
+
+        def elapsed_ms() -> float:
+            return round((time.perf_counter() - started) * 1000, 1)
+
+        if not force_refresh:
+            cached = await self._from_cache(cache_key, profile)
+            if cached is not None:
+                yield {"event": "done", **cached, "elapsed_ms": elapsed_ms()}
+                return
+        joined = self._joinable(cache_key, force_refresh)
+        if joined is not None:
+            # Someone else is already fetching this key: join it rather than fetch twice
+            result = await self._join(joined, profile)
+            yield {"event": "done", **result, "elapsed_ms": elapsed_ms()}
+            return
+
+        matcher = await ProfileMatcher.build(profile)
+        queue: asyncio.Queue[dict | None] = asyncio.Queue()
+        sent: set[str] = set()
+
+        async def on_batch(source: str, items: list[dict]):
+            with metrics.span("score"):
+                matcher.score_all(items)
+            fresh = []
+            for item in items:
+                key = self._dedup_key(item)
+                if key not in sent:
+                    sent.add(key)
+                    fresh.append(item)
+            queue.put_nowait({"event": "batch", "source": source, "opportunities": fresh,
+                              "count": len(fresh), "elapsed_ms": elapsed_ms()})
+
+        task, leader = self._start_fetch(cache_key, profile, on_batch, refresh=force_refresh)
+        if not leader:
+            # Another caller started the fetch while the matcher was being built: its
+            # batches and results are scored for their profile, so join like search()
+            result = await self._join(task, profile)
+            yield {"event": "done", **result, "elapsed_ms": elapsed_ms()}
+            return
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+
+        while (event := await queue.get()) is not None:
+            yield event
+
+        result = await asyncio.shield(task)
+        yield {
+            "event": "done",
+            "opportunities": result["opportunities"],
+            "total": len(result["opportunities"]),
+            "cached": False,
+            "source_breakdown": result["source_breakdown"],
+            "elapsed_ms": elapsed_ms(),
+        }
+
+    def _start_fetch(self, cache_key: str, profile: dict, on_batch: BatchCallback | None = None,
+                     refresh: bool = False) -> tuple[asyncio.Task, bool]:
+        """
+        Single-flight: return (task, started_here) for the fetch behind cache_key.
+        With refresh, per-query cached results are ignored and every adapter is
+        called; a refresh doesn't join a plain fetch, it supersedes it.
+        """
+        task = self._joinable(cache_key, refresh)
+        if task is not None:
+            return task, False
+
+        task = asyncio.create_task(self._fetch_and_cache(cache_key, profile, on_batch, refresh))
+        self._inflight[cache_key] = (task, refresh)
+
+        def _done(t: asyncio.Task):
+            if self._inflight.get(cache_key, (None,))[0] is t:
+                del self._inflight[cache_key]
+            if not t.cancelled() and t.exception():
+                logger.warning(f"Fetch for key {cache_key[:8]}... failed: {t.exception()}")
+
+        task.add_done_callback(_done)
+        return task, True
+
+    def _joinable(self, cache_key: str, refresh: bool) -> asyncio.Task | None:
+        """The in-flight fetch for cache_key, unless refresh is wanted and it isn't one."""
+        task, refreshing = self._inflight.get(cache_key, (None, False))
+        return task if refreshing or not refresh else None
+
+    def _plan_sources(self, profile: dict, refresh: bool = False) -> list[tuple[str, Awaitable[list]]]:
+        """(source name, fetch coroutine) for every source this profile should query, in priority order."""
         # Build search queries from profile
         queries = build_queries(profile)
         country = (profile.get("country") or "IN").upper()
 
         # Determine which sources to use
         sources = get_sources_for_user(country)
+        # Sources with an open circuit are skipped outright instead of costing a timeout
+        available = filter_available(sources)
+        skipped = [s for s in sources if s not in available]
+        if skipped:
+            logger.info(f"Skipping sources with open circuits: {skipped}")
+        sources = available
         logger.info(f"Searching {len(sources)} sources for country={country}, queries={queries}")
 
-        # Fetch from all sources in parallel — use MULTIPLE queries per source
-        all_results = []
-        source_breakdown = {}
-
-        tasks = []
-        task_names = []
+        # Use MULTIPLE queries per source
+        plan = []
 
         primary_query = queries[0] if queries else "software developer"
         secondary_query = queries[1] if len(queries) > 1 else primary_query
@@ -76,85 +248,136 @@ class OpportunityService:
 
         if "jsearch" in sources:
             # JSearch: use primary query (rate-limited, so conserve calls)
-            tasks.append(self._fetch_jsearch(primary_query, country))
-            task_names.append("jsearch")
+            plan.append(("jsearch", self._fetch_jsearch(primary_query, country, refresh=refresh)))
 
         if "adzuna" in sources:
             # Adzuna: use TWO queries to get more diverse results
-            tasks.append(self._fetch_adzuna_multi(primary_query, secondary_query, country))
-            task_names.append("adzuna")
+            plan.append(("adzuna", self._fetch_adzuna_multi(primary_query, secondary_query, country,
+                                                             refresh=refresh)))
 
         if "remotive" in sources:
             # Remotive: use broad + primary query for remote jobs
-            tasks.append(self._fetch_remotive_multi(primary_query, broad_query))
-            task_names.append("remotive")
+            plan.append(("remotive", self._fetch_remotive_multi(primary_query, broad_query, refresh=refresh)))
 
         if "arbeitnow" in sources:
             # Arbeitnow: fetch 2 pages with broad query
-            tasks.append(self._fetch_arbeitnow_multi(primary_query))
-            task_names.append("arbeitnow")
-
-        # Execute all in parallel
-        results_list = await asyncio.gather(*tasks, return_exceptions=True)
-
-        for name, result in zip(task_names, results_list):
-            if isinstance(result, Exception):
-                logger.warning(f"Source {name} failed: {result}")
-                source_breakdown[name] = 0
-            elif isinstance(result, list):
-                all_results.extend(result)
-                source_breakdown[name] = len(result)
-                logger.info(f"Source {name} returned {len(result)} results")
-            else:
-                source_breakdown[name] = 0
-
-        # Fetch international programs from our own DB
-        programs = await self._fetch_international_programs(profile)
-        all_results.extend(programs)
-        source_breakdown["international_programs"] = len(programs)
-
-        # Deduplicate
-        deduped = self._deduplicate(all_results)
-
-        # Convert OpportunityResult objects to dicts
-        opportunities = []
-        for item in deduped:
-            if hasattr(item, 'to_dict'):
-                opportunities.append(item.to_dict())
-            elif isinstance(item, dict):
-                opportunities.append(item)
+            plan.append(("arbeitnow", self._fetch_arbeitnow_multi(primary_query, refresh=refresh)))
 
-        # Score and sort
-        scored = await score_opportunities(opportunities, profile)
+        # International programs from our own DB, fetched alongside the APIs
+        plan.append((PROGRAMS_SOURCE, self._timed_international_programs(profile)))
+        return plan
 
-        # Cache the results
-        cache_data = {
-            "opportunities": scored,
-            "source_breakdown": source_breakdown,
-        }
-        await set_cached(cache_key, cache_data)
+    async def _timed_international_programs(self, profile: dict) -> list:
+        with metrics.span("international_programs"):
+            return await self._program_opportunities(profile)
+
+    async def _run_sources(self, plan: list[tuple[str, Awaitable[list]]],
+                           on_batch: BatchCallback | None = None) -> dict[str, list[dict]]:
+        """
+        Run every planned fetch concurrently and return {source: opportunity dicts}.
+        on_batch(source, dicts) is awaited as each source finishes, fastest first.
+        """
+        tasks = {asyncio.ensure_future(coro): name for name, coro in plan}
+        results: dict[str, list[dict]] = {}
+        pending = set(tasks)
+        try:
+            with metrics.span("adapter_fanout"):
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        name = tasks[task]
+                        if task.exception() is not None:
+                            logger.warning(f"Source {name} failed: {task.exception()}")
+                            results[name] = []
+                            continue
+                        # Convert OpportunityResult objects to dicts
+                        items = []
+                        for item in task.result() or []:
+                            if hasattr(item, 'to_dict'):
+                                items.append(item.to_dict())
+                            elif isinstance(item, dict):
+                                items.append(item)
+                        results[name] = items
+                        logger.info(f"Source {name} returned {len(items)} results")
+                        if on_batch is not None:
+                            await on_batch(name, items)
+        finally:
+            for task in pending:
+                task.cancel()
+        return results
+
+    async def _fetch_and_cache(self, cache_key: str, profile: dict,
+                               on_batch: BatchCallback | None = None, refresh: bool = False) -> dict:
+        """
+        Fetch all sources for profile, dedupe, score and write the cache.
+        With on_batch (streaming), each source's results are handed over as they
+        arrive; on_batch is expected to score them, so the merge only re-sorts.
+        """
+        plan = self._plan_sources(profile, refresh)
+        results = await self._run_sources(plan, on_batch)
+        source_breakdown = {name: len(results.get(name, [])) for name, _ in plan}
+
+        # Deduplicate in source priority order, whatever order the sources finished in
+        all_results = [item for name, _ in plan for item in results.get(name, [])]
+        with metrics.span("dedup"):
+            opportunities = self._deduplicate(all_results)
+
+        # Score and sort
+        if on_batch is None:
+            with metrics.span("score"):
+                scored = await score_opportunities(opportunities, profile)
+        else:
+            scored = sorted(opportunities, key=lambda x: x.get("match_score", 0), reverse=True)
+
+        # Cache the results; programs are matched per caller, so the shared entry holds only API results.
+        # Skipped if a refresh superseded this fetch meanwhile (_start_fetch): its results are newer
+        if self._inflight.get(cache_key, (None,))[0] is asyncio.current_task():
+            cache_data = {
+                "opportunities": [o for o in scored if o.get("source") != PROGRAMS_SOURCE],
+                "source_breakdown": {k: v for k, v in source_breakdown.items() if k != PROGRAMS_SOURCE},
+            }
+            with metrics.span("cache_write"):
+                await set_cached(cache_key, cache_data)
 
         return {
             "opportunities": scored,
-            "total": len(scored),
-            "cached": False,
             "source_breakdown": source_breakdown,
         }
 
-    async def _fetch_jsearch(self, query: str, country: str) -> list:
+    async def _cached_search(self, source: str, search: Callable[..., Awaitable[list]], query: str,
+                             *params, refresh: bool = False) -> list:
+        """
+        One adapter call through the per-query cache. Results are stored as dicts
+        and handed out as copies, since scoring mutates them. Empty results are
+        not cached (they are often an open circuit or an upstream hiccup).
+        """
+        if QUERY_CACHE_TTL <= 0:
+            return await search(query, *params)
+        key = build_query_cache_key(source, query, *params)
+        if not refresh:
+            cached = await get_cached(key)
+            if cached is not None:
+                return [dict(o) for o in cached["opportunities"]]
+        results = [r.to_dict() if hasattr(r, "to_dict") else r for r in await search(query, *params)]
+        if results:
+            await set_cached(key, {"opportunities": [dict(o) for o in results], "source_breakdown": None},
+                             ttl_seconds=QUERY_CACHE_TTL)
+        return results
+
+    async def _fetch_jsearch(self, query: str, country: str, refresh: bool = False) -> list:
         """Fetch from JSearch with error handling"""
         try:
-            return await self.jsearch.search(query, country)
+            return await self._cached_search("jsearch", self.jsearch.search, query, country, refresh=refresh)
         except Exception as e:
             logger.warning(f"JSearch failed: {e}")
             return []
 
-    async def _fetch_adzuna_multi(self, query1: str, query2: str, country: str) -> list:
+    async def _fetch_adzuna_multi(self, query1: str, query2: str, country: str, refresh: bool = False) -> list:
         """Fetch from Adzuna with TWO queries for diversity"""
         try:
             results1, results2 = await asyncio.gather(
-                self.adzuna.search(query1, country),
-                self.adzuna.search(query2, country),
+                self._cached_search("adzuna", self.adzuna.search, query1, country, refresh=refresh),
+                self._cached_search("adzuna", self.adzuna.search, query2, country, refresh=refresh),
                 return_exceptions=True,
             )
             combined = []
@@ -167,14 +390,15 @@ class OpportunityService:
             logger.warning(f"Adzuna failed: {e}")
             return []
 
-    async def _fetch_remotive_multi(self, query: str, broad_query: str) -> list:
+    async def _fetch_remotive_multi(self, query: str, broad_query: str, refresh: bool = False) -> list:
         """Fetch from Remotive with primary + broad query for more results"""
         try:
             # First, try specific query; then broad; also a category-based fetch
             results1, results2, results3 = await asyncio.gather(
-                self.remotive.search(query),
-                self.remotive.search(broad_query),
-                self.remotive.search(""),  # fetch latest remote jobs (no filter)
+                self._cached_search("remotive", self.remotive.search, query, refresh=refresh),
+                self._cached_search("remotive", self.remotive.search, broad_query, refresh=refresh),
+                # fetch latest remote jobs (no filter)
+                self._cached_search("remotive", self.remotive.search, "", refresh=refresh),
                 return_exceptions=True,
             )
             combined = []
@@ -189,13 +413,14 @@ class OpportunityService:
             logger.warning(f"Remotive failed: {e}")
             return []
 
-    async def _fetch_arbeitnow_multi(self, query: str) -> list:
+    async def _fetch_arbeitnow_multi(self, query: str, refresh: bool = False) -> list:
         """Fetch from Arbeitnow with broad + paginated results"""
         try:
             # Fetch page 1 (broad) + page 1 with query filter
             results1, results2 = await asyncio.gather(
-                self.arbeitnow.search(""),  # all tech jobs, no filter
-                self.arbeitnow.search(query),
+                # all tech jobs, no filter
+                self._cached_search("arbeitnow", self.arbeitnow.search, "", refresh=refresh),
+                self._cached_search("arbeitnow", self.arbeitnow.search, query, refresh=refresh),
                 return_exceptions=True,
             )
             combined = []
@@ -208,22 +433,28 @@ class OpportunityService:
             logger.warning(f"Arbeitnow failed: {e}")
             return []
 
-    async def _fetch_international_programs(self, profile: dict) -> list:
-        """Fetch matching international programs from our DB"""
+    def _active_programs(self) -> list:
+        """Active international_programs rows, re-read from our DB at most every PROGRAMS_TTL seconds"""
+        now = time.monotonic()
+        if self._programs is not None and now - self._programs[0] < PROGRAMS_TTL:
+            return self._programs[1]
+        supabase = get_supabase()
+        if not supabase:
+            return []
+        result = supabase.table("international_programs") \
+            .select("*") \
+            .eq("is_active", True) \
+            .execute()
+        self._programs = (now, result.data or [])
+        return self._programs[1]
+
+    async def _program_opportunities(self, profile: dict) -> list:
+        """International programs matching this profile, as opportunity dicts"""
         try:
-            supabase = get_supabase()
-            if not supabase:
+            programs = self._active_programs()
+            if not programs:
                 return []
 
-            result = supabase.table("international_programs") \
-                .select("*") \
-                .eq("is_active", True) \
-                .execute()
-
-            if not result.data:
-                return []
-
-            programs = result.data
             matched = self._match_programs(programs, profile)
 
             # Convert to opportunity-like dicts
@@ -235,7 +466,7 @@ class OpportunityService:
                     "company": prog.get("organization", ""),
                     "location": prog.get("country", "International"),
                     "url": prog.get("application_url", ""),
-                    "source": "international_programs",
+                    "source": PROGRAMS_SOURCE,
                     "type": "program",
                     "country": prog.get("country", ""),
                     "is_remote": False,
@@ -283,16 +514,22 @@ class OpportunityService:
 
         return matched
 
+    @staticmethod
+    def _dedup_key(item) -> str | None:
+        """title+company identity used for dedup (None for items that can't be keyed)"""
+        if hasattr(item, 'title'):
+            return f"{item.title.lower().strip()[:50]}|{item.company.lower().strip()}"
+        if isinstance(item, dict):
+            return f"{item.get('title', '').lower().strip()[:50]}|{item.get('company', '').lower().strip()}"
+        return None
+
     def _deduplicate(self, results: list) -> list:
         """Remove duplicate opportunities based on title+company similarity"""
         seen = set()
         unique = []
         for item in results:
-            if hasattr(item, 'title'):
-                key = f"{item.title.lower().strip()[:50]}|{item.company.lower().strip()}"
-            elif isinstance(item, dict):
-                key = f"{item.get('title', '').lower().strip()[:50]}|{item.get('company', '').lower().strip()}"
-            else:
+            key = self._dedup_key(item)
+            if key is None:
                 unique.append(item)
                 continue
 
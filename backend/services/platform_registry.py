@@ -1,8 +1,19 @@
 """
 Platform Registry — Maps user country to available API sources.
-Determines which adapters to call based on the user's location.
+Determines which adapters to call based on the user's location, and keeps
+a circuit breaker per source: after consecutive failures the source is
+skipped for a cool-down, then a single half-open probe decides whether it
+comes back. Each breaker also tracks recent latencies so BaseAdapter._get
+can bound requests by the source's own p95 instead of a fixed timeout.
 """
 
+import os
+import threading
+import time
+from collections import deque
+
+from backend.utils import metrics
+
 PLATFORM_CONFIG = {
     "jsearch": {
         "regions": ["ALL"],
@@ -57,3 +68,164 @@ def get_sources_for_user(country: str) -> list[str]:
 def get_platform_config(name: str) -> dict:
     """Get config for a specific platform"""
     return PLATFORM_CONFIG.get(name, {})
+
+
+# ─── Circuit breakers / adaptive timeouts ─────────────────────
+
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_SECONDS = float(os.environ.get("BREAKER_RESET_SECONDS", "30"))
+ADAPTIVE_TIMEOUT_FACTOR = float(os.environ.get("ADAPTIVE_TIMEOUT_FACTOR", "3"))
+ADAPTIVE_TIMEOUT_MIN = float(os.environ.get("ADAPTIVE_TIMEOUT_MIN", "2"))
+# Ceiling (and the timeout used until a source has enough samples) — same knob as the adapters
+ADAPTIVE_TIMEOUT_MAX = float(os.environ.get("ADAPTER_TIMEOUT", "15"))
+LATENCY_WINDOW = 50
+LATENCY_MIN_SAMPLES = 10
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+_STATE_CODES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a source whose circuit is open."""
+
+    def __init__(self, source: str):
+        super().__init__(f"{source} circuit open")
+        self.source = source
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker for one source.
+    closed → open after `failure_threshold` failures in a row; open → half-open
+    once `reset_seconds` have passed, letting exactly one probe through;
+    the probe's result closes or re-opens the circuit.
+    """
+
+    def __init__(self, source: str, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_seconds: float = BREAKER_RESET_SECONDS):
+        self.source = source
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._timeout = ADAPTIVE_TIMEOUT_MAX
+        self._lock = threading.Lock()
+        self.stats = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    def _maybe_half_open(self, now: float):
+        if self.state == OPEN and now - self.opened_at >= self.reset_seconds:
+            self.state = HALF_OPEN
+            self._probe_in_flight = False
+
+    def is_available(self) -> bool:
+        """Whether a request would currently be let through (does not claim the probe slot)."""
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            return self.state == CLOSED or (self.state == HALF_OPEN and not self._probe_in_flight)
+
+    def allow_request(self) -> bool:
+        """Claim permission for one request; in half-open only the first caller gets through."""
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.stats["rejected"] += 1
+            return False
+
+    def record_success(self, latency: float):
+        with self._lock:
+            self.stats["successes"] += 1
+            self.consecutive_failures = 0
+            self.state = CLOSED
+            self._probe_in_flight = False
+            self._latencies.append(latency)
+            self._timeout = self._adaptive_timeout()
+
+    def record_failure(self):
+        with self._lock:
+            self.stats["failures"] += 1
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.stats["opened"] += 1
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                # Timeouts leave no latency samples, so the window only describes how fast the
+                # source used to be; relearn from the ceiling once it recovers
+                self._latencies.clear()
+                self._timeout = ADAPTIVE_TIMEOUT_MAX
+            self._probe_in_flight = False
+
+    def release(self):
+        """The request ended without a verdict (e.g. the caller was cancelled)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _adaptive_timeout(self) -> float:
+        if len(self._latencies) < LATENCY_MIN_SAMPLES:
+            return ADAPTIVE_TIMEOUT_MAX
+        ordered = sorted(self._latencies)
+        p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+        return min(ADAPTIVE_TIMEOUT_MAX, max(ADAPTIVE_TIMEOUT_MIN, p95 * ADAPTIVE_TIMEOUT_FACTOR))
+
+    def current_timeout(self) -> float:
+        """
+        Timeout for the next request: recent p95 × ADAPTIVE_TIMEOUT_FACTOR, clamped
+        to [MIN, MAX]. A half-open probe always gets MAX, so a source that has
+        merely slowed down can close the circuit again.
+        """
+        with self._lock:
+            return ADAPTIVE_TIMEOUT_MAX if self.state == HALF_OPEN else self._timeout
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            ordered = sorted(self._latencies)
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "timeout_s": round(self._timeout, 3),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] * 1000, 1) if ordered else None,
+                "samples": len(ordered),
+                **self.stats,
+            }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(source: str) -> CircuitBreaker:
+    breaker = _breakers.get(source)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(source, CircuitBreaker(source))
+    return breaker
+
+
+def filter_available(sources: list[str]) -> list[str]:
+    """Drop sources whose circuit is open (half-open sources stay, so they can be probed)."""
+    return [s for s in sources if get_breaker(s).is_available()]
+
+
+def breaker_stats() -> dict:
+    return {name: breaker.snapshot() for name, breaker in sorted(_breakers.items())}
+
+
+def _metric_families() -> list:
+    snapshots = breaker_stats()
+    return [
+        ("adapter_circuit_state", "gauge", "Circuit state per source (0 closed, 1 half-open, 2 open)",
+         [({"source": n}, _STATE_CODES[s["state"]]) for n, s in snapshots.items()]),
+        ("adapter_timeout_seconds", "gauge", "Current adaptive request timeout per source",
+         [({"source": n}, s["timeout_s"]) for n, s in snapshots.items()]),
+    ]
+
+
+metrics.register_collector(_metric_families)
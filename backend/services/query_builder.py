@@ -1,13 +1,32 @@
 """
 Query Builder — Builds search queries from user profile.
+Skills and goal are canonicalized first, so profiles that differ only in
+casing, synonyms ("ML" / "machine learning") or the order of their second
+and third skills issue the same queries (and share cache entries). The
+first-listed skill stays the primary query: adapters with the tightest call
+budgets (JSearch, Adzuna) only search the first one or two.
 """
 
+from backend.services.skill_matcher import canonical_skill
+
+
+def top_skills(profile: dict, n: int = 3) -> list[str]:
+    """The first n distinct canonical skills: the user's first skill, then the rest sorted so their order doesn't matter."""
+    picked = []
+    for skill in profile.get("skills") or []:
+        canonical = canonical_skill(skill)
+        if canonical and canonical not in picked:
+            picked.append(canonical)
+        if len(picked) == n:
+            break
+    return picked[:1] + sorted(picked[1:])
+
 
 def build_queries(profile: dict) -> list[str]:
     """Build 4-6 search queries from user profile"""
     queries = []
-    skills = profile.get("skills", [])[:5]
-    goal = profile.get("career_goal", "")
+    skills = top_skills(profile)
+    goal = canonical_skill(profile.get("career_goal") or "")
     level = profile.get("experience_level", "student")
 
     level_keyword = {
@@ -22,7 +41,7 @@ def build_queries(profile: dict) -> list[str]:
         queries.append(f"{goal} {level_keyword}".strip())
 
     # Top skill queries
-    for skill in skills[:3]:
+    for skill in skills:
         queries.append(f"{skill} {level_keyword}".strip())
 
     # Combined skill query
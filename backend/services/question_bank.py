@@ -0,0 +1,375 @@
+"""
+Question Bank — reusable interview questions for /api/prep/generate-quiz.
+
+Every quiz Gemini generates is kept in the question_bank table (see
+sql/014_question_bank.sql), one row per question, tagged with the job, a
+normalized role, the canonical tech stack, topic and difficulty. A quiz
+request is assembled from the bank when it holds enough questions the user
+has not seen in recent sessions, drawn from the same job first, then the
+same role, then questions whose topic is in the requested stack. Otherwise
+Gemini generates the quiz as before. When a pool runs thin, a background
+top-up generates more at BACKGROUND priority, so popular roles stay covered
+without anyone waiting on the 20-question prompt.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import time
+from uuid import uuid4
+
+from backend.database import get_supabase
+from backend.services.job_features import normalize_text
+from backend.services.skill_matcher import canonical_skill
+from backend.utils import metrics
+from backend.utils.gemini_client import get_gemini_client
+from backend.utils.llm_scheduler import Priority
+
+logger = logging.getLogger(__name__)
+
+# QUESTION_BANK_ENABLED=0 sends every quiz to Gemini (questions are still banked)
+ENABLED = os.environ.get("QUESTION_BANK_ENABLED", "1").lower() not in ("0", "false", "no")
+# Top up once fewer than this many quizzes' worth of unseen questions remain
+TOPUP_FACTOR = float(os.environ.get("QUESTION_BANK_TOPUP_FACTOR", "2"))
+# At most one top-up per role in this window (per worker)
+TOPUP_COOLDOWN = int(os.environ.get("QUESTION_BANK_TOPUP_COOLDOWN", "600"))
+# Questions from the user's last N prep sessions are not served again
+SEEN_SESSIONS = int(os.environ.get("QUESTION_BANK_SEEN_SESSIONS", "5"))
+CANDIDATE_LIMIT = 500
+
+QUIZ_MIX = {"mcq": 10, "short_answer": 6, "coding": 4}
+DIFFICULTY_MIX = {"easy": 6, "medium": 8, "hard": 6}
+QUIZ_SIZE = sum(QUIZ_MIX.values())
+# First pass caps questions per topic so one stack item doesn't fill the quiz
+TOPIC_CAP = 4
+
+# Relevance tiers for candidates
+_TIER_JOB, _TIER_ROLE, _TIER_STACK = 3, 2, 1
+
+_SENIORITY = re.compile(r"\b(intern(ship)?|junior|senior|sr|jr|trainee|fresher|entry level|graduate|i{1,3})\b")
+
+
+def role_key(job_title: str) -> str:
+    """'Senior Backend Developer (Python)' -> 'backend developer python'."""
+    text = re.sub(r"[^a-z0-9+#.\s]", " ", normalize_text(job_title))
+    return " ".join(_SENIORITY.sub(" ", text).split())
+
+
+def stack_keys(tech_stack: list[str]) -> list[str]:
+    """Canonical, de-duplicated stack items in the given order."""
+    keys = []
+    for item in tech_stack or []:
+        key = canonical_skill(item)
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def fingerprint(question: dict) -> str:
+    text = f"{question.get('type')}:{normalize_text(question.get('question'))}"
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+# ─── Generation ────────────────────────────────────────────────
+
+def build_quiz_prompt(job_title: str, company: str, tech_stack: list[str], requirements: list[str],
+                      responsibilities: list[str], avoid: list[str] | None = None) -> str:
+    tech_str = ", ".join(tech_stack[:15]) if tech_stack else "general programming"
+    reqs_str = "\n".join(f"- {r}" for r in requirements[:8]) if requirements else "Not specified"
+    resp_str = "\n".join(f"- {r}" for r in responsibilities[:6]) if responsibilities else "Not specified"
+    avoid_str = ""
+    if avoid:
+        avoid_str = "\n- Do NOT repeat or paraphrase these existing questions:\n" + \
+                    "\n".join(f"  - {q[:160]}" for q in avoid[:30])
+
+    return f"""You are an expert technical interviewer. Generate exactly 20 interview questions for this role.
+
+**Role:** {job_title}
+**Company:** {company}
+**Tech Stack:** {tech_str}
+**Requirements:**
+{reqs_str}
+**Responsibilities:**
+{resp_str}
+
+Generate a MIX of question types:
+- 10 Multiple Choice Questions (MCQ) — 4 options each, exactly one correct
+- 6 Short Answer Questions — need 1-3 sentence answers
+- 4 Coding Questions — small code problems solvable in 5-15 lines
+
+Return ONLY valid JSON array with this exact structure for each question:
+[
+  {{
+    "index": 0,
+    "type": "mcq",
+    "question": "What is...",
+    "options": ["A) ...", "B) ...", "C) ...", "D) ..."],
+    "correct_answer": "B) ...",
+    "topic": "Python",
+    "difficulty": "easy"
+  }},
+  {{
+    "index": 10,
+    "type": "short_answer",
+    "question": "Explain...",
+    "correct_answer": "Expected answer summary",
+    "topic": "System Design",
+    "difficulty": "medium"
+  }},
+  {{
+    "index": 16,
+    "type": "coding",
+    "question": "Write a function that...",
+    "correct_answer": "def solution(nums):\\n    ...",
+    "function_name": "solution",
+    "tests": [{{"args": [[1, 2, 3]], "expected": 6}}],
+    "topic": "Algorithms",
+    "difficulty": "medium"
+  }}
+]
+
+Rules:
+- Questions must be relevant to the tech stack and role
+- MCQ options must be plausible — no obviously wrong answers
+- Coding questions should be solvable in 5-15 lines
+- Coding questions: correct_answer is a Python function named function_name; give 3-5 tests
+  whose args and expected return value are plain JSON values, and that correct_answer passes
+- Difficulty spread: 6 easy, 8 medium, 6 hard
+- Index from 0 to 19
+- Topics should match the tech stack items{avoid_str}"""
+
+
+def parse_questions(text: str) -> list[dict]:
+    """Gemini's quiz JSON (markdown fences tolerated), trimmed to 20 and re-indexed."""
+    text = text.strip()
+    if text.startswith("```"):
+        text = re.sub(r"^```\w*\n?", "", text)
+        text = re.sub(r"\n?```$", "", text)
+    questions = json.loads(text)[:QUIZ_SIZE]
+    for i, q in enumerate(questions):
+        q["index"] = i
+    return questions
+
+
+class QuestionBank:
+    def __init__(self):
+        self._topups: dict[str, float] = {}  # role -> last top-up start
+        self._tasks: set[asyncio.Task] = set()
+
+    # ─── Reads ─────────────────────────────────────────────────
+
+    def _candidates(self, job_id: str, role: str, stack: list[str]) -> list[tuple[int, dict]]:
+        """(tier, row) for every banked question matching the job, role or a stack topic."""
+        supabase = get_supabase()
+        if not supabase:
+            return []
+        table = "question_bank"
+        tiers: dict[str, tuple[int, dict]] = {}
+        lookups = [(_TIER_JOB, "job_id", job_id), (_TIER_ROLE, "role_key", role)]
+        for tier, column, value in lookups:
+            if not value:
+                continue
+            rows = supabase.table(table).select("*").eq(column, value).limit(CANDIDATE_LIMIT).execute().data
+            for row in rows or []:
+                tiers.setdefault(row["id"], (tier, row))
+        if stack:
+            rows = supabase.table(table).select("*").in_("topic_key", stack).limit(CANDIDATE_LIMIT).execute().data
+            for row in rows or []:
+                tiers.setdefault(row["id"], (_TIER_STACK, row))
+        return list(tiers.values())
+
+    def _seen_ids(self, user_id: str) -> set[str]:
+        """Bank ids served to this user in their most recent prep sessions."""
+        supabase = get_supabase()
+        if not supabase or SEEN_SESSIONS <= 0:
+            return set()
+        rows = supabase.table("prep_sessions").select("questions").eq("user_id", user_id) \
+            .order("created_at", desc=True).limit(SEEN_SESSIONS).execute().data
+        return {q["bank_id"] for row in rows or [] for q in row.get("questions") or [] if q.get("bank_id")}
+
+    @staticmethod
+    def _pick(pools: dict[str, list[tuple[int, dict]]], rng: random.Random) -> list[dict] | None:
+        """
+        QUIZ_MIX questions per type, most relevant tier first (random within a
+        tier), steering toward DIFFICULTY_MIX and TOPIC_CAP. None if any type
+        is short.
+        """
+        difficulty_left = dict(DIFFICULTY_MIX)
+        topics: dict[str, int] = {}
+        quiz = []
+        for qtype, needed in QUIZ_MIX.items():
+            pool = pools.get(qtype, [])
+            if len(pool) < needed:
+                return None
+            rng.shuffle(pool)
+            pool.sort(key=lambda c: -c[0])
+            chosen: list[dict] = []
+            # Strict pass honours difficulty and topic targets; the second fills what's left
+            for strict in (True, False):
+                for _, row in pool:
+                    if len(chosen) == needed:
+                        break
+                    if any(row is c for c in chosen):
+                        continue
+                    difficulty = row.get("difficulty") or "medium"
+                    topic = row.get("topic_key") or ""
+                    if strict and (difficulty_left.get(difficulty, 0) <= 0 or topics.get(topic, 0) >= TOPIC_CAP):
+                        continue
+                    chosen.append(row)
+                    difficulty_left[difficulty] = difficulty_left.get(difficulty, 0) - 1
+                    topics[topic] = topics.get(topic, 0) + 1
+            quiz += chosen
+        return quiz
+
+    async def assemble_quiz(self, user_id: str, job_id: str, job_title: str, company: str,
+                            tech_stack: list[str], requirements: list[str] | None = None,
+                            responsibilities: list[str] | None = None) -> list[dict] | None:
+        """
+        A 20-question quiz from the bank, or None when coverage is too thin (the
+        caller generates one with Gemini and banks it). Schedules a top-up when
+        a quiz was served but the pool is running low.
+        """
+        if not ENABLED:
+            return None
+        role, stack = role_key(job_title), stack_keys(tech_stack)
+        try:
+            with metrics.span("question_bank_lookup"):
+                candidates, seen = await asyncio.gather(
+                    asyncio.to_thread(self._candidates, job_id, role, stack),
+                    asyncio.to_thread(self._seen_ids, user_id),
+                )
+        except Exception as e:
+            logger.warning(f"Question bank lookup failed: {e}")
+            return None
+
+        pools: dict[str, list[tuple[int, dict]]] = {}
+        for tier, row in candidates:
+            if row["id"] not in seen and row.get("type") in QUIZ_MIX:
+                pools.setdefault(row["type"], []).append((tier, row))
+        picked = self._pick(pools, random.Random())
+        metrics.inc("question_bank_quizzes_total", result="hit" if picked else "miss")
+        if picked is None:
+            # The caller's Gemini quiz is banked anyway; a top-up now would be a
+            # second large prompt, unaware of those questions
+            return None
+        if any(len(pools.get(t, [])) < n * TOPUP_FACTOR for t, n in QUIZ_MIX.items()):
+            self.top_up(job_id, job_title, company, tech_stack, requirements or [], responsibilities or [],
+                        existing=[row["question"] for _, row in candidates])
+        return [self._as_question(i, row) for i, row in enumerate(picked)]
+
+    @staticmethod
+    def _as_question(index: int, row: dict) -> dict:
+        question = {
+            "index": index,
+            "type": row["type"],
+            "question": row["question"],
+            "correct_answer": row.get("correct_answer") or "",
+            "topic": row.get("topic") or "",
+            "difficulty": row.get("difficulty") or "medium",
+            "bank_id": row["id"],
+        }
+        if row["type"] == "mcq":
+            question["options"] = row.get("options") or []
+        elif row["type"] == "coding" and row.get("tests"):
+            question["function_name"] = row.get("function_name")
+            question["tests"] = row["tests"]
+        return question
+
+    # ─── Writes ────────────────────────────────────────────────
+
+    def tag(self, questions: list[dict], job_id: str, job_title: str, company: str,
+            tech_stack: list[str]) -> list[dict]:
+        """
+        Give freshly generated questions provisional bank ids (in place) and
+        return the question_bank rows for them. store() swaps in the id of the
+        row actually kept, so the session records what the user has seen.
+        """
+        role, stack = role_key(job_title), stack_keys(tech_stack)
+        rows = []
+        for q in questions:
+            if q.get("type") not in QUIZ_MIX or not q.get("question"):
+                continue
+            q["bank_id"] = str(uuid4())
+            rows.append({
+                "id": q["bank_id"],
+                "fingerprint": fingerprint(q),
+                "job_id": job_id,
+                "role_key": role,
+                "company": company,
+                "type": q["type"],
+                "question": q["question"],
+                "options": q.get("options") if q["type"] == "mcq" else None,
+                "correct_answer": q.get("correct_answer", ""),
+                "function_name": q.get("function_name") if q["type"] == "coding" else None,
+                "tests": q.get("tests") if q["type"] == "coding" else None,
+                "topic": q.get("topic", ""),
+                "topic_key": canonical_skill(q.get("topic") or ""),
+                "difficulty": (q.get("difficulty") or "medium").lower(),
+                "tech_stack": stack,
+            })
+        return rows
+
+    def _store(self, rows: list[dict]) -> dict[str, str]:
+        """Upsert rows; returns fingerprint -> id of the row stored for it."""
+        supabase = get_supabase()
+        if not (supabase and rows):
+            return {}
+        # A question already banked (same type + text) keeps its original row and id
+        supabase.table("question_bank").upsert(rows, on_conflict="fingerprint", ignore_duplicates=True).execute()
+        stored = supabase.table("question_bank").select("id,fingerprint") \
+            .in_("fingerprint", [row["fingerprint"] for row in rows]).execute().data
+        return {row["fingerprint"]: row["id"] for row in stored or []}
+
+    async def store(self, questions: list[dict], rows: list[dict]):
+        """Bank tagged questions, pointing each question's bank_id at the row that holds it."""
+        try:
+            ids = await asyncio.to_thread(self._store, rows)
+        except Exception as e:
+            logger.warning(f"Question bank store failed: {e}")
+            return
+        fingerprints = {row["id"]: row["fingerprint"] for row in rows}
+        for q in questions:
+            stored_id = ids.get(fingerprints.get(q.get("bank_id")))
+            if stored_id:
+                q["bank_id"] = stored_id
+
+    def top_up(self, job_id: str, job_title: str, company: str, tech_stack: list[str],
+               requirements: list[str], responsibilities: list[str], existing: list[str] | None = None):
+        """Generate one more quiz's worth of questions for this role in the background (rate-limited per role)."""
+        role = role_key(job_title) or job_id
+        now = time.monotonic()
+        if now - self._topups.get(role, -TOPUP_COOLDOWN) < TOPUP_COOLDOWN:
+            return
+        self._topups[role] = now
+        self._spawn(self._top_up(job_id, job_title, company, tech_stack, requirements, responsibilities,
+                                 existing or []), "top_up")
+
+    async def _top_up(self, job_id, job_title, company, tech_stack, requirements, responsibilities, existing):
+        client = get_gemini_client()
+        if not client.model:
+            return
+        prompt = build_quiz_prompt(job_title, company, tech_stack, requirements, responsibilities, avoid=existing)
+        text = await client.generate_text(prompt, timeout=120, priority=Priority.BACKGROUND)
+        rows = self.tag(parse_questions(text), job_id, job_title, company, tech_stack)
+        await asyncio.to_thread(self._store, rows)
+        metrics.inc("question_bank_topups_total")
+        logger.info(f"Question bank topped up with {len(rows)} questions for '{role_key(job_title)}'")
+
+    def _spawn(self, coro, what: str):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+
+        def _done(t: asyncio.Task):
+            self._tasks.discard(t)
+            if not t.cancelled() and t.exception():
+                logger.warning(f"Question bank {what} failed: {t.exception()}")
+
+        task.add_done_callback(_done)
+
+
+metrics.get_registry().describe("question_bank_quizzes_total", "counter", "Quiz requests served from the bank (hit) or sent to Gemini (miss)")
+metrics.get_registry().describe("question_bank_topups_total", "counter", "Background question bank top-ups completed")
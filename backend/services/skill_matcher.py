@@ -113,6 +113,62 @@ def fuzzy_match(skill: str, target: str) -> bool:
     return False
 
 
+# Inverted index over LAYER 1 + abbreviations, built once at import:
+# child skill -> every parent whose children list contains it
+_PARENT_INDEX: dict[str, tuple[str, ...]] = {}
+for _parent, _children in SKILL_HIERARCHY.items():
+    for _child in _children:
+        _PARENT_INDEX[_child] = _PARENT_INDEX.get(_child, ()) + (_parent,)
+
+
+def _squash(term: str) -> str:
+    """Letters and digits only: "Node.js", "nodejs" and "node js" all squash to "nodejs"."""
+    return "".join(ch for ch in term if ch.isalnum())
+
+
+# Squashed spelling -> the hierarchy's spelling, for every skill LAYER 1 knows
+_CANONICAL_NAMES: dict[str, str] = {}
+for _name in [*SKILL_HIERARCHY, *_PARENT_INDEX, *ABBREVIATIONS.values()]:
+    _CANONICAL_NAMES.setdefault(_squash(_name), _name)
+
+
+def canonical_skill(skill: str) -> str:
+    """
+    Canonical id for a skill: lowercased, whitespace collapsed, abbreviations
+    expanded ("ML" -> "machine learning") and spelling variants of hierarchy
+    skills folded ("NodeJS", "Node.js" -> "node.js"; "ReactJS" -> "react").
+    Unknown skills are returned normalized but otherwise unchanged.
+    """
+    s = " ".join(skill.lower().split())
+    s = ABBREVIATIONS.get(s, s)
+    squashed = _squash(s)
+    if squashed in _CANONICAL_NAMES:
+        return _CANONICAL_NAMES[squashed]
+    if len(squashed) > 2 and squashed.endswith("js") and squashed[:-2] in _CANONICAL_NAMES:
+        return _CANONICAL_NAMES[squashed[:-2]]
+    return s
+
+
+def static_related_skills(skill: str) -> set[str] | None:
+    """
+    Layer 1 lookup via the inverted index (abbreviations resolved first).
+    Returns None when the skill is unknown to the static hierarchy.
+    """
+    skill_lower = skill.lower().strip()
+    related = {skill_lower}
+    found = False
+    for term in {skill_lower, ABBREVIATIONS.get(skill_lower, skill_lower)}:
+        if term in SKILL_HIERARCHY:
+            related.add(term)
+            related.update(SKILL_HIERARCHY[term])
+            found = True
+        for parent in _PARENT_INDEX.get(term, ()):
+            related.add(parent)
+            related.update(SKILL_HIERARCHY[parent])
+            found = True
+    return related if found else None
+
+
 # ═══════════════════════════════════════════
 # LAYER 3: Gemini AI Dynamic Expansion
 # ═══════════════════════════════════════════
@@ -139,27 +195,19 @@ async def ai_expand_skill(skill: str) -> set[str]:
 
     # Not cached → ask Gemini (only happens ONCE per skill, ever)
     try:
-        import os
-        import google.generativeai as genai
-        from dotenv import load_dotenv
-        from pathlib import Path
-
-        env_path = Path(__file__).resolve().parent.parent.parent / '.env'
-        load_dotenv(dotenv_path=env_path, override=True)
+        from backend.utils.gemini_client import get_gemini_client
+        from backend.utils.llm_scheduler import Priority
 
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
+        client = get_gemini_client()
+        if not client.model:
             return {skill_lower}
 
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-flash-latest')
-
         prompt = f"""List exactly 15 technical skills closely related to "{skill}".
 Return ONLY a comma-separated list, nothing else. No numbering, no explanations.
 Example for "React": javascript, jsx, redux, next.js, hooks, components, virtual dom, webpack, babel, typescript, frontend, spa, state management, react native, material ui"""
 
-        response = model.generate_content(prompt, request_options={'timeout': 15})
-        related = {s.strip().lower() for s in response.text.split(",") if s.strip()}
+        text = await client.generate_text(prompt, timeout=15, priority=Priority.BACKGROUND)
+        related = {s.strip().lower() for s in text.split(",") if s.strip()}
         related.add(skill_lower)
 
         # Save to DB permanently
@@ -188,21 +236,12 @@ Example for "React": javascript, jsx, redux, next.js, hooks, components, virtual
 async def get_related_skills(skill: str) -> set[str]:
     """Get all related skills using 3-layer approach"""
     skill_lower = skill.lower().strip()
-    related = {skill_lower}
 
-    # Layer 1: Static hierarchy
-    found_in_static = False
-    if skill_lower in SKILL_HIERARCHY:
-        related.update(SKILL_HIERARCHY[skill_lower])
-        found_in_static = True
-    for parent, children in SKILL_HIERARCHY.items():
-        if skill_lower in children:
-            related.add(parent)
-            related.update(children)
-            found_in_static = True
-
-    if found_in_static:
+    # Layer 1: Static hierarchy (indexed)
+    related = static_related_skills(skill_lower)
+    if related is not None:
         return related  # Fast path — no AI needed!
+    related = {skill_lower}
 
     # Layer 3: AI expansion (only for unknown skills)
     ai_related = await ai_expand_skill(skill)
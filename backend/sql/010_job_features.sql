@@ -0,0 +1,15 @@
+-- Migration: Precomputed job features (written by the scrapers at ingest)
+-- Run this in Supabase SQL Editor, then backfill existing rows:
+--   python -m backend.backfill_job_features
+
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS title_norm TEXT;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS context_norm TEXT;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS category TEXT;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS is_remote BOOLEAN DEFAULT false;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS domain_tags JSONB DEFAULT '[]'::jsonb;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS features_version SMALLINT;
+
+-- /db/jobs reads recent rows newest-first
+CREATE INDEX IF NOT EXISTS idx_jobs_posted_at ON jobs(posted_at DESC);
+-- Backfill scans for rows without current features
+CREATE INDEX IF NOT EXISTS idx_jobs_features_version ON jobs(features_version);
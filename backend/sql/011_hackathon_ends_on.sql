@@ -0,0 +1,7 @@
+-- Migration: Normalized end date for hackathons (set by BaseScraper.save_hackathon)
+-- Run this in Supabase SQL Editor
+
+ALTER TABLE hackathons ADD COLUMN IF NOT EXISTS ends_on DATE;
+
+-- HackathonScraper.cleanup_past_events deletes by range on this column
+CREATE INDEX IF NOT EXISTS idx_hackathons_ends_on ON hackathons(ends_on);
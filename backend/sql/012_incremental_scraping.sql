@@ -0,0 +1,15 @@
+-- Migration: Incremental scraping (conditional GETs + per-row content hashes)
+-- Run this in Supabase SQL Editor
+
+-- HTTP validators per scraped URL (see backend/scrapers/scrape_state.py)
+CREATE TABLE IF NOT EXISTS scrape_state (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body_hash TEXT,
+    fetched_at TIMESTAMPTZ DEFAULT now()
+);
+
+-- Hash of each row's scraped content; unchanged rows are not re-upserted
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS content_hash TEXT;
+ALTER TABLE hackathons ADD COLUMN IF NOT EXISTS content_hash TEXT;
@@ -0,0 +1,6 @@
+-- Migration: Compact opportunity cache rows
+-- Run this in Supabase SQL Editor
+
+-- Base64 cache_codec blob (see backend/services/cache_codec.py); when set,
+-- `results` is left empty and readers decode the payload instead
+ALTER TABLE opportunity_cache ADD COLUMN IF NOT EXISTS payload TEXT;
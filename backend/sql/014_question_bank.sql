@@ -0,0 +1,29 @@
+-- Migration: Interview question bank (reused across users by /api/prep/generate-quiz)
+-- Run this in Supabase SQL Editor
+
+CREATE TABLE IF NOT EXISTS question_bank (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    -- blake2b of type + normalized question text; duplicates keep the first row
+    fingerprint TEXT NOT NULL UNIQUE,
+    job_id TEXT,
+    -- Normalized job title without seniority words (services/question_bank.role_key)
+    role_key TEXT NOT NULL,
+    company TEXT,
+    type TEXT NOT NULL CHECK (type IN ('mcq', 'short_answer', 'coding')),
+    question TEXT NOT NULL,
+    options JSONB,
+    correct_answer TEXT,
+    topic TEXT,
+    -- canonical_skill(topic), matched against a request's canonical tech stack
+    topic_key TEXT,
+    difficulty TEXT DEFAULT 'medium',
+    tech_stack TEXT[] DEFAULT '{}',
+    created_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_question_bank_job_id ON question_bank(job_id);
+CREATE INDEX IF NOT EXISTS idx_question_bank_role_key ON question_bank(role_key);
+CREATE INDEX IF NOT EXISTS idx_question_bank_topic ON question_bank(topic_key, difficulty);
+CREATE INDEX IF NOT EXISTS idx_question_bank_tech_stack ON question_bank USING GIN (tech_stack);
+-- Seen-question lookups read a user's most recent sessions
+CREATE INDEX IF NOT EXISTS idx_prep_sessions_user_created ON prep_sessions(user_id, created_at DESC);
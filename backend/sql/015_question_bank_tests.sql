@@ -0,0 +1,6 @@
+-- Migration: Test cases for coding questions (run by services/local_grader in /api/prep/submit)
+-- Run this in Supabase SQL Editor
+
+ALTER TABLE question_bank ADD COLUMN IF NOT EXISTS function_name TEXT;
+-- [{"args": [...], "expected": ...}], NULL for questions generated before this migration
+ALTER TABLE question_bank ADD COLUMN IF NOT EXISTS tests JSONB;
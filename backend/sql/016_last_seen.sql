@@ -0,0 +1,9 @@
+-- Migration: Liveness date for scraped jobs (set by BaseScraper.save_job)
+-- Run this in Supabase SQL Editor
+
+-- Bumped whenever a scrape sees the listing, even if its content is unchanged;
+-- /db/jobs filters on it instead of posted_at (the date the listing was first scraped)
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS last_seen_at DATE;
+UPDATE jobs SET last_seen_at = COALESCE(posted_at, created_at::date) WHERE last_seen_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_last_seen_at ON jobs(last_seen_at);
@@ -1,31 +1,152 @@
+import asyncio
 import os
+import threading
+import time
 import google.generativeai as genai
 import json
 from dotenv import load_dotenv
 
 from pathlib import Path
 
-# Load environment variables from project root
+try:
+    from backend.utils import metrics
+    from backend.utils.llm_cache import cache_key, get_llm_cache
+    from backend.utils.llm_scheduler import Priority, estimate_tokens, get_scheduler
+except ImportError:
+    from utils import metrics
+    from utils.llm_cache import cache_key, get_llm_cache
+    from utils.llm_scheduler import Priority, estimate_tokens, get_scheduler
+
+# Load environment variables from project root (once, at import)
 env_path = Path(__file__).resolve().parent.parent.parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
+# Switched to 'gemini-flash-latest' (1.5 Flash stable) for better quotas
+DEFAULT_MODEL = os.environ.get("GEMINI_MODEL", "gemini-flash-latest")
+
+
+class _TimedModel:
+    """Wraps a GenerativeModel so every generate_content call (including routers' direct
+    `client.model.generate_content`) is timed and counted by outcome."""
+
+    def __init__(self, model):
+        self._model = model
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+    def generate_content(self, *args, **kwargs):
+        mode = "stream" if kwargs.get("stream") else "unary"
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            response = self._model.generate_content(*args, **kwargs)
+            outcome = "success"
+            return response
+        except Exception as e:
+            outcome = "rate_limited" if "429" in str(e) else "error"
+            raise
+        finally:
+            # For streams this is time to the first chunk, not the full response
+            metrics.observe("gemini_seconds", time.perf_counter() - started, mode=mode)
+            metrics.inc("gemini_requests_total", mode=mode, outcome=outcome)
+
+
 class GeminiClient:
+    """
+    Process-wide Gemini client: the API key is read and genai configured once,
+    model handles are built once per model name and reused, and the async
+    methods run the SDK's blocking calls in worker threads once the
+    LLMScheduler admits them (concurrency, RPM/TPM quota, priority), so a
+    slow generation never stalls the event loop.
+    Use get_gemini_client() rather than constructing one per request.
+    """
+
     def __init__(self):
-        # Force reload .env to pick up changes without restarting server
-        load_dotenv(dotenv_path=env_path, override=True)
-        
         self.api_key = os.getenv("GEMINI_API_KEY")
+        self._models: dict[str, object] = {}
+        self._models_lock = threading.Lock()
+        self.scheduler = get_scheduler()
+        self.cache = get_llm_cache()
         if not self.api_key:
             print("Warning: GEMINI_API_KEY not found in environment variables.")
             self.model = None
         else:
-            print(f"DEBUG: GEMINI_API_KEY found (starts with {self.api_key[:4]}...)")
             genai.configure(api_key=self.api_key)
-            # Use a valid model from the list
-            # Switched to 'gemini-flash-latest' (1.5 Flash stable) for better quotas
-            self.model = genai.GenerativeModel('gemini-flash-latest')
+            self.model = self.model_for(DEFAULT_MODEL)
+
+    def model_for(self, name: str):
+        """The shared handle for a model name (None without an API key)."""
+        if not self.api_key:
+            return None
+        with self._models_lock:
+            model = self._models.get(name)
+            if model is None:
+                model = genai.GenerativeModel(name)
+                if metrics.ENABLED:
+                    model = _TimedModel(model)
+                self._models[name] = model
+            return model
+
+    async def generate(self, prompt, timeout: float | None = None, model: str | None = None,
+                       priority: Priority = Priority.USER, **kwargs):
+        """
+        Non-blocking generate_content through the scheduler. Rate-limit and
+        transient errors are retried there, all within `timeout` (the budget
+        for the whole call, not each attempt); anything else (or the last
+        retry's error) is raised like generate_content would.
+        """
+        handle = self.model_for(model) if model else self.model
+        if handle is None:
+            raise RuntimeError("GEMINI_API_KEY is missing in backend/.env")
+        tokens = estimate_tokens(prompt)
+
+        def call(left: float | None):
+            if left is not None:
+                kwargs["request_options"] = {**kwargs.get("request_options", {}), "timeout": left}
+            return handle.generate_content(prompt, **kwargs)
 
-    def generate_roadmap(self, profile_data: dict, goal: str) -> dict:
+        response = await self.scheduler.run(call, priority, tokens, budget=timeout)
+        usage = getattr(response, "usage_metadata", None)
+        self.scheduler.settle(tokens, getattr(usage, "total_token_count", None))
+        return response
+
+    async def generate_text(self, prompt, timeout: float | None = None, model: str | None = None,
+                            priority: Priority = Priority.USER, cache: bool = False, cache_if=None) -> str:
+        """
+        generate() returning the text. With cache=True the answer is served from
+        and stored in the LLM response cache — only for prompts that fully
+        determine the answer. cache_if(text) can veto storing (e.g. bad JSON).
+        """
+        if not cache:
+            response = await self.generate(prompt, timeout=timeout, model=model, priority=priority)
+            return response.text
+        model_name = model or DEFAULT_MODEL
+        key = cache_key(model_name, prompt)
+        text = self.cache.get_memory(key)
+        if text is None:
+            text = await asyncio.to_thread(self.cache.get_disk, key)
+        if text is not None:
+            return text
+        response = await self.generate(prompt, timeout=timeout, model=model, priority=priority)
+        text = response.text
+        if cache_if is None or cache_if(text):
+            await asyncio.to_thread(self.cache.set, key, text, model_name)
+        return text
+
+    async def stream_text(self, prompt, timeout: float | None = None, priority: Priority = Priority.INTERACTIVE):
+        """
+        Async iterator over streamed chunk texts. Opening the stream (which
+        waits for the first chunk) goes through the scheduler with retries;
+        the remaining chunks are read after the slot is released.
+        """
+        response = await self.generate(prompt, timeout=timeout, priority=priority, stream=True)
+        chunks = iter(response)
+        while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+            yield chunk.text
+
+
+    async def generate_roadmap(self, profile_data: dict, goal: str) -> dict:
         if not self.model:
              return {"error": "GEMINI_API_KEY is missing in backend/.env"}
 
@@ -82,37 +203,20 @@ class GeminiClient:
         }}
         """
 
-        retries = 3
-        base_delay = 2
-
-        for attempt in range(retries):
-            try:
-                # Increased timeout to 600s to handle complex prompt with subtopics
-                from google.api_core import retry
-                response = self.model.generate_content(
-                    prompt, 
-                    request_options={'timeout': 600}
-                )
-                # Clean response to ensure valid JSON
-                text = response.text
-                if text.startswith("```json"):
-                    text = text.replace("```json", "").replace("```", "")
-                data = json.loads(text)
-                return data.get("roadmap", data)
-            except Exception as e:
-                error_str = str(e)
-                if "429" in error_str and attempt < retries - 1:
-                    import time
-                    sleep_time = base_delay * (2 ** attempt)
-                    print(f"Gemini 429 Rate Limit. Retrying in {sleep_time}s...")
-                    time.sleep(sleep_time)
-                    continue
-                
-                print(f"Error generating roadmap (Attempt {attempt+1}): {e}")
-                if attempt == retries - 1:
-                    return {"error": str(e)}
-
-    def chat_with_tutor(self, message: str, context: str) -> str:
+        try:
+            # Increased timeout to 600s to handle complex prompt with subtopics;
+            # 429s and transient errors are retried by the scheduler
+            text = await self.generate_text(prompt, timeout=600)
+            # Clean response to ensure valid JSON
+            if text.startswith("```json"):
+                text = text.replace("```json", "").replace("```", "")
+            data = json.loads(text)
+            return data.get("roadmap", data)
+        except Exception as e:
+            print(f"Error generating roadmap: {e}")
+            return {"error": str(e)}
+
+    async def chat_with_tutor(self, message: str, context: str) -> str:
         if not self.model:
             return "Error: AI not configured."
         
@@ -131,13 +235,12 @@ class GeminiClient:
             # We use a simple generation here. For full chat history, we'd need a chat session object.
             # For this MVP, we treat each message as a standalone query with context.
             full_prompt = f"{system_prompt}\n\nStudent: {message}\nTutor:"
-            response = self.model.generate_content(full_prompt)
-            return response.text
+            return await self.generate_text(full_prompt, priority=Priority.INTERACTIVE)
         except Exception as e:
             print(f"Chat Error: {e}")
             return "Sorry, I'm having trouble thinking right now. Please try again."
 
-    def chat_with_tutor_stream(self, message: str, context: str):
+    async def chat_with_tutor_stream(self, message: str, context: str):
         if not self.model:
             yield "Error: AI not configured."
             return
@@ -155,9 +258,8 @@ class GeminiClient:
         
         try:
             full_prompt = f"{system_prompt}\n\nStudent: {message}\nTutor:"
-            response = self.model.generate_content(full_prompt, stream=True)
-            for chunk in response:
-                yield chunk.text
+            async for text in self.stream_text(full_prompt):
+                yield text
         except Exception as e:
             print(f"Chat Stream Error: {e}")
             yield "Sorry, I'm having trouble thinking right now. Please try again."
@@ -169,3 +271,17 @@ class GeminiClient:
         if len(profile.get('projects', [])) > 2:
             return "Intermediate Student"
         return "Beginner Student"
+
+
+_client: GeminiClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_gemini_client() -> GeminiClient:
+    """The process-wide GeminiClient, created on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = GeminiClient()
+    return _client
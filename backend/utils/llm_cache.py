@@ -0,0 +1,234 @@
+"""
+LLM Cache — content-addressed store for Gemini responses to pure prompts.
+
+A response is keyed by sha256(model, prompt, generation params) and stored as
+one small JSON file under LLM_CACHE_DIR (sharded by the first two hex digits,
+written atomically), so every worker on the host shares it. A bounded
+in-process LRU sits in front of the disk for repeat hits within a worker.
+Entries expire after LLM_CACHE_TTL seconds; once the directory grows past
+LLM_CACHE_MAX_BYTES the least recently used files are pruned. Only callers
+whose prompt fully determines the answer should opt in.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+try:
+    from backend.utils import metrics
+except ImportError:
+    from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(os.environ.get("LLM_CACHE_DIR") or Path(__file__).resolve().parent.parent / ".llm_cache")
+TTL = float(os.environ.get("LLM_CACHE_TTL", str(7 * 24 * 3600)))  # 0 disables the cache
+MAX_BYTES = int(os.environ.get("LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+MEMORY_ENTRIES = int(os.environ.get("LLM_CACHE_MEMORY_ENTRIES", "256"))
+
+# Pruning stops once the directory is back under this share of MAX_BYTES
+_PRUNE_TARGET = 0.9
+
+
+def cache_key(model: str, prompt, params: dict | None = None) -> str:
+    """Content address of a request. Transport options (timeouts) must not be in params."""
+    material = json.dumps({"model": model, "prompt": prompt, "params": params or {}},
+                          sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+def parses_as_json(text: str) -> bool:
+    """cache_if predicate: the text (minus markdown fences) holds a JSON object or array."""
+    text = re.sub(r"^```\w*\n?|\n?```$", "", text.strip())
+    start = min((i for i in (text.find("{"), text.find("[")) if i != -1), default=-1)
+    end = max(text.rfind("}"), text.rfind("]"))
+    if start == -1 or end < start:
+        return False
+    try:
+        json.loads(text[start:end + 1])
+        return True
+    except ValueError:
+        return False
+
+
+class LLMResponseCache:
+    def __init__(self, directory: Path = CACHE_DIR, ttl: float = TTL, max_bytes: int = MAX_BYTES,
+                 memory_entries: int = MEMORY_ENTRIES):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._memory: OrderedDict[str, tuple[str, float]] = OrderedDict()  # key -> (text, expires)
+        self._lock = threading.Lock()
+        self._disk_bytes: int | None = None  # measured lazily, then tracked per write
+        self._counts = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "pruned": 0, "errors": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _remember(self, key: str, text: str, expires: float):
+        with self._lock:
+            self._memory[key] = (text, expires)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> str | None:
+        text = self.get_memory(key)
+        return text if text is not None else self.get_disk(key)
+
+    def get_memory(self, key: str) -> str | None:
+        """In-process LRU only; never touches the disk (safe on the event loop)."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[1] > time.time():
+                self._memory.move_to_end(key)
+                self._counts["memory_hits"] += 1
+                metrics.inc("llm_cache_lookups_total", result="memory_hit")
+                return entry[0]
+        return None
+
+    def get_disk(self, key: str) -> str | None:
+        """Reads and parses the entry file (blocking; run it off the event loop)."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        path = self._path(key)
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            record = None
+        except (OSError, ValueError) as e:
+            logger.debug(f"LLM cache entry {key[:8]}... unreadable: {e}")
+            self._counts["errors"] += 1
+            record = None
+        if record is None or record["created"] + self.ttl <= now:
+            self._counts["misses"] += 1
+            metrics.inc("llm_cache_lookups_total", result="miss")
+            return None
+        try:
+            os.utime(path)  # mtime doubles as last-use time for pruning
+        except OSError:
+            pass
+        self._remember(key, record["text"], record["created"] + self.ttl)
+        self._counts["disk_hits"] += 1
+        metrics.inc("llm_cache_lookups_total", result="disk_hit")
+        return record["text"]
+
+    def set(self, key: str, text: str, model: str = ""):
+        if not self.enabled:
+            return
+        now = time.time()
+        self._remember(key, text, now + self.ttl)
+        path = self._path(key)
+        payload = json.dumps({"model": model, "created": now, "text": text}, ensure_ascii=False).encode()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, path)
+        except OSError as e:
+            self._counts["errors"] += 1
+            logger.warning(f"LLM cache write failed: {e}")
+            return
+        self._counts["writes"] += 1
+        if self._disk_bytes is None:
+            self._disk_bytes = self._measure()
+        else:
+            self._disk_bytes += len(payload)
+        if self._disk_bytes > self.max_bytes:
+            self.prune()
+
+    def _files(self) -> list[tuple[float, int, Path]]:
+        files = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+        return files
+
+    def _measure(self) -> int:
+        return sum(size for _, size, _ in self._files())
+
+    def prune(self) -> int:
+        """Drop expired files, then the least recently used until under the size budget."""
+        files = sorted(self._files())
+        total = sum(size for _, size, _ in files)
+        cutoff = time.time() - self.ttl
+        target = self.max_bytes * _PRUNE_TARGET
+        removed = 0
+        for mtime, size, path in files:
+            # Hits refresh mtime, so an old mtime with a live entry just means unused lately
+            if mtime > cutoff and total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self._disk_bytes = total
+        self._counts["pruned"] += removed
+        if removed:
+            logger.info(f"LLM cache pruned {removed} files ({total} bytes left)")
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        for _, _, path in self._files():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        self._disk_bytes = 0
+
+    def stats(self) -> dict:
+        counts = dict(self._counts)
+        hits = counts["memory_hits"] + counts["disk_hits"]
+        lookups = hits + counts["misses"]
+        return {
+            "enabled": self.enabled,
+            "directory": str(self.directory),
+            "memory_entries": len(self._memory),
+            "disk_bytes": self._disk_bytes,
+            "max_bytes": self.max_bytes,
+            **counts,
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+_cache = LLMResponseCache()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    return _cache
+
+
+def _metric_families() -> list:
+    """Scrape-time view of the LLM cache for /metrics."""
+    stats = _cache.stats()
+    families = [("llm_cache_hit_ratio", "gauge", "LLM response cache hits / lookups", [({}, stats["hit_ratio"])])]
+    if stats["disk_bytes"] is not None:
+        families.append(("llm_cache_bytes", "gauge", "Bytes in the on-disk LLM cache", [({}, stats["disk_bytes"])]))
+    return families
+
+
+metrics.get_registry().describe("llm_cache_lookups_total", "counter", "LLM response cache lookups by result")
+metrics.register_collector(_metric_families)
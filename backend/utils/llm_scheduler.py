@@ -0,0 +1,323 @@
+"""
+LLM Scheduler — one admission queue in front of every Gemini call in a worker.
+
+A call runs once three things are available: a concurrency slot, one request
+from the requests-per-minute bucket and its estimated tokens from the
+tokens-per-minute bucket. Waiting calls are admitted by priority (interactive
+chat first, background enrichment last), FIFO within a priority. Rate-limit
+(429) and transient (5xx / deadline) errors are retried with asyncio backoff,
+within the caller's timeout when it has one; a 429 pauses the whole queue for
+the advertised retry delay, since the quota it reports is shared by every
+caller.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import random
+import re
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+
+try:
+    from backend.utils import metrics
+except ImportError:
+    from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# Gemini calls in flight per worker; the rest wait (without blocking the event loop)
+MAX_CONCURRENCY = int(os.environ.get("GEMINI_MAX_CONCURRENCY", "4"))
+# Per-worker share of the project quota (<= 0 disables a bucket)
+RPM = float(os.environ.get("GEMINI_RPM", "15"))
+TPM = float(os.environ.get("GEMINI_TPM", "1000000"))
+MAX_RETRIES = int(os.environ.get("GEMINI_MAX_RETRIES", "3"))
+RETRY_BASE_SECONDS = float(os.environ.get("GEMINI_RETRY_BASE_SECONDS", "2"))
+# Output tokens reserved per call until the response reports real usage
+OUTPUT_TOKEN_ESTIMATE = 1024
+# A retry is only worth it if at least this much of the call's budget is left for it
+MIN_ATTEMPT_SECONDS = 5
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0  # chat: a user is watching the answer stream
+    USER = 1         # roadmap, quiz, resume: a user is waiting on the result
+    BACKGROUND = 2   # JD structuring, skill expansion: enrichment
+
+
+def estimate_tokens(prompt) -> int:
+    """Rough prompt size (~4 chars per token) plus the output reservation."""
+    return len(str(prompt)) // 4 + OUTPUT_TOKEN_ESTIMATE
+
+
+_TRANSIENT_STATUS = re.compile(r"\b(500|502|503|504)\b")
+
+
+def retry_reason(e: Exception) -> str | None:
+    """"rate_limited", "unavailable" or None (not worth retrying)."""
+    text = str(e).lower()
+    if "429" in text or "quota" in text or "resource exhausted" in text or "resourceexhausted" in text:
+        return "rate_limited"
+    if _TRANSIENT_STATUS.search(text) or "deadline" in text or "unavailable" in text:
+        return "unavailable"
+    return None
+
+
+_RETRY_DELAY_PATTERNS = (re.compile(r"retry in ([\d.]+)\s*s"), re.compile(r"retry_delay\s*\{\s*seconds:\s*(\d+)"))
+
+
+def retry_after(e: Exception) -> float | None:
+    """The retry delay a 429 advertises, if any."""
+    text = str(e).lower()
+    for pattern in _RETRY_DELAY_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            return float(match.group(1))
+    return None
+
+
+class TokenBucket:
+    """Refills continuously at rate_per_minute and holds at most one minute's worth."""
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = rate_per_minute
+        self.unlimited = rate_per_minute <= 0
+        self._rate = rate_per_minute / 60.0
+        self.level = rate_per_minute
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` can be taken. Amounts above capacity wait for a full bucket."""
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return missing / self._rate if missing > 0 else 0.0
+
+    def take(self, amount: float, now: float):
+        # May go negative for an oversize call; the debt is repaid before the next admission
+        if not self.unlimited:
+            self._refill(now)
+            self.level -= amount
+
+    def credit(self, amount: float):
+        """Return (or, if negative, charge) tokens after real usage is known."""
+        if not self.unlimited:
+            self.level = min(self.capacity, self.level + amount)
+
+
+class LLMScheduler:
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY, rpm: float = RPM, tpm: float = TPM,
+                 max_retries: int = MAX_RETRIES, retry_base: float = RETRY_BASE_SECONDS):
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self._queue: list[list] = []  # [priority, seq, future, tokens]
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._admitted = {p: 0 for p in Priority}
+        self._wait_total = {p: 0.0 for p in Priority}
+        self._wait_max = {p: 0.0 for p in Priority}
+        self._retries = {"rate_limited": 0, "unavailable": 0}
+        self._gave_up = 0
+
+    # ─── Admission ─────────────────────────────────────────────
+
+    def _bind(self, loop: asyncio.AbstractEventLoop):
+        """Futures and timers belong to one loop; a new loop starts with an empty queue."""
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = []
+            self._timer = None
+            self._in_flight = 0
+
+    def _dispatch(self):
+        now = time.monotonic()
+        while self._queue:
+            priority, _, future, tokens = self._queue[0]
+            if future.done():  # cancelled while queued
+                heapq.heappop(self._queue)
+                continue
+            if self._in_flight >= self.max_concurrency:
+                return
+            wait = max(self._paused_until - now, self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now))
+            if wait > 0:
+                self._wake_in(wait)
+                return
+            heapq.heappop(self._queue)
+            self.requests.take(1, now)
+            self.tokens.take(tokens, now)
+            self._in_flight += 1
+            future.set_result(None)
+
+    def _wake_in(self, delay: float):
+        loop = self._loop
+        when = loop.time() + delay
+        if self._timer is not None and self._timer.when() <= when:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = loop.call_at(when, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self._dispatch()
+
+    async def acquire(self, priority: Priority = Priority.USER, tokens: int = 0):
+        """Wait for admission. Every successful acquire() must be paired with release()."""
+        loop = asyncio.get_running_loop()
+        self._bind(loop)
+        future = loop.create_future()
+        heapq.heappush(self._queue, [priority, next(self._seq), future, tokens])
+        started = time.monotonic()
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():  # admitted, then cancelled before resuming
+                self.release()
+            raise
+        waited = time.monotonic() - started
+        priority = Priority(priority)
+        self._admitted[priority] += 1
+        self._wait_total[priority] += waited
+        self._wait_max[priority] = max(self._wait_max[priority], waited)
+        metrics.observe("llm_queue_wait_seconds", waited, priority=priority.name.lower())
+
+    def release(self):
+        self._in_flight -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority = Priority.USER, tokens: int = 0):
+        await self.acquire(priority, tokens)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def settle(self, estimated: int, actual: int | None):
+        """Correct the token bucket once a response reports its real usage."""
+        if actual is not None:
+            self.tokens.credit(estimated - actual)
+
+    # ─── Execution ─────────────────────────────────────────────
+
+    def _backoff(self, e: Exception, reason: str, attempt: int) -> float:
+        """Seconds to wait before the next attempt; a 429 pauses admission for everyone instead."""
+        self._retries[reason] += 1
+        metrics.inc("llm_retries_total", reason=reason)
+        delay = self.retry_base * (2 ** attempt)
+        if reason == "rate_limited":
+            delay = retry_after(e) or delay
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            logger.warning(f"Gemini rate limited, pausing the LLM queue for {delay:.1f}s")
+            return 0.0
+        delay += random.uniform(0, self.retry_base)
+        logger.warning(f"Gemini call failed ({e}), retrying in {delay:.1f}s")
+        return delay
+
+    def _fits_budget(self, e: Exception, reason: str, attempt: int, budget: float | None, started: float) -> bool:
+        """Whether the wait before another attempt, plus a useful attempt, still fits in the call's budget."""
+        if budget is None:
+            return True
+        wait = (retry_after(e) if reason == "rate_limited" else None) or self.retry_base * (2 ** attempt)
+        return time.monotonic() - started + wait + MIN_ATTEMPT_SECONDS <= budget
+
+    async def run(self, fn, priority: Priority = Priority.USER, tokens: int = 0, budget: float | None = None):
+        """
+        Run blocking fn(timeout) in a worker thread once admitted, retrying
+        rate-limit and transient errors up to max_retries times. With a budget
+        (seconds from the first admission) every attempt and the waits between
+        them fit in it: fn gets the time left as its timeout (None without a
+        budget), and an error is not retried once too little would be left —
+        so a call that timed out after its full budget is not repeated.
+        Other errors, and the last retryable one, are raised to the caller.
+        """
+        started = None
+        for attempt in itertools.count():
+            async with self.slot(priority, tokens):
+                if started is None:
+                    started = time.monotonic()
+                left = None if budget is None else max(0.0, budget - (time.monotonic() - started))
+                try:
+                    return await asyncio.to_thread(fn, left)
+                except Exception as e:
+                    reason = retry_reason(e)
+                    if reason is None:
+                        raise
+                    if attempt >= self.max_retries or not self._fits_budget(e, reason, attempt, budget, started):
+                        self._gave_up += 1
+                        raise
+                    delay = self._backoff(e, reason, attempt)
+            if delay:
+                await asyncio.sleep(delay)
+
+    # ─── Introspection ─────────────────────────────────────────
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        self.requests.wait_time(0, now)  # refill before reporting levels
+        self.tokens.wait_time(0, now)
+        queued = {p: 0 for p in Priority}
+        for priority, _, future, _ in self._queue:
+            if not future.done():
+                queued[Priority(priority)] += 1
+        return {
+            "in_flight": self._in_flight,
+            "max_concurrency": self.max_concurrency,
+            "paused_for": round(max(0.0, self._paused_until - now), 2),
+            "requests_available": None if self.requests.unlimited else round(self.requests.level, 2),
+            "tokens_available": None if self.tokens.unlimited else round(self.tokens.level),
+            "retries": dict(self._retries),
+            "gave_up": self._gave_up,
+            "priorities": {
+                p.name.lower(): {
+                    "queued": queued[p],
+                    "admitted": self._admitted[p],
+                    "mean_wait_ms": round(self._wait_total[p] / self._admitted[p] * 1000, 1)
+                    if self._admitted[p] else 0.0,
+                    "max_wait_ms": round(self._wait_max[p] * 1000, 1),
+                }
+                for p in Priority
+            },
+        }
+
+
+_scheduler = LLMScheduler()
+
+
+def get_scheduler() -> LLMScheduler:
+    return _scheduler
+
+
+def _metric_families() -> list:
+    """Scrape-time view of the scheduler for /metrics."""
+    stats = _scheduler.stats()
+    priorities = stats["priorities"]
+    available = [({"bucket": b}, stats[k]) for b, k in (("requests", "requests_available"),
+                                                        ("tokens", "tokens_available"))
+                 if stats[k] is not None]
+    return [
+        ("llm_queue_depth", "gauge", "Gemini calls waiting for admission",
+         [({"priority": p}, s["queued"]) for p, s in priorities.items()]),
+        ("llm_in_flight", "gauge", "Gemini calls running", [({}, stats["in_flight"])]),
+        ("llm_quota_available", "gauge", "Requests / tokens left in the per-minute buckets", available),
+    ]
+
+
+metrics.get_registry().describe("llm_queue_wait_seconds", "histogram", "Time Gemini calls waited for admission")
+metrics.get_registry().describe("llm_retries_total", "counter", "Gemini calls retried by reason")
+metrics.register_collector(_metric_families)
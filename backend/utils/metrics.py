@@ -0,0 +1,176 @@
+"""
+Metrics — in-process counters and latency histograms, exported in the
+Prometheus text format on GET /metrics.
+
+Hot paths call span()/inc()/observe() unconditionally. With METRICS_ENABLED
+off (the default) those return immediately — span() hands back one shared
+no-op context manager — so the instrumentation costs a flag check per call.
+"""
+
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+ENABLED = os.environ.get("METRICS_ENABLED", "").lower() in ("1", "true", "yes")
+
+PREFIX = "sports_"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_NOOP = nullcontext()
+
+
+class Registry:
+    """Counter and histogram families keyed by name, each holding one series per label set."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help: dict[str, tuple[str, str]] = {}      # name -> (type, help)
+        self._counters: dict[str, dict[tuple, float]] = {}
+        self._histograms: dict[str, dict[tuple, list]] = {}
+        self._collectors: list = []
+
+    def describe(self, name: str, kind: str, help_text: str):
+        self._help.setdefault(name, (kind, help_text))
+
+    def inc(self, name: str, amount: float, labels: dict):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def observe(self, name: str, value: float, labels: dict):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            state = series.get(key)
+            if state is None:
+                # [bucket counts..., sum, count]
+                state = series[key] = [0] * len(LATENCY_BUCKETS) + [0.0, 0]
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def register_collector(self, fn):
+        """fn() -> [(name, type, help, [(labels_dict, value), ...])], called on every scrape."""
+        self._collectors.append(fn)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            counters = {n: dict(s) for n, s in self._counters.items()}
+            histograms = {n: {k: list(v) for k, v in s.items()} for n, s in self._histograms.items()}
+
+        for name, series in sorted(counters.items()):
+            self._header(lines, name, "counter")
+            for key, value in series.items():
+                lines.append(f"{PREFIX}{name}{_labels(key)} {_num(value)}")
+
+        for name, series in sorted(histograms.items()):
+            self._header(lines, name, "histogram")
+            for key, state in series.items():
+                for bound, count in zip(LATENCY_BUCKETS, state):
+                    lines.append(f"{PREFIX}{name}_bucket{_labels(key + (('le', _num(bound)),))} {count}")
+                lines.append(f"{PREFIX}{name}_bucket{_labels(key + (('le', '+Inf'),))} {state[-1]}")
+                lines.append(f"{PREFIX}{name}_sum{_labels(key)} {_num(state[-2])}")
+                lines.append(f"{PREFIX}{name}_count{_labels(key)} {state[-1]}")
+
+        for collect in self._collectors:
+            try:
+                families = collect()
+            except Exception as e:
+                lines.append(f"# collector {getattr(collect, '__name__', collect)} failed: {e}")
+                continue
+            for name, kind, help_text, samples in families:
+                lines.append(f"# HELP {PREFIX}{name} {help_text}")
+                lines.append(f"# TYPE {PREFIX}{name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{PREFIX}{name}{_labels(tuple(sorted(labels.items())))} {_num(value)}")
+
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines: list, name: str, kind: str):
+        kind, help_text = self._help.get(name, (kind, name.replace("_", " ")))
+        lines.append(f"# HELP {PREFIX}{name} {help_text}")
+        lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(key: tuple) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in key) + "}"
+
+
+def _num(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+_registry = Registry()
+
+_registry.describe("stage_seconds", "histogram", "Time spent in an instrumented stage")
+_registry.describe("http_request_seconds", "histogram", "HTTP request latency by route template")
+_registry.describe("adapter_request_seconds", "histogram", "Upstream API request latency by source")
+_registry.describe("adapter_requests_total", "counter", "Upstream API requests by source and outcome")
+_registry.describe("gemini_seconds", "histogram", "Gemini generate_content latency")
+_registry.describe("gemini_requests_total", "counter", "Gemini generate_content calls by outcome")
+
+
+def get_registry() -> Registry:
+    return _registry
+
+
+# ─── Recording API ─────────────────────────────────────────────
+
+def inc(name: str, amount: float = 1, **labels):
+    if ENABLED:
+        _registry.inc(name, amount, labels)
+
+
+def observe(name: str, value: float, **labels):
+    if ENABLED:
+        _registry.observe(name, value, labels)
+
+
+class _Span:
+    __slots__ = ("name", "labels", "started")
+
+    def __init__(self, name: str, labels: dict):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _registry.observe(self.name, time.perf_counter() - self.started, self.labels)
+        return False
+
+
+def span(stage: str, metric: str = "stage_seconds", **labels):
+    """Time a block: `with span("dedup"): ...`. Recorded under `metric` with a `stage` label."""
+    if not ENABLED:
+        return _NOOP
+    return _Span(metric, {"stage": stage, **labels})
+
+
+def register_collector(fn):
+    """Add a scrape-time collector (e.g. cache hit ratios read from existing stats)."""
+    _registry.register_collector(fn)
+
+
+def render() -> str:
+    if not ENABLED:
+        return "# metrics disabled (set METRICS_ENABLED=1)\n"
+    return _registry.render()
@@ -162,7 +162,17 @@ export default function OpportunitiesPage() {
 
   const triggerScrape = async () => {
     setLoadingScrape(true);
-    try { await fetch(`${API_BASE}/scrape`, { method: "POST" }); await fetchDBData(); } catch { }
+    try {
+      // Scrapes run in the background; poll the job until it finishes (max ~10 min)
+      const res = await fetch(`${API_BASE}/scrape`, { method: "POST" });
+      const { job_id } = await res.json();
+      for (let i = 0; job_id && i < 200; i++) {
+        await new Promise((r) => setTimeout(r, 3000));
+        const status = await (await fetch(`${API_BASE}/scrape/${job_id}`)).json();
+        if (status.status !== "queued" && status.status !== "running") break;
+      }
+      await fetchDBData();
+    } catch { }
     setLoadingScrape(false);
   };
 